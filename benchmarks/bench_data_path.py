@@ -0,0 +1,121 @@
+"""
+접수내용 데이터 경로 벤치마크 — CSV 파싱, 날짜/상태 정규화, 완료 이력, 월별 집계, 이력 검색
+실행 방법과 결과 저장은 conftest.py 참고
+"""
+import csv
+import io
+
+import pandas as pd
+import pytest
+
+from date_parser import parse_date_safe, parse_dates_safe, parse_jeju_date, parse_jeju_dates
+from issue_cube import IssueCube
+from issue_history import build_completed_issues
+from issue_store import build_issue_frame, normalize_status
+from search_index import HistorySearchIndex
+
+ROUNDS = 5
+BASELINE_ROWS = 5_000  # 행 단위 기준선은 큰 데이터에서 너무 느려 앞부분만 잰다
+
+
+def run(benchmark, fn, *args):
+    """큰 데이터에서도 시간이 정해지도록 라운드 수를 고정"""
+    return benchmark.pedantic(fn, args=args, rounds=ROUNDS, iterations=1, warmup_rounds=1)
+
+
+# ── 로드 ──────────────────────────────
+def test_fetch_csv(benchmark, data):
+    """CSV export 텍스트 → 표준 프레임 (_fetch_values_via_csv + build_issue_frame)"""
+    df = run(benchmark, lambda text: build_issue_frame(list(csv.reader(io.StringIO(text)))), data.csv_text)
+    assert len(df) == len(data.frame)
+
+
+# ── 날짜 ──────────────────────────────
+def test_parse_jeju_date(benchmark, data):
+    """행 단위 파서 (기준선, 최대 BASELINE_ROWS행)"""
+    run(benchmark, lambda s: s.map(parse_jeju_date), data.frame["날짜"].head(BASELINE_ROWS))
+
+
+def test_parse_jeju_dates(benchmark, data):
+    run(benchmark, lambda s: parse_jeju_dates(s, memo=False), data.frame["날짜"])
+
+
+def test_parse_date_safe(benchmark, data):
+    """행 단위 파서 (기준선, 최대 BASELINE_ROWS행)"""
+    run(benchmark, lambda s: s.map(parse_date_safe), data.frame["날짜"].head(BASELINE_ROWS))
+
+
+def test_parse_dates_safe(benchmark, data):
+    run(benchmark, lambda s: parse_dates_safe(s, memo=False), data.frame["날짜"])
+
+
+# ── 상태 ──────────────────────────────
+def test_normalize_status(benchmark, data):
+    """행 단위 정규화 (기준선, 최대 BASELINE_ROWS행)"""
+    run(benchmark, lambda s: s.map(normalize_status), data.frame["접수처리"].head(BASELINE_ROWS))
+
+
+def test_normalize_status_uniques(benchmark, data):
+    """build_issue_frame 방식 — 고유값만 정규화 후 매핑"""
+    def normalize(s):
+        return s.map({v: normalize_status(v) for v in s.unique()})
+
+    run(benchmark, normalize, data.frame["접수처리"])
+
+
+# ── 페이지 데이터 ──────────────────────────
+def test_load_completed_issues(benchmark, data):
+    """장애 이력 페이지의 완료 이력 프레임 (스냅샷당 한 번)"""
+    completed, _ = run(benchmark, build_completed_issues, data.frame)
+    assert completed["_is_completed"].all()
+
+
+def test_monthly_aggregation(benchmark, data):
+    """대시보드 월별 추이 — 빈 큐브에서 전체 집계 후 월 × 상태 표"""
+    def aggregate(df):
+        return IssueCube().sync(df).monthly_status(["미조치(접수중)", "점검중", "완료"])
+
+    table = run(benchmark, aggregate, data.frame)
+    assert int(table.to_numpy().sum()) <= len(data.frame)
+
+
+def test_monthly_aggregation_incremental(benchmark, data):
+    """새 행 20건이 추가된 스냅샷으로 큐브 증분 갱신"""
+    cube = IssueCube()
+    cube.sync(data.frame)
+    extra = data.frame.tail(20).assign(_id=[f"new-{i}" for i in range(20)])
+    frames = [pd.concat([data.frame, extra]), data.frame]  # 번갈아 넣어 매번 20건이 바뀌게
+
+    def sync():
+        frames.reverse()
+        return cube.sync(frames[0])
+
+    run(benchmark, sync)
+
+
+def test_kpi_filter(benchmark, data):
+    """필터 변경 한 번 — 큐브 조각으로 KPI 계산"""
+    view = IssueCube().sync(data.frame)
+    months = view.values("_month")[-3:]
+    run(benchmark, lambda: view.status_counts(months=months, positions=["RACE", "LAB"], statuses=["점검중", "완료"]))
+
+
+@pytest.fixture(scope="session")
+def history(data):
+    completed, _ = build_completed_issues(data.frame)
+    return completed, HistorySearchIndex().sync(data.frame)
+
+
+@pytest.mark.parametrize("query", ["배터리", "서바이벌 탄창", "키오스크 부팅 지연"], ids=["one_term", "two_terms", "three_terms"])
+def test_history_search(benchmark, history, query):
+    """장애 이력 검색 — 역색인 검색 + 완료 이력에서 점수 순으로 남기기"""
+    completed, index = history
+
+    def search(q):
+        ranked = index.search(q)
+        rank = pd.Series(range(len(ranked)), index=pd.Index(ranked, dtype=object))
+        hits = completed.assign(_rank=completed["_id"].map(rank))
+        return hits[hits["_rank"].notna()].sort_values("_rank").drop(columns="_rank")
+
+    found = run(benchmark, search, query)
+    assert len(found) > 0
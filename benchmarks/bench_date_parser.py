@@ -0,0 +1,107 @@
+"""
+날짜 파서 벤치마크 — 행 단위 apply vs 벡터화 엔진
+실행: python benchmarks/bench_date_parser.py [행 수]
+- 단일 CPU 상자에서는 벽시계 시간이 흔들리므로 CPU 시간(process_time)의 최솟값으로 비교한다
+- TARGET_ROWS 이상이면 cold(메모 없음) 배속이 TARGET_SPEEDUP 미만일 때 실패한다
+"""
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from date_parser import parse_date_safe, parse_dates_safe, parse_jeju_date, parse_jeju_dates, to_naive_kst
+
+TARGET_SPEEDUP = 20
+TARGET_ROWS = 20000
+
+
+def sample_dates(n: int, seed: int = 981) -> pd.Series:
+    """접수내용 시트에서 실제로 보이는 형식을 섞은 날짜 컬럼"""
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        y, mo, d = rnd.choice([2023, 2024, 2025]), rnd.randint(1, 12), rnd.randint(1, 28)
+        h, mi, s = rnd.randint(0, 23), rnd.randint(0, 59), rnd.randint(0, 59)
+        ampm = "오전" if h < 12 else "오후"
+        h12 = h % 12 or 12
+        kind = rnd.random()
+        if kind < 0.55:
+            out.append(f"{y}. {mo}. {d} {ampm} {h12}:{mi:02d}:{s:02d}")
+        elif kind < 0.80:
+            out.append(f"{y}-{mo:02d}-{d:02d} {h:02d}:{mi:02d}:{s:02d}")
+        elif kind < 0.88:
+            out.append(f"{y}.{mo}.{d}")
+        elif kind < 0.93:
+            out.append(f"{y % 100:02d}.{mo:02d}.{d:02d}")
+        elif kind < 0.97:
+            out.append(str(45000 + rnd.randint(0, 900)))
+        elif kind < 0.99:
+            out.append("")
+        else:
+            out.append("미기재")
+    return pd.Series(out, dtype=object)
+
+
+# 벡터화 경로가 원본 파서와 다르게 처리하기 쉬운 값 — 긴 숫자(전화번호/ID)는 일련번호 변환에서 OverflowError가 났었다
+EDGE_CASES = [
+    "0", "45000", "00045000", "20240101", "132320", "132321", "99999999",
+    "9999999999999999999", "12345678901234567890", "01012345678901234567890", "1" * 400,
+    "2024. 3. 5 오후 12:04:05", "2024. 3. 5 오전 13:04:05", "2024.3.5 오후 3:4:5", "2024-3-5  7:04:05",
+    # tz가 있는 값과 없는 값이 함께 원본 파서로 넘어가는 경우 — 한꺼번에 to_datetime하면 나머지가 NaT가 됐었다
+    "2024-03-05T10:00:00+09:00", "2024/03/05", "2024/03/07", "311\t", "2024.03.08 10:00",
+]
+
+
+def reference(values: pd.Series, parser) -> pd.Series:
+    """원본 파서를 값마다 적용한 기준 결과 (tz가 있으면 KST 기준 naive)"""
+    return pd.Series([to_naive_kst(parser(v)) for v in values], index=values.index, dtype="datetime64[ns]")
+
+
+def test_edge_cases():
+    """python -m pytest benchmarks -k edge_cases"""
+    values = pd.Series(EDGE_CASES, dtype=object)
+    assert reference(values, parse_jeju_date).equals(parse_jeju_dates(values, memo=False)), \
+        "parse_jeju_dates 경계값 결과가 원본 파서와 다릅니다"
+    assert reference(values, parse_date_safe).equals(parse_dates_safe(values, memo=False)), \
+        "parse_dates_safe 경계값 결과가 원본 파서와 다릅니다"
+
+
+def bench(label, fn, values, repeat=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.process_time()
+        result = fn(values)
+        best = min(best, time.process_time() - t0)
+    print(f"{label:<28} {best * 1000:9.1f} ms")
+    return best, result
+
+
+def compare(parser, vectorized, values):
+    """행 단위 apply 대비 cold/memo 배속 — 결과가 다르거나 cold 배속이 목표 미만이면 실패"""
+    name = vectorized.__name__
+    t_row, ref = bench(f"{parser.__name__} (apply)", lambda v: pd.to_datetime(v.apply(parser), errors="coerce"), values)
+    t_cold, got = bench(f"{name} (cold)", lambda v: vectorized(v, memo=False), values, repeat=15)
+    assert ref.equals(got), f"{name} 결과가 원본 파서와 다릅니다"
+    print(f"  → {t_row / t_cold:.1f}x")
+    t_memo, got = bench(f"{name} (memo)", vectorized, values, repeat=15)
+    assert ref.equals(got), f"{name} 결과가 원본 파서와 다릅니다"
+    print(f"  → {t_row / t_memo:.1f}x")
+    if len(values) >= TARGET_ROWS:
+        assert t_row / t_cold >= TARGET_SPEEDUP, f"{name} cold 배속 {t_row / t_cold:.1f}x < {TARGET_SPEEDUP}x"
+
+
+def main(n: int = 20000):
+    test_edge_cases()
+    values = sample_dates(n)
+    print(f"rows={n}")
+    compare(parse_jeju_date, parse_jeju_dates, values)
+    compare(parse_date_safe, parse_dates_safe, values)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,49 @@
+"""
+데이터 경로 벤치마크 공용 설정 (pytest-benchmark, benchmarks/requirements.txt)
+실행: python -m pytest benchmarks --rows 1k,20k
+- 결과는 매 실행 .benchmarks/ 아래 JSON으로 저장된다 (pytest.ini의 --benchmark-autosave)
+- 이전 실행과 비교: python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:15%
+- 200k/1m은 데이터 생성만 수십 초 걸리므로 --rows로 지정할 때만 돈다
+"""
+import os
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from issue_store import build_issue_frame  # noqa: E402
+from synthetic import SIZES, issue_log_values, to_csv  # noqa: E402
+
+
+def pytest_addoption(parser):
+    parser.addoption("--rows", default="1k,20k", help=f"쉼표로 구분한 데이터 크기 ({', '.join(SIZES)} 또는 숫자)")
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = [s.strip() for s in metafunc.config.getoption("rows").split(",") if s.strip()]
+        metafunc.parametrize("size", sizes, scope="session")
+
+
+@dataclass(frozen=True)
+class Dataset:
+    values: list  # 시트 값 (헤더 포함)
+    csv_text: str  # CSV export 텍스트
+    frame: pd.DataFrame  # build_issue_frame 결과 (읽기 전용으로 쓴다)
+
+
+@lru_cache(maxsize=None)
+def dataset(size: str) -> Dataset:
+    values = issue_log_values(SIZES.get(size.lower()) or int(size))
+    return Dataset(values=values, csv_text=to_csv(values), frame=build_issue_frame(values))
+
+
+@pytest.fixture(scope="session")
+def data(size) -> Dataset:
+    return dataset(size)
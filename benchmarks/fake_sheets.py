@@ -0,0 +1,467 @@
+"""
+로컬 Google Sheets 대역 서버 (오프라인 부하 테스트용)
+- CSV export: GET /spreadsheets/d/<id>/export?format=csv&gid=<gid>
+- gspread가 쓰는 Sheets v4 일부: 메타데이터(시트 목록), values.get / values:batchGet,
+  values.append, values.update, values:batchUpdate, spreadsheets:batchUpdate(addSheet)
+- 요청마다 지연(--latency, --jitter), 분당 읽기/쓰기 쿼터 초과 시 429(--read-quota, --write-quota),
+  임의 503(--error-rate), 접수내용 행 수(--rows)로 응답 크기 조절
+- GET /_stats: 엔드포인트별 요청/429/503 횟수
+앱을 이 서버로 돌리기: SHEETS_ENDPOINT=http://127.0.0.1:8765 streamlit run app.py
+  (SHEETS_ENDPOINT가 있으면 서비스계정 없이 CSV/gspread 요청이 모두 이 서버로 간다)
+실행: python benchmarks/fake_sheets.py --rows 20000 --latency 150 --read-quota 60
+"""
+import argparse
+import collections
+import csv
+import io
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from issue_store import SHEET_ID, SHEET_LOG_GID, SHEET_LOG_NAME  # noqa: E402
+from synthetic import issue_log_values, mapping_values  # noqa: E402
+
+MAPPING_SHEET_NAME = "설비매핑"
+MAPPING_GID = "0"
+QUOTA_WINDOW = 60.0  # 초 — Sheets API 쿼터는 분 단위
+
+_CELL_RE = re.compile(r"^([A-Za-z]*)(\d*)$")
+
+
+def _col_index(letters: str) -> int:
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+def _col_letters(n: int) -> str:
+    out = ""
+    while n:
+        n, r = divmod(n - 1, 26)
+        out = chr(65 + r) + out
+    return out
+
+
+def split_range(a1: str, default_title: str):
+    """"'시트'!A1:B2" → (시트, 시작 행, 시작 열, 끝 행, 끝 열) — 1부터, 끝이 열려 있으면 None"""
+    title, _, cells = a1.rpartition("!")
+    if not title:
+        if a1.startswith("'") or not _CELL_RE.match(a1.split(":")[0]):
+            title, cells = a1, ""
+        else:
+            title = default_title
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    if not cells:
+        return title, 1, 1, None, None
+    start, _, end = cells.partition(":")
+    c0, r0 = _CELL_RE.match(start).groups()
+    c1, r1 = _CELL_RE.match(end or start).groups()
+    return (
+        title,
+        int(r0) if r0 else 1,
+        _col_index(c0) if c0 else 1,
+        int(r1) if r1 else None,
+        _col_index(c1) if c1 else None,
+    )
+
+
+class FakeSheet:
+    def __init__(self, sheet_id: int, title: str, rows):
+        self.sheet_id = sheet_id
+        self.title = title
+        self.rows = [list(map(str, r)) for r in rows]
+
+    def properties(self, index: int) -> dict:
+        width = max((len(r) for r in self.rows), default=0)
+        return {
+            "sheetId": self.sheet_id,
+            "title": self.title,
+            "index": index,
+            "sheetType": "GRID",
+            "gridProperties": {"rowCount": max(len(self.rows), 1000), "columnCount": max(width, 26)},
+        }
+
+    def last_row(self) -> int:
+        for i in range(len(self.rows), 0, -1):
+            if any(self.rows[i - 1]):
+                return i
+        return 0
+
+    def read(self, r0, c0, r1, c1):
+        """값 조회 — 실제 API처럼 끝쪽 빈 셀/빈 행은 잘라낸다"""
+        r1 = min(r1 or len(self.rows), len(self.rows))
+        out = []
+        for row in self.rows[r0 - 1:r1]:
+            cells = row[c0 - 1:c1] if c1 else row[c0 - 1:]
+            while cells and cells[-1] == "":
+                cells = cells[:-1]
+            out.append(cells)
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def write(self, r0, c0, values):
+        for i, row in enumerate(values):
+            r = r0 + i
+            while len(self.rows) < r:
+                self.rows.append([])
+            target = self.rows[r - 1]
+            for j, value in enumerate(row):
+                c = c0 + j
+                if len(target) < c:
+                    target.extend([""] * (c - len(target)))
+                target[c - 1] = "" if value is None else str(value)
+        return sum(len(r) for r in values)
+
+
+class FakeSpreadsheet:
+    def __init__(self, spreadsheet_id: str, title: str = "981Park 장애관리"):
+        self.id = spreadsheet_id
+        self.title = title
+        self.sheets = []
+        self.lock = threading.Lock()
+
+    def add(self, title: str, rows=(), sheet_id: int = None) -> FakeSheet:
+        sheet_id = sheet_id if sheet_id is not None else max([s.sheet_id for s in self.sheets] + [0]) + 1
+        sheet = FakeSheet(sheet_id, title, rows)
+        self.sheets.append(sheet)
+        return sheet
+
+    def by_title(self, title: str):
+        return next((s for s in self.sheets if s.title == title), None)
+
+    def by_gid(self, gid: int):
+        return next((s for s in self.sheets if s.sheet_id == gid), None)
+
+    def metadata(self) -> dict:
+        return {
+            "spreadsheetId": self.id,
+            "properties": {"title": self.title, "locale": "ko_KR", "timeZone": "Asia/Seoul"},
+            "sheets": [{"properties": s.properties(i)} for i, s in enumerate(self.sheets)],
+        }
+
+
+def default_spreadsheet(rows: int = 1000, seed: int = 981, spreadsheet_id: str = SHEET_ID) -> FakeSpreadsheet:
+    """접수내용(합성 로그) + 설비매핑 시트"""
+    book = FakeSpreadsheet(spreadsheet_id)
+    mapping = mapping_values(seed)
+    book.add(SHEET_LOG_NAME, issue_log_values(rows, seed, mapping), int(SHEET_LOG_GID))
+    book.add(MAPPING_SHEET_NAME, mapping, int(MAPPING_GID))
+    return book
+
+
+class _Quota:
+    """최근 QUOTA_WINDOW초 요청 수 — limit을 넘으면 거절"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.hits = collections.deque()
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        if not self.limit:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            while self.hits and self.hits[0] <= now - QUOTA_WINDOW:
+                self.hits.popleft()
+            if len(self.hits) >= self.limit:
+                return False
+            self.hits.append(now)
+            return True
+
+
+class FakeSheetsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 8765), spreadsheets=None, latency: float = 0.0, jitter: float = 0.0,
+                 read_quota: int = 0, write_quota: int = 0, error_rate: float = 0.0):
+        super().__init__(address, _Handler)
+        self.spreadsheets = {s.id: s for s in (spreadsheets or [default_spreadsheet()])}
+        self.latency = latency  # 초
+        self.jitter = jitter
+        self.read_quota = _Quota(read_quota)
+        self.write_quota = _Quota(write_quota)
+        self.error_rate = error_rate
+        self.stats = collections.Counter()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """백그라운드 스레드에서 서비스하고 기본 URL 반환 (테스트/하니스용)"""
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-sheets", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeSheetsServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    # ── 응답 ──────────────────────────────
+    def _send(self, status: int, body, content_type="application/json; charset=UTF-8", headers=None):
+        data = body if isinstance(body, bytes) else (
+            body.encode("utf-8") if isinstance(body, str) else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        )
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str, reason: str, headers=None):
+        self._send(status, {"error": {"code": status, "message": message, "status": reason}}, headers=headers)
+
+    def _body(self) -> dict:
+        return json.loads(self._raw_body or b"{}")
+
+    def _gate(self, kind: str, endpoint: str) -> bool:
+        """지연 + 쿼터/임의 오류 — 요청을 계속 처리하면 True"""
+        srv = self.server
+        srv.stats[endpoint] += 1
+        delay = srv.latency + random.uniform(0, srv.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        quota = {"read": srv.read_quota, "write": srv.write_quota}.get(kind)
+        if quota is not None and not quota.allow():
+            srv.stats[f"{endpoint} 429"] += 1
+            self._error(429, f"Quota exceeded for quota metric '{kind.title()} requests'", "RESOURCE_EXHAUSTED",
+                        headers={"Retry-After": "10"})
+            return False
+        if srv.error_rate and random.random() < srv.error_rate:
+            srv.stats[f"{endpoint} 503"] += 1
+            self._error(503, "The service is currently unavailable.", "UNAVAILABLE")
+            return False
+        return True
+
+    # ── 라우팅 ─────────────────────────────
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PUT(self):
+        self._route("PUT")
+
+    def _route(self, method: str):
+        # 본문은 먼저 다 읽는다 — 429/503으로 바로 답해도 keep-alive 연결의 다음 요청이 깨지지 않게
+        length = int(self.headers.get("Content-Length") or 0)
+        self._raw_body = self.rfile.read(length) if length else b""
+        parts = urlsplit(self.path)
+        path, query = parts.path, parse_qs(parts.query)
+        if method == "GET" and path == "/_stats":
+            return self._send(200, dict(self.server.stats))
+
+        m = re.match(r"^/spreadsheets/d/([^/]+)/export$", path)
+        if m and method == "GET":
+            return self._export(m.group(1), query)
+
+        m = re.match(r"^/v4/spreadsheets/([^/:]+)(.*)$", path)
+        if not m:
+            return self._error(404, f"Unknown path {path}", "NOT_FOUND")
+        book = self.server.spreadsheets.get(m.group(1))
+        if book is None:
+            return self._error(404, "Requested entity was not found.", "NOT_FOUND")
+        rest = m.group(2)
+
+        if rest == "" and method == "GET":
+            if self._gate("read", "spreadsheets.get"):
+                with book.lock:
+                    self._send(200, book.metadata())
+        elif rest == ":batchUpdate" and method == "POST":
+            if self._gate("write", "spreadsheets.batchUpdate"):
+                self._batch_update(book, self._body())
+        elif rest == "/values:batchGet" and method == "GET":
+            if self._gate("read", "values.batchGet"):
+                self._values_batch_get(book, query.get("ranges", []))
+        elif rest == "/values:batchUpdate" and method == "POST":
+            if self._gate("write", "values.batchUpdate"):
+                self._values_batch_update(book, self._body())
+        elif rest.startswith("/values/") and rest.endswith(":append") and method == "POST":
+            if self._gate("write", "values.append"):
+                self._values_append(book, unquote(rest[len("/values/"):-len(":append")]), self._body())
+        elif rest.startswith("/values/") and method == "GET":
+            if self._gate("read", "values.get"):
+                self._values_get(book, unquote(rest[len("/values/"):]))
+        elif rest.startswith("/values/") and method == "PUT":
+            if self._gate("write", "values.update"):
+                self._values_update(book, unquote(rest[len("/values/"):]), self._body())
+        else:
+            self._error(404, f"Unsupported {method} {path}", "NOT_FOUND")
+
+    # ── 엔드포인트 ──────────────────────────
+    def _export(self, spreadsheet_id: str, query):
+        book = self.server.spreadsheets.get(spreadsheet_id)
+        if not self._gate(None, "export.csv"):
+            return
+        gid = (query.get("gid") or ["0"])[0]
+        sheet = book.by_gid(int(gid)) if book is not None and gid.isdigit() else None
+        if sheet is None:
+            return self._send(404, "<html><body>Not Found</body></html>", "text/html; charset=utf-8")
+        buf = io.StringIO()
+        with book.lock:
+            csv.writer(buf, lineterminator="\n").writerows(sheet.rows)
+        self._send(200, buf.getvalue(), "text/csv; charset=utf-8")
+
+    def _sheet(self, book: FakeSpreadsheet, a1: str):
+        title, r0, c0, r1, c1 = split_range(a1, book.sheets[0].title)
+        sheet = book.by_title(title)
+        if sheet is None:
+            self._error(400, f"Unable to parse range: {a1}", "INVALID_ARGUMENT")
+        return sheet, r0, c0, r1, c1
+
+    @staticmethod
+    def _range_name(sheet: FakeSheet, r0, c0, values) -> str:
+        rows = max(len(values), 1)
+        cols = max((len(r) for r in values), default=1) or 1
+        return f"'{sheet.title}'!{_col_letters(c0)}{r0}:{_col_letters(c0 + cols - 1)}{r0 + rows - 1}"
+
+    def _value_range(self, book, a1):
+        sheet, r0, c0, r1, c1 = self._sheet(book, a1)
+        if sheet is None:
+            return None
+        values = sheet.read(r0, c0, r1, c1)
+        out = {"range": self._range_name(sheet, r0, c0, values), "majorDimension": "ROWS"}
+        if values:
+            out["values"] = values
+        return out
+
+    def _values_get(self, book, a1):
+        with book.lock:
+            vr = self._value_range(book, a1)
+        if vr is not None:
+            self._send(200, vr)
+
+    def _values_batch_get(self, book, ranges):
+        with book.lock:
+            out = []
+            for a1 in ranges:
+                vr = self._value_range(book, a1)
+                if vr is None:
+                    return
+                out.append(vr)
+        self._send(200, {"spreadsheetId": book.id, "valueRanges": out})
+
+    def _values_update(self, book, a1, body):
+        with book.lock:
+            sheet, r0, c0, _, _ = self._sheet(book, a1)
+            if sheet is None:
+                return
+            values = body.get("values", [])
+            cells = sheet.write(r0, c0, values)
+        self._send(200, {
+            "spreadsheetId": book.id,
+            "updatedRange": self._range_name(sheet, r0, c0, values),
+            "updatedRows": len(values),
+            "updatedCells": cells,
+        })
+
+    def _values_batch_update(self, book, body):
+        responses = []
+        with book.lock:
+            for item in body.get("data", []):
+                sheet, r0, c0, _, _ = self._sheet(book, item["range"])
+                if sheet is None:
+                    return
+                values = item.get("values", [])
+                cells = sheet.write(r0, c0, values)
+                responses.append({
+                    "spreadsheetId": book.id,
+                    "updatedRange": self._range_name(sheet, r0, c0, values),
+                    "updatedRows": len(values),
+                    "updatedCells": cells,
+                })
+        self._send(200, {
+            "spreadsheetId": book.id,
+            "totalUpdatedRows": sum(r["updatedRows"] for r in responses),
+            "totalUpdatedCells": sum(r["updatedCells"] for r in responses),
+            "responses": responses,
+        })
+
+    def _values_append(self, book, a1, body):
+        with book.lock:
+            sheet, _, c0, _, _ = self._sheet(book, a1)
+            if sheet is None:
+                return
+            values = body.get("values", [])
+            r0 = sheet.last_row() + 1
+            cells = sheet.write(r0, c0, values)
+        updated = self._range_name(sheet, r0, c0, values)
+        self._send(200, {
+            "spreadsheetId": book.id,
+            "tableRange": f"'{sheet.title}'!A1:{_col_letters(c0)}{r0 - 1}",
+            "updates": {"spreadsheetId": book.id, "updatedRange": updated, "updatedRows": len(values),
+                        "updatedCells": cells},
+        })
+
+    def _batch_update(self, book, body):
+        replies = []
+        with book.lock:
+            for req in body.get("requests", []):
+                if "addSheet" not in req:
+                    return self._error(400, f"Unsupported request: {list(req)}", "INVALID_ARGUMENT")
+                title = req["addSheet"].get("properties", {}).get("title")
+                if book.by_title(title) is not None:
+                    return self._error(400, f"A sheet with the name \"{title}\" already exists.", "INVALID_ARGUMENT")
+                sheet = book.add(title)
+                replies.append({"addSheet": {"properties": sheet.properties(len(book.sheets) - 1)}})
+        self._send(200, {"spreadsheetId": book.id, "replies": replies})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rows", type=int, default=1000, help="접수내용 합성 행 수")
+    parser.add_argument("--seed", type=int, default=981)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 임의 지연 최대값 (ms)")
+    parser.add_argument("--read-quota", type=int, default=0, help="분당 읽기 요청 한도 (0 = 무제한)")
+    parser.add_argument("--write-quota", type=int, default=0, help="분당 쓰기 요청 한도 (0 = 무제한)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="임의 503 비율 (0~1)")
+    args = parser.parse_args()
+
+    server = FakeSheetsServer(
+        (args.host, args.port),
+        spreadsheets=[default_spreadsheet(args.rows, args.seed)],
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        read_quota=args.read_quota,
+        write_quota=args.write_quota,
+        error_rate=args.error_rate,
+    )
+    print(f"fake sheets: {server.url} (spreadsheet {SHEET_ID}, {args.rows} rows)")
+    print(f"  SHEETS_ENDPOINT={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""
+AppTest 기반 동시 세션 부하 테스트
+- 세션 하나 = 태블릿 하나: AppTest(app.py)에 로그인 상태를 넣고 페이지를 오가며 정해진 조작을 한다
+  대시보드(필터/월 선택/TOP N) → Daily → 장애 이력(월 선택/검색 입력) → 장애 처리(행 선택/상태 저장)
+- 모든 세션은 한 프로세스 안의 스레드 — 공용 저장소/큐브/HTTP 클라이언트를 실제 서버처럼 함께 쓴다
+- 데이터는 benchmarks/fake_sheets.py 대역 서버 (내장 실행, 또는 --endpoint로 이미 떠 있는 서버)
+- 먼저 세션 하나로 한 바퀴 돌려(예열) 조작별 외부 읽기/쓰기 횟수를 재고, 이어서 N개 세션을 동시에 돌린다
+- 보고: 조작별 rerun 지연 p50/p90/p99/max, 조작당 외부 요청 수, 429/503, 프로세스 최대 RSS
+실행: python benchmarks/load_sessions.py --sessions 20 --rounds 3 --rows 20000 --latency 150
+"""
+import argparse
+import collections
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import unicodedata
+
+import numpy as np
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_sheets import FakeSheetsServer, default_spreadsheet  # noqa: E402
+
+USER_EMAIL = "gyoseon.hwang@monolith.co.kr"  # AUTHORIZED_USERS — 기술지원 페이지 접근 가능
+READ_ENDPOINTS = {"spreadsheets.get", "values.get", "values.batchGet", "export.csv"}
+WRITE_ENDPOINTS = {"values.append", "values.update", "values.batchUpdate", "spreadsheets.batchUpdate"}
+SEARCH_QUERIES = [["배터리"], ["배터리", "교체"], ["통신"], ["서바이벌", "탄창"], ["재부팅", "정상"]]
+PERCENTILES = [50, 90, 99]
+
+
+def share_runtime():
+    """
+    AppTest는 run마다 Runtime._instance와 global.appTest 설정을 바꿨다가 끝나면 되돌린다
+    세션 여러 개가 동시에 돌면 다른 세션의 스크립트가 도중에 Runtime을 잃으므로,
+    부하 테스트 동안은 비어 있을 때 쓸 공용 mock Runtime을 두고 appTest 설정을 켜 둔다
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance or shared)
+    Runtime.exists = classmethod(lambda cls: True)
+    config.set_option("global.appTest", True)
+
+
+def _widget(at, kind: str, label: str):
+    return next((w for w in getattr(at, kind) if w.label == label), None)
+
+
+class _QuietContext(logging.Filter):
+    """메인 스레드에서 AppTest를 만들 때 나오는 'missing ScriptRunContext' 경고 제거"""
+
+    def filter(self, record):
+        return "missing ScriptRunContext" not in record.getMessage()
+
+
+class Session:
+    """태블릿 한 대 — AppTest 하나로 페이지를 오가며 rerun마다 지연/오류를 기록"""
+
+    def __init__(self, number: int, rng: random.Random, samples, stats=None, timeout: float = 60, skipped=None):
+        from streamlit.testing.v1 import AppTest
+
+        self.number = number
+        self.rng = rng
+        self.samples = samples  # 공용 리스트 — (조작, 초, 오류)
+        self.stats = stats  # 예열 세션만: 조작별 외부 요청 수를 잴 때 쓰는 서버 통계 함수
+        self.calls = collections.defaultdict(collections.Counter)
+        self.skipped = skipped if skipped is not None else collections.Counter()  # 화면에 위젯이 없어 못 한 조작
+        self.at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=timeout)
+        self.at.session_state["user_email"] = USER_EMAIL
+        self.edits = None  # 장애 처리 표에서 체크한 행 (data_editor 상태)
+
+    def _states(self):
+        """현재 위젯 값 + 데이터 편집기 체크 상태 (AppTest는 data_editor 값을 보내지 않으므로 직접 넣는다)"""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        states = self.at._tree.get_widget_states()
+        if self.edits is not None and len(self.at.dataframe):
+            states.widgets.append(WidgetState(
+                id=self.at.dataframe[0].proto.id,
+                string_value=json.dumps({"edited_rows": self.edits, "added_rows": [], "deleted_rows": []}),
+            ))
+        return states
+
+    def find(self, kind: str, label: str, step: str):
+        widget = _widget(self.at, kind, label)
+        if widget is None:
+            self.skipped[step] += 1
+        return widget
+
+    def run(self, name: str, page: str = None):
+        before = self.stats() if self.stats else None
+        error = None
+        t0 = time.perf_counter()
+        try:
+            if page is not None:
+                self.at.switch_page(page).run()
+            else:
+                self.at._run(self._states())
+            if len(self.at.exception):
+                error = self.at.exception[0].value
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.samples.append((name, time.perf_counter() - t0, error))
+        if before is not None:
+            after = self.stats()
+            self.calls[name].update({k: after.get(k, 0) - v for k, v in before.items()})
+            self.calls[name].update({k: v for k, v in after.items() if k not in before})
+
+    # ── 조작 ──────────────────────────────
+    def dashboard(self):
+        self.run("대시보드 열기", "app.py")
+        positions = self.find("multiselect", "📍 포지션 선택", "대시보드 필터 변경")
+        if positions is not None and positions.options:
+            positions.set_value(self.rng.sample(positions.options, self.rng.randint(1, len(positions.options))))
+            self.run("대시보드 필터 변경")
+        month = self.find("selectbox", "조회할 월 선택", "대시보드 월 선택")
+        if month is not None and month.options:
+            month.select(self.rng.choice(month.options))
+            self.run("대시보드 월 선택")
+        top_n = self.find("number_input", "TOP N", "대시보드 TOP N")
+        if top_n is not None:
+            top_n.set_value(self.rng.randint(3, 10))
+            self.run("대시보드 TOP N")
+
+    def daily(self):
+        self.run("Daily 열기", "pages/daily_report.py")
+
+    def history(self):
+        self.run("이력 열기", "pages/03_issue_history.py")
+        month = self.find("selectbox", "월(YYYY-MM)", "이력 월 선택")
+        if month is not None and month.options:
+            month.select(self.rng.choice(month.options))
+            self.run("이력 월 선택")
+        search = self.find("text_input", "검색 (설비명 / 세부장치 / 장애내용 / 점검내용 / 작성자)", "이력 검색 입력")
+        if search is not None:
+            words = self.rng.choice(SEARCH_QUERIES)
+            for i in range(len(words)):  # 단어를 하나씩 더 쳐서 Enter
+                search.input(" ".join(words[:i + 1]))
+                self.run("이력 검색 입력")
+                search = self.find("text_input", search.label, "이력 검색 입력")
+                if search is None:
+                    return
+            search.input("")
+            self.run("이력 검색 지우기")
+
+    def manage(self, save: bool = True):
+        self.edits = None
+        self.run("장애 처리 열기", "pages/02_issue_manage.py")
+        if not len(self.at.dataframe) or self.at.dataframe[0].value.empty:
+            return
+        self.edits = {str(self.rng.randrange(len(self.at.dataframe[0].value))): {"선택": True}}
+        self.run("장애 처리 행 선택")
+        status = _widget(self.at, "selectbox", "📊 상태 변경")
+        button = _widget(self.at, "button", "💾 저장")
+        if save and status is not None and button is not None:
+            status.select(self.rng.choice(status.options))
+            _widget(self.at, "text_input", "👷 점검자").input(f"부하테스트{self.number}")
+            button.click()
+            self.run("장애 처리 상태 저장")
+        self.edits = None
+
+    def scenario(self, save: bool = True):
+        self.dashboard()
+        self.daily()
+        self.history()
+        self.manage(save)
+
+
+class RssSampler(threading.Thread):
+    """/proc/self/statm으로 RSS를 주기적으로 읽어 최대값 기록 (없으면 getrusage 최대값)"""
+
+    def __init__(self, interval: float = 0.05):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.interval = interval
+        self.peak = self.current()
+        self._done = threading.Event()
+
+    @staticmethod
+    def current() -> int:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            self.peak = max(self.peak, self.current())
+
+    def stop(self) -> int:
+        self._done.set()
+        self.join()
+        return max(self.peak, self.current())
+
+
+def _percentiles(values):
+    arr = np.asarray(values) * 1000
+    return [float(np.percentile(arr, p)) for p in PERCENTILES] + [float(arr.max())]
+
+
+def _kinds(counter):
+    reads = sum(v for k, v in counter.items() if k in READ_ENDPOINTS)
+    writes = sum(v for k, v in counter.items() if k in WRITE_ENDPOINTS)
+    throttled = sum(v for k, v in counter.items() if k.endswith((" 429", " 503")))
+    return reads, writes, throttled
+
+
+def run_load(sessions: int, rounds: int, stats, think: float = 0.0, save: bool = True, timeout: float = 60,
+             seed: int = 981):
+    """예열 세션 1바퀴 + 동시 세션 rounds바퀴 — 결과 dict"""
+    share_runtime()
+    probe_samples = []
+    probe = Session(0, random.Random(seed), probe_samples, stats=stats, timeout=timeout)
+    probe.scenario(save)
+    order = list(dict.fromkeys(name for name, _, _ in probe_samples))
+
+    samples = []
+    skipped = collections.Counter()
+    barrier = threading.Barrier(sessions)
+    errors = [f"예열 {name}: {error}" for name, _, error in probe_samples if error]
+
+    def worker(number):
+        rng = random.Random(seed + number)
+        try:
+            session = Session(number, rng, samples, timeout=timeout, skipped=skipped)
+            barrier.wait()  # 교대 시간처럼 한꺼번에 시작
+            for _ in range(rounds):
+                for step in (session.dashboard, session.daily, session.history, lambda: session.manage(save)):
+                    step()
+                    if think:
+                        time.sleep(rng.uniform(0, think))
+        except Exception as e:
+            errors.append(f"세션 {number}: {type(e).__name__}: {e}")
+
+    before = stats()
+    rss = RssSampler()
+    rss_base = rss.peak
+    rss.start()
+    threads = [threading.Thread(target=worker, args=(i + 1,), name=f"session-{i + 1}") for i in range(sessions)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    rss_peak = rss.stop()
+    after = stats()
+    load_calls = collections.Counter({k: after.get(k, 0) - before.get(k, 0) for k in after})
+
+    by_name = collections.defaultdict(list)
+    failed = collections.Counter()
+    for name, seconds, error in samples:
+        by_name[name].append(seconds)
+        if error:
+            failed[name] += 1
+            errors.append(f"{name}: {error}")
+    interactions = []
+    for name in order + [n for n in by_name if n not in order]:
+        if name not in by_name:
+            continue
+        reads, writes, _ = _kinds(probe.calls.get(name, {}))
+        p50, p90, p99, worst = _percentiles(by_name[name])
+        interactions.append({
+            "name": name, "count": len(by_name[name]), "errors": failed[name], "skipped": skipped[name],
+            "p50_ms": p50, "p90_ms": p90, "p99_ms": p99, "max_ms": worst,
+            "reads": reads, "writes": writes,
+        })
+    reads, writes, throttled = _kinds(load_calls)
+    overall = _percentiles([s for _, s, _ in samples]) if samples else [0.0] * 4
+    return {
+        "sessions": sessions, "rounds": rounds, "reruns": len(samples), "wall_s": wall,
+        "reruns_per_s": len(samples) / wall if wall else 0.0,
+        "p50_ms": overall[0], "p90_ms": overall[1], "p99_ms": overall[2], "max_ms": overall[3],
+        "reads": reads, "writes": writes, "throttled": throttled,
+        "reads_per_rerun": reads / len(samples) if samples else 0.0,
+        "writes_per_rerun": writes / len(samples) if samples else 0.0,
+        "rss_base_mb": rss_base / 2**20, "rss_peak_mb": rss_peak / 2**20,
+        "interactions": interactions, "endpoint_calls": dict(load_calls), "skipped": dict(skipped),
+        "errors": errors[:20],
+    }
+
+
+def _ljust(text: str, width: int) -> str:
+    """한글(전각) 폭을 2로 쳐서 왼쪽 정렬"""
+    return text + " " * max(0, width - sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text))
+
+
+def print_report(result):
+    print(f"\n세션 {result['sessions']}개 × {result['rounds']}바퀴 — rerun {result['reruns']}회, "
+          f"{result['wall_s']:.1f}초 ({result['reruns_per_s']:.1f} rerun/s)")
+    header = f"{_ljust('조작', 22)}{'횟수':>4}{'오류':>4}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'읽기':>4}{'쓰기':>4}"
+    print(header)
+    print("-" * 82)
+    for r in result["interactions"]:
+        print(f"{_ljust(r['name'], 22)}{r['count']:>6}{r['errors']:>6}{r['p50_ms']:>9.0f}{r['p90_ms']:>9.0f}"
+              f"{r['p99_ms']:>9.0f}{r['max_ms']:>9.0f}{r['reads']:>6}{r['writes']:>6}")
+    print(f"{_ljust('전체', 22)}{result['reruns']:>6}{sum(r['errors'] for r in result['interactions']):>6}"
+          f"{result['p50_ms']:>9.0f}{result['p90_ms']:>9.0f}{result['p99_ms']:>9.0f}{result['max_ms']:>9.0f}")
+    print("(지연 ms, 읽기/쓰기 = 예열 세션 기준 조작 1회당 외부 요청 수)")
+    print(f"부하 중 외부 요청: 읽기 {result['reads']} ({result['reads_per_rerun']:.2f}/rerun), "
+          f"쓰기 {result['writes']} ({result['writes_per_rerun']:.2f}/rerun), 429/503 {result['throttled']}")
+    print(f"RSS: 시작 {result['rss_base_mb']:.0f} MB → 최대 {result['rss_peak_mb']:.0f} MB")
+    if result["skipped"]:
+        print("화면에 위젯이 없어 건너뛴 조작: " + ", ".join(f"{k} {v}회" for k, v in result["skipped"].items()))
+    for e in result["errors"]:
+        print(f"  ! {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="동시 세션(태블릿) 수")
+    parser.add_argument("--rounds", type=int, default=2, help="세션마다 시나리오 반복 횟수")
+    parser.add_argument("--think", type=float, default=0.0, help="조작 사이 임의 대기 최대값 (ms)")
+    parser.add_argument("--no-save", action="store_true", help="상태 저장(쓰기) 없이 읽기 조작만")
+    parser.add_argument("--timeout", type=float, default=60.0, help="rerun 1회 제한 시간 (초)")
+    parser.add_argument("--seed", type=int, default=981)
+    parser.add_argument("--endpoint", help="이미 떠 있는 fake_sheets 서버 주소 (없으면 내장 서버 실행)")
+    parser.add_argument("--rows", type=int, default=20_000, help="내장 서버 접수내용 행 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="내장 서버 요청당 지연 (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="내장 서버 추가 임의 지연 (ms)")
+    parser.add_argument("--read-quota", type=int, default=0, help="내장 서버 분당 읽기 한도")
+    parser.add_argument("--write-quota", type=int, default=0, help="내장 서버 분당 쓰기 한도")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+    logging.getLogger("streamlit.runtime.scriptrunner.script_run_context").addFilter(_QuietContext())
+
+    server = None
+    if args.endpoint:
+        endpoint = args.endpoint.rstrip("/")
+
+        def stats():
+            return requests.get(f"{endpoint}/_stats", timeout=10).json()
+    else:
+        server = FakeSheetsServer(
+            ("127.0.0.1", 0),
+            spreadsheets=[default_spreadsheet(args.rows, args.seed)],
+            latency=args.latency / 1000,
+            jitter=args.jitter / 1000,
+            read_quota=args.read_quota,
+            write_quota=args.write_quota,
+        )
+        endpoint = server.start()
+
+        def stats():
+            return dict(server.stats)
+    os.environ["SHEETS_ENDPOINT"] = endpoint
+    os.chdir(ROOT)
+
+    try:
+        result = run_load(args.sessions, args.rounds, stats, think=args.think / 1000, save=not args.no_save,
+                          timeout=args.timeout, seed=args.seed)
+    finally:
+        if server is not None:
+            server.stop()
+    print_report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+합성 접수내용/설비매핑 데이터 생성기 (벤치마크용)
+- 설비매핑 모양의 표(포지션/위치/설비명, D~AG 세부기기, AH~AM 장애유형)에서 설비를 뽑는다
+- 날짜는 시트에 실제로 섞여 있는 형식(구글폼 '2025. 9. 3 오후 2:05:11', 앱 '2025-09-03 14:05:11',
+  '2025.9.3', 빈 값), 접수처리는 표준/비표준 값과 앞뒤 공백이 섞인 값
+- 같은 seed면 항상 같은 데이터
+실행: python benchmarks/synthetic.py 1k 20k 200k 1m [--out 디렉터리]
+"""
+import argparse
+import csv
+import io
+import os
+
+import numpy as np
+
+SIZES = {"1k": 1_000, "20k": 20_000, "200k": 200_000, "1m": 1_000_000}
+
+LOG_HEADER = [
+    "구분", "날짜", "작성자", "포지션", "위치", "설비명", "세부장치", "장애유형", "장애내용",
+    "접수처리", "", "점검자", "완료일자", "점검내용", "", "", "종결",
+]
+MAPPING_DETAIL_COLUMNS = 30  # D~AG
+MAPPING_ISSUE_TYPE_COLUMNS = 6  # AH~AM
+
+POSITIONS = {
+    "RACE": ["카트 트랙", "피트", "관제실", "정비 라인"],
+    "LAB": ["서바이벌존", "VR존", "체험관", "로비"],
+    "Audio/Video": ["메인 스크린", "방송실", "트랙 스피커"],
+    "운영설비": ["매표소", "게이트", "주차장"],
+    "충전설비": ["충전소 A", "충전소 B"],
+    "정비고": ["정비고 1", "정비고 2"],
+    "기타": ["사무동", "야외"],
+}
+EQUIPMENT = {
+    "서바이벌존": ["M4 서바이벌", "AK 서바이벌", "스나이퍼 서바이벌", "서바이벌 조끼", "서바이벌 서버"],
+    "카트 트랙": ["GT 카트", "키즈 카트", "트랙 센서", "신호등", "타이어 배리어"],
+    "피트": ["피트 게이트", "리프트", "에어 컴프레서"],
+}
+GENERIC_EQUIPMENT = ["키오스크", "PC", "모니터", "스피커", "카메라", "조명", "출입 게이트", "POS", "네트워크 스위치", "UPS"]
+DETAILS = ["배터리", "충전기", "센서", "케이블", "전원부", "메인보드", "디스플레이", "스위치", "모터", "탄창", "조준경", "트리거"]
+ISSUE_TYPES = ["전원 불량", "통신 불량", "파손", "동작 불량", "소음", "기타"]
+REPORTERS = ["김민수", "이지은", "박준호", "최유리", "정하늘", "강도윤", "윤서연", "임재현"]
+SYMPTOMS = ["전원이 들어오지 않음", "간헐적으로 꺼짐", "배터리 방전", "탄창 걸림", "조준경 흔들림", "통신 끊김",
+            "화면 깨짐", "소음 발생", "센서 인식 불가", "충전 안 됨", "버튼 눌림 불량", "부팅 지연"]
+NOTES = ["부품 교체 완료", "재부팅 후 정상", "케이블 재연결", "제조사 AS 요청", "소모품 교체", "청소 후 정상 동작"]
+# (값, 비율) — 비표준 값과 공백이 섞인 값 포함
+STATUSES = [("완료", 0.55), ("접수중", 0.12), ("점검중", 0.1), ("운영중", 0.06), (" 완료", 0.04), ("진행중", 0.03),
+            ("미조치", 0.03), ("대기", 0.02), ("사용중지", 0.02), ("처리중", 0.01), ("", 0.02)]
+DONE_VALUES = {"완료", " 완료", "운영중", "사용중지"}
+
+
+def mapping_values(seed: int = 981):
+    """설비매핑 시트 모양의 값 (헤더 포함 2차원 리스트)"""
+    rng = np.random.default_rng(seed)
+    header = (["포지션", "위치", "설비명"] + [f"세부기기{i + 1}" for i in range(MAPPING_DETAIL_COLUMNS)]
+              + [f"장애유형{i + 1}" for i in range(MAPPING_ISSUE_TYPE_COLUMNS)])
+    rows = [header]
+    for position, locations in POSITIONS.items():
+        for location in locations:
+            for equipment in EQUIPMENT.get(location) or list(rng.choice(GENERIC_EQUIPMENT, size=5, replace=False)):
+                details = list(rng.choice(DETAILS, size=rng.integers(2, 8), replace=False))
+                details += [""] * (MAPPING_DETAIL_COLUMNS - len(details))
+                rows.append([position, location, str(equipment)] + [str(d) for d in details] + list(ISSUE_TYPES))
+    return rows
+
+
+def _dates(rng, n, start="2023-01-01", days=1000):
+    """시트에 섞여 있는 날짜 형식의 문자열 배열"""
+    base = np.datetime64(start, "s")
+    stamps = base + rng.integers(0, days * 86400, size=n).astype("timedelta64[s]")
+    kind = rng.random(n)
+    out = np.empty(n, dtype=object)
+    for i, (ts, k) in enumerate(zip(stamps.astype(object), kind)):
+        if k < 0.6:
+            h12 = ts.hour % 12 or 12
+            ampm = "오전" if ts.hour < 12 else "오후"
+            out[i] = f"{ts.year}. {ts.month}. {ts.day} {ampm} {h12}:{ts.minute:02d}:{ts.second:02d}"
+        elif k < 0.9:
+            out[i] = ts.strftime("%Y-%m-%d %H:%M:%S")
+        elif k < 0.98:
+            out[i] = f"{ts.year}.{ts.month}.{ts.day}"
+        else:
+            out[i] = ""
+    return out, stamps
+
+
+def issue_log_values(n: int, seed: int = 981, mapping=None):
+    """접수내용 시트 모양의 값 (헤더 포함 2차원 리스트, 모든 셀은 문자열)"""
+    rng = np.random.default_rng(seed)
+    mapping = mapping or mapping_values(seed)
+    equipment = mapping[1:]
+    picks = rng.integers(0, len(equipment), size=n)
+    dates, stamps = _dates(rng, n)
+    status_values, status_p = zip(*STATUSES)
+    statuses = rng.choice(np.array(status_values, dtype=object), size=n, p=np.array(status_p) / sum(status_p))
+    urgent = rng.random(n) < 0.08
+    reporters = rng.choice(REPORTERS, size=n)
+    symptoms = rng.choice(SYMPTOMS, size=n)
+    notes = rng.choice(NOTES, size=n)
+    issue_types = rng.choice(ISSUE_TYPES, size=n)
+    detail_pick = rng.integers(0, 8, size=n)
+    lag = rng.integers(600, 5 * 86400, size=n).astype("timedelta64[s]")
+    closed = rng.random(n) < 0.9
+
+    rows = [list(LOG_HEADER)]
+    for i in range(n):
+        position, location, name = equipment[picks[i]][:3]
+        details = [d for d in equipment[picks[i]][3:3 + MAPPING_DETAIL_COLUMNS] if d]
+        status = statuses[i]
+        done = status in DONE_VALUES
+        rows.append([
+            "긴급" if urgent[i] else "일반",
+            dates[i],
+            str(reporters[i]),
+            position,
+            location,
+            name,
+            details[detail_pick[i] % len(details)] if details else "",
+            str(issue_types[i]),
+            f"{name} {symptoms[i]}",
+            status,
+            "",
+            str(reporters[(i + 3) % n]) if status.strip() else "",
+            (stamps[i] + lag[i]).astype(object).strftime("%Y-%m-%d %H:%M:%S") if done else "",
+            str(notes[i]) if done else "",
+            "",
+            "",
+            "종결" if done and closed[i] else "",
+        ])
+    return rows
+
+
+def to_csv(values) -> str:
+    """값 목록 → 시트 CSV export와 같은 모양의 텍스트"""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerows(values)
+    return buf.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("sizes", nargs="*", default=["1k", "20k"], help=f"행 수 ({', '.join(SIZES)} 또는 숫자)")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+    parser.add_argument("--seed", type=int, default=981)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    mapping = mapping_values(args.seed)
+    with open(os.path.join(args.out, "mapping.csv"), "w", encoding="utf-8", newline="") as f:
+        f.write(to_csv(mapping))
+    for size in args.sizes:
+        n = SIZES.get(size.lower()) or int(size)
+        path = os.path.join(args.out, f"issues_{size}.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(to_csv(issue_log_values(n, args.seed, mapping)))
+        print(f"{path}: {n} rows")
+
+
+if __name__ == "__main__":
+    main()
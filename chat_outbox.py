@@ -0,0 +1,220 @@
+"""
+981Park Google Chat 알림 아웃박스
+- 폼 제출은 알림을 SQLite 아웃박스에 넣고 바로 반환 (웹훅 전송을 기다리지 않음)
+- 백그라운드 워커가 긴급 → 일반, 먼저 들어온 순으로 전송
+- 카드 전송이 거부(4xx)되면 텍스트로 대체, 429/5xx·연결 오류는 지터 백오프로 재시도
+- 전송 결과(sent/failed, 카드/텍스트, 시도 횟수, 오류)는 아웃박스에 남아 화면에서 조회 가능
+  시도별 결과(sent/retry/failed)는 metrics의 park_webhook_deliveries_total로도 센다
+"""
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from config import setting
+from http_client import RETRY_STATUS, HttpClient
+from metrics import get_metrics
+
+DEFAULT_OUTBOX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chat_outbox.db")
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 2.0  # 초
+BACKOFF_MAX = 300.0
+POLL_INTERVAL = 5.0  # 초 — 새 항목은 enqueue 시 바로 깨우므로 재시도 확인용
+
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = 1
+
+
+class ChatOutbox:
+    """웹훅 알림 큐 — 스레드별 커넥션, WAL 모드"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._wake = threading.Event()
+        self._thread = None
+        # 재시도는 아웃박스가 직접 스케줄하므로 HTTP 계층 재시도는 끈다
+        self.http = HttpClient(max_retries=0, timeout=10)
+        with self._conn() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at REAL NOT NULL,
+                    priority INTEGER NOT NULL,
+                    label TEXT,
+                    url TEXT NOT NULL,
+                    card TEXT,
+                    text TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    sent_as TEXT,
+                    sent_at REAL,
+                    last_error TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_outbox_due ON outbox (status, priority, next_attempt_at)")
+            # 이전 프로세스가 전송 도중 종료됐으면 다시 대기열로
+            conn.execute("UPDATE outbox SET status = 'pending' WHERE status = 'sending'")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ── 넣기 / 조회 ──────────────────────────
+    def enqueue(self, url: str, card: dict, text: dict, urgent: bool = False, label: str = "") -> int:
+        now = time.time()
+        with self._conn() as conn:
+            cur = conn.execute(
+                "INSERT INTO outbox (created_at, priority, label, url, card, text, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    now,
+                    PRIORITY_URGENT if urgent else PRIORITY_NORMAL,
+                    label,
+                    url,
+                    json.dumps(card, ensure_ascii=False) if card else None,
+                    json.dumps(text, ensure_ascii=False) if text else None,
+                    now,
+                ),
+            )
+        self._wake.set()
+        return cur.lastrowid
+
+    def recent(self, limit: int = 10) -> pd.DataFrame:
+        """최근 알림의 전송 상태"""
+        cur = self._conn().execute(
+            """
+            SELECT id, created_at, priority, label, status, sent_as, attempts, last_error
+            FROM outbox ORDER BY id DESC LIMIT ?
+            """,
+            (limit,),
+        )
+        df = pd.DataFrame(cur.fetchall(), columns=[d[0] for d in cur.description])
+        df["created_at"] = pd.to_datetime(df["created_at"], unit="s", utc=True).dt.tz_convert("Asia/Seoul")
+        return df
+
+    # ── 전송 ──────────────────────────────
+    def _claim(self):
+        """가장 급한 전송 대상 하나를 sending으로 표시하고 반환"""
+        conn = self._conn()
+        with conn:
+            row = conn.execute(
+                """
+                SELECT id, url, card, text, attempts FROM outbox
+                WHERE status = 'pending' AND next_attempt_at <= ?
+                ORDER BY priority, id LIMIT 1
+                """,
+                (time.time(),),
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE outbox SET status = 'sending' WHERE id = ?", (row[0],))
+        return row
+
+    def _post(self, url, body):
+        """(성공 여부, 재시도할 만한 실패인지, 오류 메시지)"""
+        try:
+            resp = self.http.post(url, json=json.loads(body))
+        except Exception as e:
+            # 예외 메시지에는 웹훅 URL(key/token)이 들어 있으므로 종류만 남긴다
+            return False, True, type(e).__name__
+        if resp.status_code == 200:
+            return True, False, None
+        return False, resp.status_code in RETRY_STATUS, f"HTTP {resp.status_code}: {resp.text[:200]}"
+
+    def deliver_one(self) -> bool:
+        """대상이 있으면 한 건 처리하고 True"""
+        row = self._claim()
+        if row is None:
+            return False
+        item_id, url, card, text, attempts = row
+        attempts += 1
+
+        sent_as, error, retryable = None, None, False
+        if card:
+            ok, retryable, error = self._post(url, card)
+            if ok:
+                sent_as = "card"
+        if sent_as is None and text and not retryable:
+            # 카드가 거부된 경우(또는 카드 없음) 텍스트로 대체
+            ok, retryable, error = self._post(url, text)
+            if ok:
+                sent_as = "text"
+
+        result = "sent" if sent_as is not None else "retry" if retryable and attempts < MAX_ATTEMPTS else "failed"
+        get_metrics().webhook_deliveries.inc(result=result)
+        with self._conn() as conn:
+            if result == "sent":
+                conn.execute(
+                    "UPDATE outbox SET status = 'sent', sent_as = ?, sent_at = ?, attempts = ?, last_error = NULL WHERE id = ?",
+                    (sent_as, time.time(), attempts, item_id),
+                )
+            elif result == "retry":
+                delay = min(BACKOFF_BASE * (2 ** (attempts - 1)), BACKOFF_MAX)
+                conn.execute(
+                    "UPDATE outbox SET status = 'pending', attempts = ?, last_error = ?, next_attempt_at = ? WHERE id = ?",
+                    (attempts, error, time.time() + delay + random.uniform(0, delay), item_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE outbox SET status = 'failed', attempts = ?, last_error = ? WHERE id = ?",
+                    (attempts, error, item_id),
+                )
+        return True
+
+    def _idle_wait(self) -> float:
+        """다음 재시도 예정 시각까지 (최대 POLL_INTERVAL)"""
+        try:
+            row = self._conn().execute("SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'").fetchone()
+        except sqlite3.Error:
+            return POLL_INTERVAL
+        if row is None or row[0] is None:
+            return POLL_INTERVAL
+        return min(max(row[0] - time.time(), 0.0), POLL_INTERVAL)
+
+    def start_worker(self):
+        if self._thread is not None:
+            return
+
+        def loop():
+            while True:
+                try:
+                    while self.deliver_one():
+                        pass
+                except Exception:
+                    pass  # DB 잠금 등 일시 오류 — 다음 주기에 다시 시도
+                self._wake.wait(self._idle_wait())
+                self._wake.clear()
+
+        self._thread = threading.Thread(target=loop, name="chat-outbox", daemon=True)
+        self._thread.start()
+
+
+def outbox_path():
+    return setting("CHAT_OUTBOX_PATH", DEFAULT_OUTBOX_PATH)
+
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+def get_chat_outbox() -> ChatOutbox:
+    """프로세스 공용 아웃박스 (전송 워커 시작 포함)"""
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                outbox = ChatOutbox(outbox_path())
+                outbox.start_worker()
+                _outbox = outbox
+    return _outbox
@@ -0,0 +1,28 @@
+"""
+981Park 설정 조회
+- secret(key): st.secrets 값 (secrets.toml이 없어도 예외 없이 default)
+- setting(key): 환경변수가 있으면 그것, 없으면 secrets — 배포/벤치마크에서 덮어쓰는 경로·주소용
+- 다른 모듈을 import하지 않는다 (issue_store/metrics/sheets_client 어디서든 순환 없이 쓸 수 있게)
+"""
+import os
+
+import streamlit as st
+
+
+def secret(key, default=None):
+    """st.secrets 조회 (secrets.toml이 없어도 예외 없이 default 반환)"""
+    try:
+        return st.secrets[key] if key in st.secrets else default
+    except Exception:
+        return default
+
+
+def setting(key, default=None):
+    """환경변수 → secrets → default 순"""
+    return os.environ.get(key) or secret(key) or default
+
+
+def sheets_endpoint():
+    """SHEETS_ENDPOINT(환경변수 또는 secrets)가 있으면 Google 대신 이 주소로 요청 (benchmarks/fake_sheets.py)"""
+    endpoint = setting("SHEETS_ENDPOINT")
+    return endpoint.rstrip("/") if endpoint else None
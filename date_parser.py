@@ -0,0 +1,364 @@
+"""
+981Park 날짜 파싱 엔진
+- parse_jeju_date / parse_date_safe : 행 단위 원본 파서 (기준 동작)
+- parse_jeju_dates / parse_dates_safe : 컬럼 단위 벡터화 파서
+  고유 문자열만 한 번씩 파싱(메모이제이션)하고, strptime 포맷과 같은 의미의 정규식(pyarrow/RE2)으로
+  연·월·일·시·분·초를 뽑아 numpy로 조립한다. 애매한 값(범위 밖, 비ASCII 등)은 원본 파서로 넘기므로
+  결과는 원본 파서와 동일하다. 원본 파서가 tz가 있는 값을 돌려주면 KST로 바꾼 뒤 tz를 뗀다.
+"""
+import re
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+JEJU_DATE_FORMATS = [
+    "%Y-%m-%d %p %I:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+    "%y-%m-%d",
+    "%Y-%m-%d %I:%M:%S %p",
+]
+
+# JEJU_DATE_FORMATS와 같은 순서의 RE2 패턴. 필드는 자릿수만 보고 범위(월 1~12, 일 1~말일,
+# 시 0~23, 12시간제 1~12, 분·초 0~59)는 _assemble에서 검사한다 — strptime이 받는 값과 같다.
+_RE_YMD = r"(?P<Y>\d{4})-(?P<m>\d{1,2})-(?P<d>\d{1,2})"
+_RE_TIME = r"(?P<H>\d{1,2}):(?P<M>\d{1,2}):(?P<S>\d{1,2})"
+_RE_AMPM = r"(?P<p>[Aa][Mm]|[Pp][Mm])"
+JEJU_DATE_PATTERNS = [
+    (rf"^{_RE_YMD}\s+{_RE_AMPM}\s+{_RE_TIME}$", "12h"),
+    (rf"^{_RE_YMD}\s+{_RE_TIME}$", "24h"),
+    (rf"^{_RE_YMD}$", "date"),
+    (r"^(?P<Y>\d{2})-(?P<m>\d{1,2})-(?P<d>\d{1,2})$", "yy"),
+    (rf"^{_RE_YMD}\s+{_RE_TIME}\s+{_RE_AMPM}$", "12h"),
+]
+# 시트의 대부분을 차지하는 두 형식은 원문에 바로 적용 — 정리(공백/점/대시 치환) 후에도
+# 모양이 그대로인 경우만 받으므로 위 패턴을 정리된 문자열에 적용한 것과 결과가 같다.
+# 오전/오후 형식은 '오'가 든 값만 골라 AM/PM으로 바꾼 뒤, 24시간 형식은 나머지 값에만 적용하고
+# 필드는 캡처 그룹 대신 구분자로 잘라 얻는다 (패턴이 값마다 토큰 수와 순서를 고정)
+JEJU_RAW_12H = r"^\d{4} *\. *\d{1,2} *\. *\d{1,2} +[AP]M +\d{1,2}:\d{1,2}:\d{1,2}$"
+JEJU_RAW_24H = r"^\d{4}-\d{1,2}-\d{1,2} +\d{1,2}:\d{1,2}:\d{1,2}$"
+
+# pd.to_datetime(s)이 ISO 경로로 처리하는 형식 — 조립 결과가 동일하다
+_RE_ISO = r"^\s*(?P<Y>\d{4})-(?P<m>\d{2})-(?P<d>\d{2})(?:[ T](?P<H>\d{2}):(?P<M>\d{2})(?::(?P<S>\d{2}))?)?\s*$"
+# 'YYYY.M.D'도 pd.to_datetime(s)이 연-월-일로 읽는다
+_RE_DOTTED = r"^\s*(?P<Y>\d{4})\.(?P<m>\d{1,2})\.(?P<d>\d{1,2})\s*$"
+# try_regex_ymd와 같은 패턴 (한글이 섞인 값은 pd.to_datetime(s)이 항상 실패한다)
+_RE_KO_YMD = r"(?P<Y>\d{4})\D+(?P<m>\d{1,2})\D+(?P<d>\d{1,2})"
+
+KST = "Asia/Seoul"
+_SERIAL_RE = r"\d+(\.\d+)?"
+_SERIAL_MAX_DAYS = (pd.Timestamp.max.date() - datetime(1899, 12, 30).date()).days
+
+
+def parse_jeju_date(val):
+    """981파크 접수내용 날짜 파서"""
+    if pd.isna(val):
+        return pd.NaT
+    s = str(val).strip().replace("오전", "AM").replace("오후", "PM")
+    s = re.sub(r"\s*\.\s*", "-", s)
+    s = re.sub(r"-+", "-", s).strip("-")
+    for fmt in JEJU_DATE_FORMATS:
+        try:
+            return datetime.strptime(s, fmt)
+        except Exception:
+            continue
+    if re.fullmatch(_SERIAL_RE, s):
+        try:
+            return pd.to_datetime(float(s), unit="D", origin="1899-12-30")
+        except Exception:
+            pass
+    return pd.to_datetime(s, errors="coerce")
+
+
+def try_regex_ymd(s: str):
+    if not s or not isinstance(s, str):
+        return pd.NaT
+    m = re.search(r'(\d{4})\D+(\d{1,2})\D+(\d{1,2})', s)
+    if m:
+        y, mo, d = m.group(1), m.group(2), m.group(3)
+        try:
+            return pd.to_datetime(f"{int(y)}-{int(mo)}-{int(d)}")
+        except Exception:
+            return pd.NaT
+    return pd.NaT
+
+
+def parse_date_safe(val):
+    try:
+        if val is None:
+            return pd.NaT
+        if isinstance(val, (pd.Timestamp, datetime)):
+            return pd.to_datetime(val)
+        if isinstance(val, (int, float)) and not np.isnan(val):
+            try:
+                return pd.to_datetime(datetime(1899,12,30) + timedelta(days=int(val)))
+            except Exception:
+                pass
+        s = str(val).strip()
+        if s == "" or s.lower() in ["nan","none","nat"]:
+            return pd.NaT
+        p = pd.to_datetime(s, errors="coerce")
+        if not pd.isna(p):
+            return p
+        p2 = try_regex_ymd(s)
+        if not pd.isna(p2):
+            return p2
+        m2 = re.search(r'(\d{4})\s*[-./]?\s*(\d{1,2})\s*[-./]?\s*(\d{1,2})', s)
+        if m2:
+            y, mo, d = m2.groups()
+            try:
+                return pd.to_datetime(f"{int(y)}-{int(mo)}-{int(d)}")
+            except:
+                return pd.NaT
+        return pd.NaT
+    except Exception:
+        return pd.NaT
+
+
+def to_naive_kst(value) -> np.datetime64:
+    """원본 파서 결과 하나 → datetime64[ns] (tz가 있으면 KST로 바꾼 뒤 tz 제거, 해석 불가는 NaT)"""
+    try:
+        ts = pd.Timestamp(value)
+    except (TypeError, ValueError, OverflowError):
+        return np.datetime64("NaT", "ns")
+    if ts is pd.NaT:
+        return np.datetime64("NaT", "ns")
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(KST).tz_localize(None)
+    return ts.to_datetime64().astype("datetime64[ns]")
+
+
+def _assemble(year, month, day, hour=0, minute=0, second=0):
+    """연·월·일·시·분·초 정수 배열 → datetime64[ns] (범위/달력 검증 실패는 NaT)"""
+    year, month, day = (np.asarray(x, dtype="int64") for x in (year, month, day))
+    hour, minute, second = (np.broadcast_to(np.asarray(x, dtype="int64"), year.shape) for x in (hour, minute, second))
+    ok = (year >= 1678) & (year <= 2261) & (month >= 1) & (month <= 12) & (day >= 1)
+    ok &= (hour < 24) & (minute < 60) & (second < 60)
+    months = np.where(ok, (year - 1970) * 12 + (month - 1), 0)
+    start = months.astype("datetime64[M]").astype("datetime64[D]")
+    days_in_month = ((months + 1).astype("datetime64[M]").astype("datetime64[D]") - start).astype("int64")
+    ok &= day <= days_in_month
+    ts = (start + np.where(ok, day - 1, 0)).astype("datetime64[ns]")
+    ts = ts + (hour * 3600 + minute * 60 + second).astype("timedelta64[s]")
+    ts[~ok] = np.datetime64("NaT")
+    return ts
+
+
+def _ints(matched, name):
+    return pc.cast(matched.field(name), pa.int64()).to_numpy(zero_copy_only=False)
+
+
+def _split_tokens(texts, seps):
+    """
+    모양이 검증된 값을 구분자(seps, 공백)로 잘라 평탄화한 토큰 — 캡처 그룹 추출보다 몇 배 빠르다
+    모든 값이 같은 수의 토큰으로 잘리는 패턴에만 사용
+    """
+    for sep in seps:
+        texts = pc.replace_substring(texts, sep, " ")
+    return pc.list_flatten(pc.ascii_split_whitespace(texts))
+
+
+def _extract_into(out, texts, positions, pattern, build, groups=True):
+    """
+    아직 NaT인 위치에만 pattern을 적용해 build(matched) 결과를 채운다
+    groups=False면 캡처 그룹을 뽑지 않고 맞은 문자열을 그대로 build에 넘긴다
+    """
+    todo = np.isnat(out[positions])
+    if not todo.any():
+        return
+    texts, positions = texts.filter(pa.array(todo)), positions[todo]
+    # 캡처 그룹 추출은 매칭 여부 검사보다 비싸므로 맞는 값에만 적용한다
+    hit = pc.match_substring_regex(texts, pattern).to_numpy(zero_copy_only=False)
+    if not hit.any():
+        return
+    matched = texts.filter(pa.array(hit))
+    out[positions[hit]] = build(pc.extract_regex(matched, pattern) if groups else matched)
+
+
+def _hour12(year, hour, pm):
+    """12시간제 → 24시간제 (시는 1~12만 유효 — 벗어나면 연도를 0으로 만들어 NaT 처리)"""
+    return np.where((hour >= 1) & (hour <= 12), year, 0), hour % 12 + np.where(pm, 12, 0)
+
+
+def _jeju_builder(kind):
+    def build(matched):
+        year, month, day = _ints(matched, "Y"), _ints(matched, "m"), _ints(matched, "d")
+        if kind == "yy":
+            year = np.where(year < 69, 2000 + year, 1900 + year)
+        if kind in ("date", "yy"):
+            return _assemble(year, month, day)
+        hour = _ints(matched, "H")
+        if kind == "12h":
+            pm = pc.is_in(pc.ascii_lower(matched.field("p")), pa.array(["pm", "오후"])).to_numpy(zero_copy_only=False)
+            year, hour = _hour12(year, hour, pm)
+        return _assemble(year, month, day, hour, _ints(matched, "M"), _ints(matched, "S"))
+
+    return build
+
+
+def _build_raw_12h(matched):
+    """JEJU_RAW_12H에 맞은 값 — 토큰은 연, 월, 일, AM/PM, 시, 분, 초 순"""
+    tokens = _split_tokens(matched, ".:")
+    column = np.arange(len(tokens)) % 7
+    pm = pc.equal(tokens.filter(pa.array(column == 3)), "PM").to_numpy(zero_copy_only=False)
+    fields = pc.cast(tokens.filter(pa.array(column != 3)), pa.int64()).to_numpy(zero_copy_only=False)
+    year, month, day, hour, minute, second = fields.reshape(-1, 6).T
+    year, hour = _hour12(year, hour, pm)
+    return _assemble(year, month, day, hour, minute, second)
+
+
+def _build_raw_24h(matched):
+    """JEJU_RAW_24H에 맞은 값 — 토큰은 연, 월, 일, 시, 분, 초 순"""
+    fields = pc.cast(_split_tokens(matched, "-:"), pa.int64()).to_numpy(zero_copy_only=False)
+    return _assemble(*fields.reshape(-1, 6).T)
+
+
+def _build_iso(matched):
+    def opt(name):
+        field = matched.field(name)
+        return pc.cast(pc.if_else(pc.equal(field, ""), "0", field), pa.int64()).to_numpy(zero_copy_only=False)
+
+    return _assemble(_ints(matched, "Y"), _ints(matched, "m"), _ints(matched, "d"), opt("H"), opt("M"), opt("S"))
+
+
+def _build_ymd(matched):
+    year = _ints(matched, "Y")
+    # int("0025") → 25처럼 연도가 바뀌는 값은 원본 파서에 맡긴다
+    year = np.where(year >= 1000, year, 0)
+    return _assemble(year, _ints(matched, "m"), _ints(matched, "d"))
+
+
+def _parse_uniques(uniq: pd.Series, vectorized, parser) -> np.ndarray:
+    """
+    고유값 배열 파싱 — 문자열은 vectorized(out, texts, positions)로 먼저 채우고,
+    남은 값(NaT)만 원본 parser로 처리한다
+    """
+    out = np.full(len(uniq), np.datetime64("NaT"), dtype="datetime64[ns]")
+    try:
+        texts = pa.array(uniq.to_numpy(), type=pa.string())
+        positions = np.arange(len(uniq))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        is_str = np.fromiter((isinstance(v, str) for v in uniq), dtype=bool, count=len(uniq))
+        positions = np.flatnonzero(is_str)
+        texts = pa.array(uniq.to_numpy()[positions], type=pa.string())
+    if len(positions):
+        vectorized(out, texts, positions)
+
+    todo = np.flatnonzero(np.isnat(out))
+    if len(todo):
+        # 묶어서 to_datetime하면 tz가 있는 값 하나 때문에 나머지가 NaT가 되므로 값마다 변환
+        out[todo] = [to_naive_kst(parser(v)) for v in uniq.iloc[todo]]
+    return out
+
+
+class _ParseMemo:
+    """
+    고유 문자열 → 파싱 결과 캐시 (프로세스 전역)
+    시트를 다시 읽어도 대부분의 날짜 문자열은 이전과 같으므로 새 값만 파싱한다.
+    """
+
+    def __init__(self, max_size: int = 500_000):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._keys = pd.Index([], dtype=object)
+        self._values = np.empty(0, dtype="datetime64[ns]")
+
+    def lookup(self, uniq: pd.Series, vectorized, parser) -> np.ndarray:
+        with self._lock:
+            out = np.full(len(uniq), np.datetime64("NaT"), dtype="datetime64[ns]")
+            hit = self._keys.get_indexer(uniq) if len(self._keys) else np.full(len(uniq), -1)
+            found = hit >= 0
+            out[found] = self._values[hit[found]]
+            miss = np.flatnonzero(~found)
+            if len(miss):
+                new_keys = uniq.iloc[miss].reset_index(drop=True)
+                parsed = _parse_uniques(new_keys, vectorized, parser)
+                out[miss] = parsed
+                if len(self._keys) + len(miss) > self.max_size:
+                    self._keys = pd.Index([], dtype=object)
+                    self._values = np.empty(0, dtype="datetime64[ns]")
+                self._keys = self._keys.append(pd.Index(new_keys.to_numpy(), dtype=object))
+                self._values = np.concatenate([self._values, parsed])
+            return out
+
+    def clear(self):
+        with self._lock:
+            self._keys = pd.Index([], dtype=object)
+            self._values = np.empty(0, dtype="datetime64[ns]")
+
+
+_JEJU_MEMO = _ParseMemo()
+_SAFE_MEMO = _ParseMemo()
+
+
+def _vectorized_jeju(out, texts, positions):
+    # 원문 패턴은 ASCII만 받으므로(RE2의 \d, 공백 리터럴) 문자 종류를 거르지 않고 바로 적용한다
+    ko = pc.match_substring(texts, "오").to_numpy(zero_copy_only=False)
+    ko_texts = pc.replace_substring(pc.replace_substring(texts.filter(pa.array(ko)), "오전", "AM"), "오후", "PM")
+    _extract_into(out, ko_texts, positions[ko], JEJU_RAW_12H, _build_raw_12h, groups=False)
+    _extract_into(out, texts.filter(pa.array(~ko)), positions[~ko], JEJU_RAW_24H, _build_raw_24h, groups=False)
+
+    # 나머지는 공백/숫자 판정이 Python re와 RE2에서 같도록 ASCII(+오전/오후)만 처리
+    todo = np.isnat(out[positions])
+    texts, positions = texts.filter(pa.array(todo)), positions[todo]
+    gate = pc.match_substring_regex(texts, r"^[\x20-\x7e오전후]*$").to_numpy(zero_copy_only=False)
+    texts, positions = texts.filter(pa.array(gate)), positions[gate]
+    cleaned = pc.ascii_trim_whitespace(texts)
+    cleaned = pc.replace_substring(cleaned, "오전", "AM")
+    cleaned = pc.replace_substring(cleaned, "오후", "PM")
+    cleaned = pc.replace_substring_regex(cleaned, r"\s*\.\s*", "-")
+    cleaned = pc.replace_substring_regex(cleaned, r"--+", "-")
+    cleaned = pc.utf8_trim(cleaned, "-")
+
+    for pattern, kind in JEJU_DATE_PATTERNS:
+        _extract_into(out, cleaned, positions, pattern, _jeju_builder(kind))
+
+    todo = np.isnat(out[positions])
+    serial = todo & pc.match_substring_regex(cleaned, r"^\d+(\.\d+)?$").to_numpy(zero_copy_only=False)
+    if serial.any():
+        days = pc.cast(cleaned.filter(pa.array(serial)), pa.float64()).to_numpy(zero_copy_only=False)
+        # datetime64[ns] 범위 밖(전화번호·ID 같은 긴 숫자)은 to_datetime이 OverflowError — NaT로 남겨 원본 파서에 맡긴다
+        ok = days <= _SERIAL_MAX_DAYS
+        out[positions[serial][ok]] = pd.to_datetime(
+            days[ok], unit="D", origin="1899-12-30", errors="coerce"
+        ).to_numpy(dtype="datetime64[ns]")
+
+
+def _vectorized_safe(out, texts, positions):
+    ascii_only = pc.match_substring_regex(texts, r"^[\x20-\x7e]*$").to_numpy(zero_copy_only=False)
+    ascii_texts, ascii_positions = texts.filter(pa.array(ascii_only)), positions[ascii_only]
+    _extract_into(out, ascii_texts, ascii_positions, _RE_ISO, _build_iso)
+    _extract_into(out, ascii_texts, ascii_positions, _RE_DOTTED, _build_ymd)
+
+    korean = pc.and_(
+        pc.match_substring_regex(texts, r"^[\x20-\x7e가-힣]*$"),
+        pc.match_substring_regex(texts, r"[가-힣]"),
+    ).to_numpy(zero_copy_only=False)
+    _extract_into(out, texts.filter(pa.array(korean)), positions[korean], _RE_KO_YMD, _build_ymd)
+
+
+def _parse_column(values, vectorized, parser, memo) -> pd.Series:
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    uniq = pd.Series(uniques, dtype=object)
+    if memo is None:
+        parsed = _parse_uniques(uniq, vectorized, parser)
+    else:
+        parsed = memo.lookup(uniq, vectorized, parser)
+    # 결측 코드(-1)는 맨 끝의 NaT를 가리키게 한다
+    parsed = np.append(parsed, np.datetime64("NaT", "ns"))
+    return pd.Series(parsed[codes], index=values.index)
+
+
+def parse_jeju_dates(values, memo: bool = True) -> pd.Series:
+    """parse_jeju_date의 벡터화 버전 (datetime64 Series 반환)"""
+    return _parse_column(values, _vectorized_jeju, parse_jeju_date, _JEJU_MEMO if memo else None)
+
+
+def parse_dates_safe(values, memo: bool = True) -> pd.Series:
+    """parse_date_safe의 벡터화 버전 (datetime64 Series 반환)"""
+    return _parse_column(values, _vectorized_safe, parse_date_safe, _SAFE_MEMO if memo else None)
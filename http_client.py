@@ -0,0 +1,98 @@
+"""
+981Park 공용 HTTP 클라이언트
+- 프로세스 전체가 requests.Session 하나를 공유 (keep-alive 커넥션 풀 → TLS 핸드셰이크 재사용)
+- Accept-Encoding: gzip, 429/5xx·연결 오류는 지터가 섞인 지수 백오프로 제한 횟수만 재시도
+- 호출마다 엔드포인트별 지연/상태를 metrics에 더한다 (재시도 대기 포함)
+"""
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import http_endpoint, observe_http
+
+DEFAULT_TIMEOUT = 15  # 초
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # 초 — 0.5, 1, 2 … 에 0~100% 지터를 더한다
+BACKOFF_MAX = 8.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+POOL_SIZE = 10
+
+
+class HttpClient:
+    """커넥션 풀 + 재시도/백오프 + 호출별 지연 지표"""
+
+    def __init__(self, max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, timeout=DEFAULT_TIMEOUT):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+
+    def _backoff(self, attempt: int, resp=None) -> float:
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX)
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay + random.uniform(0, delay), BACKOFF_MAX)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """재시도 후에도 429/5xx면 마지막 응답을 그대로 돌려준다 (상태 확인은 호출 측)"""
+        kwargs.setdefault("timeout", self.timeout)
+        started = time.time()
+        attempt = 0
+        resp = None
+        try:
+            while True:
+                try:
+                    resp = self.session.request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout):
+                    resp = None
+                    if attempt >= self.max_retries:
+                        raise
+                else:
+                    if resp.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                        return resp
+                time.sleep(self._backoff(attempt, resp))
+                attempt += 1
+        finally:
+            parts = urlsplit(url)
+            status = resp.status_code if resp is not None else 0  # 연결 실패는 0
+            observe_http(http_endpoint(parts.netloc, parts.path), time.time() - started, status)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_text(self, url: str, **kwargs) -> str:
+        """UTF-8 텍스트 — HTTP 오류/HTML 응답(공유 설정 문제)은 예외"""
+        resp = self.get(url, **kwargs)
+        if resp.status_code != 200:
+            raise RuntimeError(f"HTTP {resp.status_code}: {url}")
+        resp.encoding = "utf-8"
+        text = resp.text
+        if text.strip()[:200].lower().startswith("<"):
+            raise RuntimeError("CSV 대신 HTML 응답 수신 — 공유 설정 확인 필요.")
+        return text
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """프로세스 공용 클라이언트 (백그라운드 스레드에서도 사용하므로 st.cache_resource 대신 모듈 싱글턴)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
@@ -0,0 +1,175 @@
+"""
+981Park 장애 집계 큐브
+- 월 × 포지션 × 위치 × 상태별 건수(issue_cube_for)와 일 × 상태별 건수(daily_cube_for)를 프로세스 공용으로 유지
+  일을 월 큐브에 넣으면 셀 수가 행 수와 비슷해져 조각을 훑는 비용이 원본 프레임과 같아지므로 따로 둔다
+- 스냅샷이 바뀌면 _id별 차원 값 해시를 비교해 새 행/바뀐 행/사라진 행만 건수에 더하고 뺀다
+- KPI 카드와 월별 추이는 월 큐브 조각(셀 수백~수천 개)만 훑는다 — 필터를 바꿔도 원본 행 전체를 보지 않음
+- 날짜를 해석하지 못한 행은 집계하지 않는다 (대시보드 화면과 같은 기준)
+"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from perf_trace import timed
+
+DIMENSIONS = ["_month", "포지션", "위치", "_status"]
+DAILY_DIMENSIONS = ["_day", "_status"]
+FILTERS = {"months": "_month", "days": "_day", "positions": "포지션", "locations": "위치", "statuses": "_status"}
+COUNT = "건수"
+
+
+def _dimension(dated: pd.DataFrame, name: str) -> pd.Series:
+    """날짜가 있는 행의 차원 값 한 개 (_day는 날짜형 — 문자열 변환은 바뀐 행만)"""
+    if name == "_month":
+        return dated["_month"] if "_month" in dated.columns else dated["_parsed_date"].dt.strftime("%Y-%m")
+    if name == "_day":
+        return dated["_parsed_date"].dt.floor("D")
+    if name not in dated.columns:
+        return pd.Series("", index=dated.index)
+    return dated[name].fillna("").astype(str)
+
+
+def _dimensions(df: pd.DataFrame, dimensions) -> pd.DataFrame:
+    dated = df[df["_parsed_date"].notna()]
+    return pd.DataFrame({name: _dimension(dated, name) for name in dimensions}, index=dated.index)
+
+
+@dataclass(frozen=True)
+class CubeView:
+    """한 스냅샷 시점의 큐브 (읽기 전용) — cells: 큐브 차원 + 건수, 0건 셀 제외"""
+    cells: pd.DataFrame
+
+    def slice(self, **filters) -> pd.DataFrame:
+        """months/positions/locations/statuses(일 큐브는 days/statuses)=[값, ...] 조건에 맞는 셀 (None이면 조건 없음)"""
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+        for name, values in filters.items():
+            if values is not None:
+                mask &= cells[FILTERS[name]].isin(list(values)).to_numpy()
+        return cells[mask]
+
+    def values(self, dimension: str):
+        return sorted(self.cells[dimension].unique())
+
+    def status_counts(self, **filters):
+        """(전체, 점검중, 미조치(접수중), 완료, 완료율%)"""
+        cells = self.slice(**filters)
+        by_status = cells.groupby("_status")[COUNT].sum()
+        total = int(by_status.sum())
+        prog = int(by_status.get("점검중", 0))
+        pend = int(by_status.get("미조치(접수중)", 0))
+        done = int(by_status.get("완료", 0))
+        rate = (done / total * 100) if total else 0.0
+        return total, prog, pend, done, rate
+
+    def monthly_status(self, statuses, **filters) -> pd.DataFrame:
+        """월(YYYY-MM) × 상태 건수 표 (월 오름차순)"""
+        cells = self.slice(**filters)
+        return (
+            cells.groupby(["_month", "_status"])[COUNT].sum()
+            .unstack(fill_value=0)
+            .reindex(columns=list(statuses), fill_value=0)
+            .sort_index()
+        )
+
+
+class IssueCube:
+    """셀(차원 값 조합)별 건수 배열 + _id별 소속 셀 — sync()로 증분 갱신"""
+
+    def __init__(self, dimensions=DIMENSIONS):
+        self.dimensions = list(dimensions)
+        self._lock = threading.Lock()
+        self._cell_of = {}  # 차원 값 tuple → 셀 번호
+        self._keys = []  # 셀 번호 → 차원 값 tuple
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._ids = pd.Index([], dtype=object)  # 집계된 행 _id
+        self._cells = np.zeros(0, dtype=np.int64)  # _id별 셀 번호
+        self._sigs = np.zeros(0, dtype=np.uint64)  # _id별 차원 값 해시
+        self._view = None
+
+    def _cell(self, key) -> int:
+        cell = self._cell_of.get(key)
+        if cell is None:
+            cell = self._cell_of[key] = len(self._keys)
+            self._keys.append(key)
+        return cell
+
+    @timed("aggregate")
+    def sync(self, df: pd.DataFrame) -> CubeView:
+        """스냅샷 프레임과 맞춘 뒤 CubeView 반환 — 바뀐 행만 건수에 반영"""
+        if df.empty or "_id" not in df.columns:
+            dims = pd.DataFrame(
+                {c: pd.Series(dtype="datetime64[ns]" if c == "_day" else object) for c in self.dimensions}
+            )
+            ids = np.array([], dtype=object)
+        else:
+            dims = _dimensions(df, self.dimensions)
+            ids = df["_id"].to_numpy(dtype=object)[df["_parsed_date"].notna().to_numpy()]
+        sigs = pd.util.hash_pandas_object(dims, index=False).to_numpy()
+
+        with self._lock:
+            pos = self._ids.get_indexer(ids)
+            same = pos >= 0
+            same[same] = self._sigs[pos[same]] == sigs[same]
+            gone = np.setdiff1d(np.arange(len(self._ids)), pos[same], assume_unique=True)
+            if self._view is not None and same.all() and not len(gone):
+                return self._view
+
+            counts = self._counts
+            np.subtract.at(counts, self._cells[gone], 1)  # 바뀐 행의 이전 셀 + 사라진 행
+            changed = dims[~same]
+            if "_day" in changed.columns:
+                changed = changed.assign(_day=changed["_day"].dt.strftime("%Y-%m-%d"))
+            added = np.fromiter(
+                (self._cell(key) for key in changed.itertuples(index=False, name=None)),
+                dtype=np.int64, count=int((~same).sum()),
+            )
+            if len(self._keys) > len(counts):
+                counts = np.concatenate([counts, np.zeros(len(self._keys) - len(counts), dtype=np.int64)])
+            np.add.at(counts, added, 1)
+
+            cells = np.empty(len(ids), dtype=np.int64)
+            cells[same] = self._cells[pos[same]]
+            cells[~same] = added
+            self._counts, self._ids, self._cells, self._sigs = counts, pd.Index(ids, dtype=object), cells, sigs
+
+            live = np.flatnonzero(counts)
+            table = pd.DataFrame([self._keys[c] for c in live], columns=self.dimensions)
+            table[COUNT] = counts[live]
+            self._view = CubeView(cells=table)
+            return self._view
+
+
+_cube = None
+_daily_cube = None
+_cube_lock = threading.Lock()
+
+
+def get_issue_cube() -> IssueCube:
+    global _cube
+    if _cube is None:
+        with _cube_lock:
+            if _cube is None:
+                _cube = IssueCube()
+    return _cube
+
+
+def get_daily_cube() -> IssueCube:
+    global _daily_cube
+    if _daily_cube is None:
+        with _cube_lock:
+            if _daily_cube is None:
+                _daily_cube = IssueCube(DAILY_DIMENSIONS)
+    return _daily_cube
+
+
+def issue_cube_for(snapshot) -> CubeView:
+    """스냅샷 버전마다 한 번만 증분 갱신된 월 × 포지션 × 위치 × 상태 집계"""
+    return snapshot.derive("issue_cube", get_issue_cube().sync)
+
+
+def daily_cube_for(snapshot) -> CubeView:
+    """스냅샷 버전마다 한 번만 증분 갱신된 일 × 상태 집계"""
+    return snapshot.derive("daily_cube", get_daily_cube().sync)
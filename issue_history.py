@@ -0,0 +1,88 @@
+"""
+981Park 장애 이력(완료) 데이터
+- 접수내용 스냅샷 → 완료/긴급 플래그가 붙은 완료 이력 프레임 (페이지와 벤치마크가 함께 쓴다)
+"""
+import pandas as pd
+
+from date_parser import parse_dates_safe
+
+
+def detect_columns_from_df(cols):
+    status_col = next((c for c in cols if any(x in c for x in ["상태","접수처리","처리상태","status"])), None)
+    closure_col = next((c for c in cols if any(x in c for x in ["종결","종결여부","완결"])), None)
+    date_col = next((c for c in cols if any(x in c for x in ["날짜","접수일","date","등록일","완료일자"])), None)
+    pos_col = next((c for c in cols if any(x in c for x in ["포지션","위치","site","position"])), None)
+    return status_col, closure_col, date_col, pos_col
+
+
+URGENT_PATTERN = r"\b긴급\b|\burgent\b"
+
+
+def _matches(series, pattern):
+    """고유값 단위로 정규식 검사 후 행에 매핑"""
+    text = series.fillna("").astype(str)
+    uniques = pd.Series(text.unique())
+    hit = dict(zip(uniques, uniques.str.contains(pattern, case=False, regex=True, na=False)))
+    return text.map(hit).astype(bool)
+
+
+def flag_completed(df, status_col, closure_col):
+    """접수처리 '완료' 또는 종결 '종결'이면 완료 (열 단위)"""
+    done = pd.Series(False, index=df.index)
+    if status_col and status_col in df.columns:
+        done |= df[status_col].fillna("").astype(str).str.strip() == "완료"
+    if closure_col and closure_col in df.columns:
+        done |= df[closure_col].fillna("").astype(str).str.strip() == "종결"
+    return done
+
+
+def flag_urgent(df):
+    """긴급 여부 — 구분/긴급 열 기준 (없으면 모든 텍스트 열에서 '긴급'/'urgent' 단어 검색)"""
+    cols = [c for c in df.columns if not c.startswith("_") and (c == "구분" or "긴급" in c)]
+    if not cols:
+        cols = [c for c in df.columns if not c.startswith("_") and df[c].dtype == object]
+    urgent = pd.Series(False, index=df.index)
+    for c in cols:
+        urgent |= _matches(df[c], URGENT_PATTERN)
+    return urgent
+
+
+def build_completed_issues(df):
+    """스냅샷 → 완료 이력 프레임 (스냅샷당 한 번만 계산)"""
+    if df.empty:
+        raise RuntimeError("시트 로드 성공했으나 데이터(헤더 제외 행)가 없습니다.")
+    df = df.copy()
+
+    empty_cols = [c for c in df.columns if not c.startswith("_") and not df[c].astype(bool).any()]
+    if empty_cols:
+        df = df.drop(columns=empty_cols)
+
+    cols = [c for c in df.columns if not c.startswith("_")]
+    status_col, closure_col, date_col, pos_col = detect_columns_from_df(cols)
+
+    parsed_series = pd.Series(pd.NaT, index=df.index)
+    if date_col and date_col in df.columns:
+        parsed_series = parse_dates_safe(df[date_col])
+    else:
+        candidates = []
+        for c in cols:
+            if any(k in c for k in ["날", "date", "완료", "접수", "등록"]):
+                candidates.append(c)
+        for cand in candidates:
+            try:
+                this_parsed = parse_dates_safe(df[cand])
+                if this_parsed.notna().sum() > 0:
+                    parsed_series = parsed_series.combine_first(this_parsed)
+            except Exception:
+                continue
+
+    df["_parsed_date"] = parsed_series
+    df["_is_completed"] = flag_completed(df, status_col, closure_col)
+    df["_is_urgent"] = flag_urgent(df)
+    completed_df = df[df["_is_completed"]].reset_index(drop=True)
+    return completed_df, (status_col, closure_col, date_col, pos_col)
+
+
+def completed_issues(snapshot):
+    """스냅샷당 한 번만 만든 (완료 이력 프레임, (상태, 종결, 날짜, 포지션 열)) — 읽기 전용"""
+    return snapshot.derive("history_completed", build_completed_issues)
@@ -0,0 +1,169 @@
+"""
+981Park 접수내용 로컬 SQLite 미러 (선택 기능) — Google Sheets 장애 대비용
+- secrets/환경변수 ISSUE_MIRROR_PATH가 있으면 활성화
+- 백그라운드 스레드가 공용 저장소 스냅샷을 SQLite에 기록 — 내용(content_hash)이 바뀐 경우에만 쓴다
+- 용도는 하나: Sheets 로드가 실패하면 IssueLogStore.fallback(load_frame)으로 마지막 미러 전체를 돌려준다
+- 페이지 조회/필터에는 쓰지 않는다 — 미러는 최대 MIRROR_SYNC_INTERVAL만큼 늦으므로
+  현재 스냅샷과 섞으면 방금 완료된 행이 빠진다 (그래서 조회용 인덱스도 두지 않는다)
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from config import setting
+from issue_store import get_issue_store
+
+MIRROR_SYNC_INTERVAL = 30  # 초
+TABLE = "issues"
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """컬럼명 + 전체 값 해시 — 미러에 쓸지 판단용"""
+    h = hashlib.sha1("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _q(name: str) -> str:
+    """SQLite 식별자 인용 (한글 컬럼명 포함)"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class IssueMirror:
+    """접수내용 SQLite 미러 — 스레드별 커넥션, WAL 모드"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._synced_version = None
+        with self._conn() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ── 메타 ──────────────────────────────
+    def _meta(self, key, default=None):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    @property
+    def version(self) -> int:
+        return int(self._meta("version", 0))
+
+    @property
+    def synced_at(self) -> float:
+        return float(self._meta("synced_at", 0))
+
+    @property
+    def content_hash(self):
+        return self._meta("content_hash")
+
+    def columns(self):
+        return [r[1] for r in self._conn().execute(f"PRAGMA table_info({TABLE})")]
+
+    def is_populated(self) -> bool:
+        return bool(self.columns())
+
+    # ── 쓰기 ──────────────────────────────
+    def write_frame(self, df: pd.DataFrame, version: int) -> bool:
+        """
+        스냅샷 전체를 한 트랜잭션으로 교체 (읽는 쪽은 이전/새 버전 중 하나만 본다)
+        미러에 있는 내용과 같으면 쓰지 않고 False — 프로세스를 재시작해도 같은 내용을 다시 쓰지 않는다
+        """
+        if df.empty:
+            return False
+        cols = list(df.columns)
+        digest = frame_hash(df)
+        if digest == self.content_hash and self.columns() == cols:
+            return False
+        rows = df.copy()
+        rows["_parsed_date"] = rows["_parsed_date"].dt.strftime("%Y-%m-%d %H:%M:%S")
+        text_cols = [c for c in cols if c not in ("_row", "_parsed_date")]
+        rows[text_cols] = rows[text_cols].fillna("")
+        rows = rows.astype(object).where(rows.notna(), None)
+
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                if self.columns() != cols:
+                    conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+                    col_defs = ", ".join(
+                        f"{_q(c)} INTEGER PRIMARY KEY" if c == "_row" else f"{_q(c)} TEXT" for c in cols
+                    )
+                    conn.execute(f"CREATE TABLE {TABLE} ({col_defs})")
+                conn.execute(f"DELETE FROM {TABLE}")
+                conn.executemany(
+                    f"INSERT INTO {TABLE} VALUES ({', '.join('?' for _ in cols)})",
+                    rows.itertuples(index=False, name=None),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                    [("version", str(version)), ("synced_at", str(time.time())), ("content_hash", digest)],
+                )
+        return True
+
+    # ── 읽기 ──────────────────────────────
+    def load_frame(self) -> pd.DataFrame:
+        """미러 전체 → 저장소 표준 프레임과 같은 모양"""
+        if not self.is_populated():
+            return pd.DataFrame()
+        cursor = self._conn().execute(f"SELECT * FROM {TABLE} ORDER BY _row")
+        names = [d[0] for d in cursor.description]
+        df = pd.DataFrame(cursor.fetchall(), columns=names)
+        if "_parsed_date" in df.columns:
+            df["_parsed_date"] = pd.to_datetime(df["_parsed_date"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+        text_cols = [c for c in names if c not in ("_row", "_parsed_date")]
+        df[text_cols] = df[text_cols].fillna("")
+        return df
+
+    # ── 백그라운드 동기화 ──────────────────
+    def sync_once(self, store):
+        snapshot = store.get()
+        if snapshot.source != "mirror" and snapshot.version != self._synced_version:
+            self.write_frame(snapshot.df, snapshot.version)
+            self._synced_version = snapshot.version
+
+    def start_sync(self, store, interval: float = MIRROR_SYNC_INTERVAL):
+        if self._thread is not None:
+            return
+
+        def loop():
+            while True:
+                try:
+                    self.sync_once(store)
+                except Exception:
+                    pass  # Sheets 장애 중에는 기존 미러를 그대로 사용
+                time.sleep(interval)
+
+        self._thread = threading.Thread(target=loop, name="issue-mirror-sync", daemon=True)
+        self._thread.start()
+
+
+def mirror_path():
+    return setting("ISSUE_MIRROR_PATH")
+
+
+@st.cache_resource
+def get_issue_mirror():
+    """미러가 설정되어 있으면 IssueMirror(동기화 스레드 시작), 아니면 None"""
+    path = mirror_path()
+    if not path:
+        return None
+    mirror = IssueMirror(path)
+    store = get_issue_store()
+    store.fallback = mirror.load_frame
+    mirror.start_sync(store)
+    return mirror
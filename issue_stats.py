@@ -0,0 +1,114 @@
+"""
+981Park 장애 통계 집계
+- 장애통계 시트를 읽지 않고 접수내용 프레임(스냅샷)에서 groupby로 바로 계산
+- 월별 포지션 TOP-N (실제 상태 기준 미조치/조치완료), 세부기기/장애유형/총기 모델/서바이벌 키워드별 건수
+- 모든 함수는 N과 기간(start~end 날짜 또는 'YYYY-MM' 월 목록)을 받는다
+- 입력 프레임은 수정하지 않는다 (스냅샷 df를 그대로 넘겨도 된다)
+"""
+import pandas as pd
+
+from config import secret
+
+DONE_STATUS = "완료"
+SURVIVAL_PATTERN = "서바이벌"  # 포지션/위치/설비명에 이 단어가 있으면 서바이벌 장비
+GUN_MODEL_COLUMN = "설비명"  # 서바이벌 장비 중 총기 모델이 들어 있는 열
+DEFAULT_SURVIVAL_KEYWORDS = ["배터리", "충전", "탄창", "발사", "조준", "센서", "조끼", "통신", "전원"]
+
+
+def survival_keywords():
+    """secrets SURVIVAL_KEYWORDS(목록 또는 쉼표 구분 문자열)가 있으면 그것을 쓴다"""
+    value = secret("SURVIVAL_KEYWORDS")
+    if not value:
+        return list(DEFAULT_SURVIVAL_KEYWORDS)
+    if isinstance(value, str):
+        value = value.split(",")
+    return [k.strip() for k in value if str(k).strip()]
+
+
+def in_period(df: pd.DataFrame, start=None, end=None, months=None) -> pd.DataFrame:
+    """날짜가 있는 행 중 start~end(날짜, 양끝 포함) / months(['YYYY-MM', ...]) 안의 행"""
+    if df.empty:
+        return df
+    dates = df["_parsed_date"]
+    mask = dates.notna()
+    if months is not None:
+        mask &= df["_month"].isin(list(months))
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start)
+    if end is not None:
+        mask &= dates < pd.Timestamp(end) + pd.Timedelta(days=1)
+    return df[mask]
+
+
+def _text(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[column].fillna("").astype(str).str.strip()
+
+
+def top_positions(df: pd.DataFrame, n: int = 5, **period) -> pd.DataFrame:
+    """
+    월별 접수 건수 상위 N 포지션
+    컬럼: 월, 포지션, 전체접수, 조치완료, 미조치 (월 오름차순, 월 안에서는 건수 내림차순)
+    """
+    columns = ["월", "포지션", "전체접수", "조치완료", "미조치"]
+    rows = in_period(df, **period)
+    position = _text(rows, "포지션")
+    rows = rows[position != ""]
+    if rows.empty:
+        return pd.DataFrame(columns=columns)
+
+    counts = (
+        pd.DataFrame({
+            "월": rows["_month"],
+            "포지션": position[rows.index],
+            "완료": rows["_status"] == DONE_STATUS,
+        })
+        .groupby(["월", "포지션"])["완료"]
+        .agg(전체접수="size", 조치완료="sum")
+        .reset_index()
+    )
+    counts["조치완료"] = counts["조치완료"].astype(int)
+    counts["미조치"] = counts["전체접수"] - counts["조치완료"]
+    counts = counts.sort_values(["월", "전체접수", "포지션"], ascending=[True, False, True], kind="stable")
+    return counts.groupby("월", sort=False).head(n).reset_index(drop=True)[columns]
+
+
+def breakdown(df: pd.DataFrame, column: str, n: int = None, **period) -> pd.DataFrame:
+    """열 값별 건수 (빈 값 제외, 많은 순 상위 N) — 컬럼: 항목, 건수"""
+    values = _text(in_period(df, **period), column)
+    counts = values[values != ""].value_counts()
+    if n is not None:
+        counts = counts.head(n)
+    return pd.DataFrame({"항목": counts.index, "건수": counts.to_numpy(dtype=int)})
+
+
+def survival_rows(df: pd.DataFrame, **period) -> pd.DataFrame:
+    rows = in_period(df, **period)
+    mask = pd.Series(False, index=rows.index)
+    for column in ("포지션", "위치", "설비명"):
+        mask |= _text(rows, column).str.contains(SURVIVAL_PATTERN, regex=False)
+    return rows[mask]
+
+
+def gun_models(df: pd.DataFrame, n: int = None, **period) -> pd.DataFrame:
+    """서바이벌 총기 모델별 고장 횟수"""
+    return breakdown(survival_rows(df, **period), GUN_MODEL_COLUMN, n)
+
+
+def keyword_counts(df: pd.DataFrame, keywords, column: str = "장애내용", n: int = None) -> pd.DataFrame:
+    """키워드를 포함한 행 수 (키워드당 한 번, 대소문자 무시, 0건 제외)"""
+    text = _text(df, column).str.lower()
+    counts = pd.Series(
+        {k: int(text.str.contains(k.lower(), regex=False).sum()) for k in keywords},
+        dtype=int,
+    )
+    counts = counts[counts > 0].sort_values(ascending=False, kind="stable")
+    if n is not None:
+        counts = counts.head(n)
+    return pd.DataFrame({"항목": counts.index, "건수": counts.to_numpy(dtype=int)})
+
+
+def survival_keyword_counts(df: pd.DataFrame, n: int = None, **period) -> pd.DataFrame:
+    """서바이벌 장비 장애내용의 키워드별 장애 횟수"""
+    return keyword_counts(survival_rows(df, **period), survival_keywords(), n=n)
@@ -0,0 +1,475 @@
+"""
+981Park 접수내용 공용 저장소
+- 접수내용 시트를 프로세스 단위로 한 번만 불러와 표준 프레임으로 파싱
+- 모든 페이지는 get_issue_snapshot()으로 버전이 붙은 읽기 전용 스냅샷을 받는다
+"""
+import csv
+import hashlib
+import io
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import streamlit as st
+
+from config import secret, sheets_endpoint
+from date_parser import parse_jeju_dates
+from http_client import get_http_client
+from metrics import get_metrics
+from perf_trace import count_cache, span
+
+SHEET_ID = "1Gm0GPsWm1H9fPshiBo8gpa8djwnPa4ordj9wWTGG_vI"
+SHEET_LOG_GID = "389240943"
+SHEET_LOG_NAME = "접수내용"
+REFRESH_INTERVAL = 30  # 초 — 서버 전체에서 이 간격마다 한 번만 시트를 읽는다
+FULL_SYNC_INTERVAL = 600  # 초 — 증분 동기화 중에도 이 간격마다 전체를 다시 읽는다
+SYNC_FIXED_COLS = 9  # A~I: 접수 후 바뀌지 않는 열 (J~: 접수처리/점검자/완료일자/점검내용/종결)
+SYNC_TAIL_CHECK_ROWS = 5
+RETRY_BACKOFF = 5  # 초 — 로드 실패 후 첫 재시도까지, 실패가 이어지면 두 배씩
+RETRY_BACKOFF_MAX = 300  # 초 — 재시도 간격 상한
+ISSUE_KEY_COLUMNS = ["날짜", "작성자", "설비명"]  # A~I 고정 열 — 접수 후 바뀌지 않으므로 ID가 안정적
+
+
+def sheet_csv_url(gid: str = SHEET_LOG_GID) -> str:
+    sheet_id = secret("SPREADSHEET_ID") or SHEET_ID
+    base = sheets_endpoint() or "https://docs.google.com"
+    return f"{base}/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
+
+
+def normalize_status(s):
+    """접수처리 → 표준 상태"""
+    if pd.isna(s):
+        return "미정의"
+    sv = str(s).strip()
+    if sv in ["점검중", "진행중", "처리중"]:
+        return "점검중"
+    if sv in ["접수중", "대기", "미조치"]:
+        return "미조치(접수중)"
+    if sv in ["완료", "운영중", "사용중지"]:
+        return "완료"
+    return sv
+
+
+def _clean_header(header):
+    """줄바꿈 제거 + 중복 컬럼명은 __dupN 접미사로 구분"""
+    seen = {}
+    out = []
+    for c in header:
+        base = str(c or "").replace("\n", "").replace("\r", "").strip()
+        if base in seen:
+            seen[base] += 1
+            base = f"{base}__dup{seen[base]}"
+        else:
+            seen[base] = 0
+        out.append(base)
+    return out
+
+
+def open_log_worksheet():
+    """서비스계정이 있으면 접수내용 Worksheet(공용 핸들 풀), 없으면 None"""
+    from sheets_client import get_sheets_pool
+
+    pool = get_sheets_pool()
+    if pool is None:
+        return None
+    return pool.worksheet(SHEET_LOG_NAME)
+
+
+def _fetch_values_via_csv():
+    """공유 CSV export로 접수내용 전체 값을 가져온다"""
+    raw = get_http_client().get_text(sheet_csv_url())
+    with span("csv_parse"):
+        return list(csv.reader(io.StringIO(raw)))
+
+
+def fetch_issue_values(ws=None):
+    """(값 목록, 출처) — gspread 우선, 실패 시 CSV export"""
+    from sheets_client import read_values
+
+    errors = []
+    try:
+        ws = ws or open_log_worksheet()
+        if ws is not None:
+            return read_values(ws), "gspread"
+    except Exception as e:
+        errors.append(f"gspread: {e}")
+    try:
+        return _fetch_values_via_csv(), "csv"
+    except Exception as e:
+        errors.append(f"csv: {e}")
+    raise RuntimeError("접수내용 로드 실패: " + " | ".join(errors))
+
+
+def _col_letter(n: int) -> str:
+    letters = ""
+    while n:
+        n, r = divmod(n - 1, 26)
+        letters = chr(65 + r) + letters
+    return letters
+
+
+def _pad(rows, count, width):
+    rows = [(list(r) + [""] * width)[:width] for r in rows]
+    return rows + [[""] * width for _ in range(count - len(rows))]
+
+
+def _tail_hash(rows) -> str:
+    """끝 행들의 고정 열(A~I) 해시 — 중간 삽입/삭제/정렬 감지용"""
+    h = hashlib.sha1()
+    for r in rows:
+        h.update("\x1f".join(r[:SYNC_FIXED_COLS]).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+def sync_issue_values(ws, values):
+    """
+    증분 동기화 — 이미 받은 values(헤더 포함)에 대해
+    끝 행 확인(A~I) + 새로 추가된 행 + 변경 가능한 상태 열(J~끝)만 한 번의 batch_get으로 읽는다.
+    끝 행이 달라졌으면(중간 삽입/삭제) None을 반환하고 호출 측이 전체를 다시 읽는다.
+    """
+    n = len(values)
+    width = len(values[0]) if values else 0
+    if n < 2 or width <= SYNC_FIXED_COLS:
+        return None
+    last = _col_letter(width)
+    k = min(SYNC_TAIL_CHECK_ROWS, n - 1)
+    fixed_last = _col_letter(SYNC_FIXED_COLS)
+    mutable_first = _col_letter(SYNC_FIXED_COLS + 1)
+    from sheets_client import run_on_worksheet
+
+    ranges = [
+        f"A{n - k + 1}:{fixed_last}{n}",
+        f"A{n + 1}:{last}",
+        f"{mutable_first}2:{last}{n}",
+    ]
+    check, tail, status = run_on_worksheet(ws, lambda w: w.batch_get(ranges))
+    if _tail_hash(_pad(check, k, SYNC_FIXED_COLS)) != _tail_hash(_pad(values[n - k:], k, SYNC_FIXED_COLS)):
+        return None
+
+    status = _pad(status, n - 1, width - SYNC_FIXED_COLS)
+    merged = [list(values[0])]
+    merged += [list(row[:SYNC_FIXED_COLS]) + st_row for row, st_row in zip(_pad(values[1:], n - 1, width), status)]
+    merged += _pad(tail, len(tail), width)
+    return merged
+
+
+def issue_ids(df: pd.DataFrame) -> pd.Series:
+    """
+    날짜+작성자+설비명 해시로 만든 행 ID (16진 16자리)
+    같은 키가 여러 번 나오면 뒤에 '-2', '-3' … 을 붙인다 (시트 순서 기준이라 추가 행에도 안정적)
+    """
+    cols = [c for c in ISSUE_KEY_COLUMNS if c in df.columns]
+    if df.empty or not cols:
+        return pd.Series([], dtype=object, index=df.index)
+    key = df[cols[0]].str.strip()
+    for c in cols[1:]:
+        key = key + "|" + df[c].str.strip()
+    hashed = pd.util.hash_array(key.to_numpy(dtype=object))
+    dup = key.groupby(key).cumcount().to_numpy()
+    ids = [f"{h:016x}" if d == 0 else f"{h:016x}-{d + 1}" for h, d in zip(hashed, dup)]
+    return pd.Series(ids, index=df.index, dtype=object)
+
+
+def build_issue_frame(values) -> pd.DataFrame:
+    """
+    시트 원본 값(헤더 포함 2차원 리스트) → 표준 프레임
+    - 원본 컬럼은 문자열 그대로 유지
+    - _row: 시트 행 번호(헤더 = 1행), _id: 안정적인 행 ID(issue_ids),
+      _parsed_date: 파싱된 날짜, _status: 표준 상태, _month: 'YYYY-MM'
+    """
+    if not values or len(values) < 2:
+        return pd.DataFrame()
+
+    header = _clean_header(values[0])
+    width = len(header)
+    body = [(list(r) + [""] * width)[:width] for r in values[1:]]
+    df = pd.DataFrame(body, columns=header)
+    df["_row"] = range(2, len(df) + 2)
+
+    keep = [c for c in header if c and not c.startswith("__dup")]
+    df = df[keep + ["_row"]]
+    df = df[df[keep].astype(bool).any(axis=1)].reset_index(drop=True)
+    df["_id"] = issue_ids(df)
+
+    if "날짜" in df.columns:
+        with span("date_parse"):
+            df["_parsed_date"] = parse_jeju_dates(df["날짜"])
+    else:
+        df["_parsed_date"] = pd.NaT
+    if "접수처리" in df.columns:
+        # 고유값 단위로만 정규화 (행 수와 무관)
+        mapping = {v: normalize_status(v) if v.strip() else "미정의" for v in df["접수처리"].unique()}
+        df["_status"] = df["접수처리"].map(mapping)
+    else:
+        df["_status"] = "미정의"
+    df["_month"] = df["_parsed_date"].dt.strftime("%Y-%m")
+    return df
+
+
+@dataclass(frozen=True)
+class IssueLogSnapshot:
+    """접수내용 스냅샷 — df는 여러 세션이 공유하므로 직접 수정 금지"""
+    df: pd.DataFrame
+    version: int
+    fetched_at: float
+    source: str
+    row_index: dict = field(default_factory=dict, repr=False)  # _id → 시트 행 번호
+    _derived: dict = field(default_factory=dict, repr=False, compare=False)
+    _derived_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def frame(self) -> pd.DataFrame:
+        """페이지에서 가공할 수 있는 사본"""
+        return self.df.copy()
+
+    def derive(self, name: str, builder):
+        """
+        이 스냅샷에서 파생된 구조(인덱스/집계)를 한 번만 만들어 공유
+        builder(df)는 스냅샷 버전당 한 번만 호출되고, 결과는 모든 세션이 읽기 전용으로 쓴다
+        """
+        with self._derived_lock:
+            count_cache(f"스냅샷:{name}", hit=name in self._derived)
+            if name not in self._derived:
+                self._derived[name] = builder(self.df)
+            return self._derived[name]
+
+    def row_of(self, issue_id):
+        """행 ID → 현재 시트 행 번호 (없으면 None)"""
+        return self.row_index.get(issue_id)
+
+
+def build_row_index(df: pd.DataFrame, base: dict = None) -> dict:
+    """
+    _id → _row 해시 인덱스
+    base(직전 스냅샷 인덱스)가 있으면 그보다 뒤에 추가된 행만 더한다 (증분 동기화용)
+    """
+    index = dict(base or {})
+    if df.empty or "_id" not in df.columns:
+        return index
+    rows = df["_row"]
+    if index:
+        rows = rows[rows > max(index.values())]
+    index.update(zip(df.loc[rows.index, "_id"], rows.astype(int)))
+    return index
+
+
+OPEN_STATUSES = ["접수중", "점검중"]
+OPEN_ISSUE_COLUMNS = ["날짜", "위치", "설비명", "세부장치", "장애내용", "작성자"]
+
+
+def _build_open_issues_by_position(df: pd.DataFrame) -> dict:
+    """포지션 → 미조치(접수중/점검중, 미종결) 장애 목록 (최신순)"""
+    if df.empty or "포지션" not in df.columns:
+        return {}
+    mask = pd.Series(True, index=df.index)
+    if "접수처리" in df.columns:
+        mask &= df["접수처리"].isin(OPEN_STATUSES)
+    if "종결" in df.columns:
+        mask &= df["종결"] != "종결"
+    open_df = df.loc[mask].copy()
+    open_df["날짜"] = open_df["_parsed_date"]
+    open_df = open_df.sort_values("날짜", ascending=False, kind="stable")
+    cols = [c for c in OPEN_ISSUE_COLUMNS if c in open_df.columns]
+    return {
+        position: group[cols].fillna("").reset_index(drop=True)
+        for position, group in open_df.groupby("포지션", sort=False)
+    }
+
+
+def open_issues_by_position(snapshot: IssueLogSnapshot) -> dict:
+    """스냅샷당 한 번 만든 포지션별 미조치 장애 인덱스"""
+    return snapshot.derive("open_issues_by_position", _build_open_issues_by_position)
+
+
+class IssueLogStore:
+    """
+    프로세스 전역 접수내용 저장소 (stale-while-revalidate)
+    - 첫 로드와 쓰기 직후(invalidate)만 호출한 세션이 기다린다
+    - 그 외에는 마지막 정상 스냅샷을 즉시 돌려주고, 오래됐으면 워커 스레드가 백그라운드에서 갱신
+    - 동시에 들어온 갱신 요청은 진행 중인 fetch 하나로 합쳐진다 (REFRESH_INTERVAL당 최대 1회)
+    - 로드가 실패하면 RETRY_BACKOFF부터 두 배씩(최대 RETRY_BACKOFF_MAX) 다음 시도를 미룬다
+    """
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._version = 0
+        self._dirty_since = None
+        self._delta_ready = False  # 마지막 전체 로드가 gspread였으면 증분 동기화 가능
+        self._values = None
+        self._full_synced_at = 0.0
+        self._wake = threading.Event()
+        self._worker_lock = threading.Lock()
+        self._worker = None
+        self.last_error = None
+        self._failures = 0
+        self._next_attempt_at = 0.0  # 이 시각 전에는 백그라운드/첫 로드 재시도를 하지 않는다
+        # Sheets 로드 실패 시 대신 쓸 프레임 공급자 (로컬 미러 등)
+        self.fallback = None
+
+    def _load_values(self):
+        """가능하면 증분 동기화, 아니면 전체 로드"""
+        try:
+            # 핸들은 매번 공용 풀에서 — 토큰 갱신 실패로 풀이 재생성되면 새 핸들을 받는다
+            ws = open_log_worksheet()
+        except Exception:
+            ws = None
+        if (
+            ws is not None
+            and self._delta_ready
+            and self._values
+            and time.time() - self._full_synced_at < FULL_SYNC_INTERVAL
+        ):
+            try:
+                merged = sync_issue_values(ws, self._values)
+            except Exception:
+                merged = None
+            if merged is not None:
+                return merged, "gspread-delta"
+
+        values, source = fetch_issue_values(ws)
+        self._delta_ready = source == "gspread"
+        self._full_synced_at = time.time()
+        return values, source
+
+    def _is_stale(self) -> bool:
+        return (
+            self._snapshot is None
+            or time.time() - self._snapshot.fetched_at >= self.refresh_interval
+        )
+
+    def _backing_off(self) -> bool:
+        return time.time() < self._next_attempt_at
+
+    def _record_failure(self, error: Exception):
+        self.last_error = error
+        self._failures += 1
+        delay = min(RETRY_BACKOFF * 2 ** (self._failures - 1), RETRY_BACKOFF_MAX)
+        self._next_attempt_at = time.time() + delay
+
+    def _refresh(self, requested_at: float, only_if_stale: bool = False):
+        """requested_at 이후에 시작된 fetch 결과가 이미 있으면 재사용, 없으면 직접 fetch"""
+        with self._lock:
+            snap = self._snapshot
+            if only_if_stale and (not self._is_stale() or self._backing_off()):
+                return snap
+            if snap is not None and snap.fetched_at >= requested_at:
+                if self._dirty_since is not None and self._dirty_since <= snap.fetched_at:
+                    self._dirty_since = None
+                return snap
+            started = time.time()
+            try:
+                with span("fetch"):
+                    values, source = self._load_values()
+            except Exception as e:
+                self._record_failure(e)
+                df = self.fallback() if self.fallback else pd.DataFrame()
+                if df.empty:
+                    raise
+                self._install(df, "mirror", started)
+            else:
+                self.last_error = None
+                self._failures = 0
+                self._next_attempt_at = 0.0
+                if snap is not None and snap.source != "mirror" and values == self._values:
+                    # 내용이 그대로면 버전과 파생 구조(derive)를 유지하고 조회 시각만 갱신
+                    self._snapshot = replace(snap, fetched_at=started, source=source)
+                else:
+                    self._values = values
+                    with span("frame_build"):
+                        df = build_issue_frame(values)
+                    get_metrics().rows_parsed.inc(len(df), source=source)
+                    self._install(df, source, started)
+            if self._dirty_since is not None and self._dirty_since <= started:
+                self._dirty_since = None
+            return self._snapshot
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._worker_loop, name="issue-log-refresher", daemon=True)
+                self._worker.start()
+
+    def _worker_loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self._refresh(time.time(), only_if_stale=True)
+            except Exception:
+                pass  # _refresh가 last_error와 다음 시도 시각을 기록 — 마지막 정상 스냅샷을 계속 제공
+
+    def get(self, force: bool = False) -> IssueLogSnapshot:
+        snap = self._snapshot
+        dirty_since = self._dirty_since
+        count_cache("접수내용 스냅샷", hit=snap is not None and not force and dirty_since is None)
+        if snap is None:
+            if self._backing_off() and self.last_error is not None:
+                raise self.last_error  # 첫 로드 실패 직후 — rerun마다 다시 읽지 않는다
+            return self._refresh(0.0)
+        if force:
+            return self._refresh(time.time())
+        if dirty_since is not None and not self._backing_off():
+            # 쓰기 직후에는 그 쓰기가 반영된 스냅샷을 기다린다
+            return self._refresh(dirty_since)
+        if self._is_stale() and not self._backing_off():
+            self._ensure_worker()
+            self._wake.set()
+        return snap
+
+    def _install(self, df: pd.DataFrame, source: str, fetched_at: float):
+        prev = self._snapshot
+        # 증분 동기화는 기존 행(A~I)을 바꾸지 않으므로 추가된 행만 인덱스에 더한다
+        incremental = source == "gspread-delta" and prev is not None and prev.source.startswith("gspread")
+        base = prev.row_index if incremental else None
+        self._version += 1
+        self._snapshot = IssueLogSnapshot(
+            df=df,
+            version=self._version,
+            fetched_at=fetched_at,
+            source=source,
+            row_index=build_row_index(df, base),
+        )
+
+    def error_message(self):
+        """마지막 로드가 실패했으면 페이지에 보여줄 안내 문구, 아니면 None"""
+        error, snap = self.last_error, self._snapshot
+        if error is None:
+            return None
+        retry_in = max(0, round(self._next_attempt_at - time.time()))
+        if snap is None:
+            shown = "없음"
+        else:
+            shown = f"{datetime.fromtimestamp(snap.fetched_at, ZoneInfo('Asia/Seoul')):%H:%M:%S} 기준 ({snap.source})"
+        return f"접수내용 갱신 실패 — 표시 중인 데이터: {shown}, {retry_in}초 후 재시도 · {error}"
+
+    def invalidate(self):
+        """시트에 쓰기 후 호출 — 다음 조회는 이 시점 이후에 시작된 fetch 결과를 기다린다"""
+        self._dirty_since = time.time()
+
+
+@st.cache_resource
+def get_issue_store() -> IssueLogStore:
+    return IssueLogStore()
+
+
+def get_issue_snapshot(force: bool = False) -> IssueLogSnapshot:
+    from issue_mirror import get_issue_mirror
+
+    get_issue_mirror()  # 설정된 경우 미러 동기화 + Sheets 장애 시 대체 데이터
+    return get_issue_store().get(force=force)
+
+
+def show_refresh_error():
+    """마지막 갱신이 실패했으면 페이지 상단에 경고 (표시 중인 스냅샷 시각과 다음 재시도)"""
+    message = get_issue_store().error_message()
+    if message:
+        st.warning(f"⚠️ {message}")
+
+
+def invalidate_issue_log():
+    get_issue_store().invalidate()
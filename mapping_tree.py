@@ -0,0 +1,157 @@
+"""
+981Park 설비매핑 조회 트리
+- 설비매핑 시트 값을 포지션 → 위치 → 설비명 → 세부기기 중첩 dict로 한 번만 변환
+- 장애유형 목록도 미리 만들어 두어 폼의 드롭다운 변경은 dict 조회만 한다
+- 설비명/세부기기 전체에 대한 n-gram 검색 인덱스로 포지션/위치를 몰라도 바로 찾는다
+"""
+import hashlib
+from dataclasses import dataclass, field
+from typing import NamedTuple, Optional
+
+DETAIL_COLUMNS = slice(3, 33)  # D~AG: 세부기기
+ISSUE_TYPE_COLUMNS = slice(33, 39)  # AH~AM: 장애유형
+
+
+def mapping_version(values) -> str:
+    """시트 값 내용 해시 — 같은 내용이면 트리를 다시 만들지 않는다"""
+    h = hashlib.sha1()
+    for row in values:
+        h.update("\x1f".join(row).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()
+
+
+class SearchEntry(NamedTuple):
+    position: str
+    location: str
+    equipment: str
+    detail: Optional[str]  # 설비명 자체 항목이면 None
+
+    @property
+    def label(self) -> str:
+        name = f"{self.equipment} · {self.detail}" if self.detail else self.equipment
+        return f"{name} — {self.position} / {self.location}"
+
+
+def _norm(text: str) -> str:
+    return "".join(str(text).lower().split())
+
+
+class EquipmentSearchIndex:
+    """
+    설비명/세부기기 부분 문자열 검색
+    - 항목은 (설비명 항목 우선, 짧은 이름 우선) 순으로 번호를 매겨 게시 목록을 그 순서로 보관
+    - 앞부분 일치는 첫 두 글자 인덱스에서, 나머지는 가장 짧은 글자/바이그램 게시 목록에서
+      순서대로 훑다가 limit개가 차면 멈춘다 (정렬 없음)
+    """
+
+    def __init__(self, entries):
+        entries = list(entries)
+        keys = [_norm(e.detail or e.equipment) for e in entries]
+        order = sorted(range(len(entries)), key=lambda i: (entries[i].detail is not None, len(keys[i]), i))
+        self.entries = [entries[i] for i in order]
+        self._keys = [keys[i] for i in order]
+        self._prefix = {}
+        self._grams = {}
+        for i, key in enumerate(self._keys):
+            for n in (1, 2):
+                if len(key) >= n:
+                    self._prefix.setdefault(key[:n], []).append(i)
+            for gram in dict.fromkeys([*key, *(key[j:j + 2] for j in range(len(key) - 1))]):
+                self._grams.setdefault(gram, []).append(i)
+
+    def search(self, query: str, limit: int = 20):
+        q = _norm(query)
+        if not q:
+            return []
+        keys = self._keys
+        hits = []
+        for i in self._prefix.get(q[:2], ()):
+            if keys[i].startswith(q):
+                hits.append(i)
+                if len(hits) >= limit:
+                    return [self.entries[i] for i in hits]
+
+        grams = [q] if len(q) == 1 else [q[j:j + 2] for j in range(len(q) - 1)]
+        postings = min((self._grams.get(g, ()) for g in grams), key=len)
+        for i in postings:
+            key = keys[i]
+            if q in key and not key.startswith(q):
+                hits.append(i)
+                if len(hits) >= limit:
+                    break
+        return [self.entries[i] for i in hits]
+
+
+@dataclass(frozen=True)
+class MappingTree:
+    """포지션/위치/설비명 키는 정렬된 순서로 들어 있다"""
+    version: str
+    tree: dict = field(repr=False)  # {포지션: {위치: {설비명: [세부기기, ...]}}}
+    issue_types: list = field(repr=False)
+    search: EquipmentSearchIndex = field(repr=False)
+
+    @property
+    def positions(self):
+        return list(self.tree)
+
+    def locations(self, position):
+        return list(self.tree.get(position, {}))
+
+    def equipments(self, position, location):
+        return list(self.tree.get(position, {}).get(location, {}))
+
+    def details(self, position, location, equipment):
+        return list(self.tree.get(position, {}).get(location, {}).get(equipment, []))
+
+
+def _clean(v) -> str:
+    return str(v).strip() if v is not None else ""
+
+
+def build_mapping_tree(values, version: str = None) -> MappingTree:
+    """설비매핑 시트 값(헤더 포함 2차원 리스트) → MappingTree"""
+    version = version or mapping_version(values)
+    if not values or len(values) < 2:
+        return MappingTree(version=version, tree={}, issue_types=[], search=EquipmentSearchIndex([]))
+
+    header = [_clean(c) for c in values[0]]
+    try:
+        i_pos, i_loc, i_eq = header.index("포지션"), header.index("위치"), header.index("설비명")
+    except ValueError:
+        i_pos, i_loc, i_eq = 0, 1, 2
+
+    raw = {}
+    issue_types = set()
+    for row in values[1:]:
+        position, location, equipment = (_clean(row[i]) if i < len(row) else "" for i in (i_pos, i_loc, i_eq))
+        issue_types.update(v for v in map(_clean, row[ISSUE_TYPE_COLUMNS]) if v)
+        if not position:
+            continue
+        locations = raw.setdefault(position, {})
+        if not location:
+            continue
+        equipments = locations.setdefault(location, {})
+        if equipment and equipment not in equipments:
+            # 같은 설비가 여러 행이면 첫 행의 세부기기를 쓴다
+            equipments[equipment] = [d for d in map(_clean, row[DETAIL_COLUMNS]) if d]
+
+    tree = {
+        position: {
+            location: {equipment: raw[position][location][equipment] for equipment in sorted(raw[position][location])}
+            for location in sorted(raw[position])
+        }
+        for position in sorted(raw)
+    }
+    entries = []
+    for position, locations in tree.items():
+        for location, equipments in locations.items():
+            for equipment, details in equipments.items():
+                entries.append(SearchEntry(position, location, equipment, None))
+                entries.extend(SearchEntry(position, location, equipment, d) for d in dict.fromkeys(details))
+    return MappingTree(
+        version=version,
+        tree=tree,
+        issue_types=sorted(issue_types),
+        search=EquipmentSearchIndex(entries),
+    )
@@ -1,6 +1,8 @@
 import streamlit as st
 from streamlit_js_eval import streamlit_js_eval
 
+from perf_trace import timed
+
 AUTHORIZED_USERS = {
     "gyoseon.hwang@monolith.co.kr": "황교선",
     "hyunjong.cho@monolith.co.kr": "조현종",
@@ -9,6 +11,7 @@ AUTHORIZED_USERS = {
 AUTHORIZED_EMAILS = list(AUTHORIZED_USERS.keys())
 ALLOWED_DOMAIN = "@monolith.co.kr"
 
+@timed("auth")
 def get_current_user():
     """
     사용자 이메일을 localStorage / session_state에서 불러와 인증 처리.
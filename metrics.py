@@ -0,0 +1,234 @@
+"""
+981Park Prometheus 지표 (text exposition format 0.0.4)
+- 카운터/히스토그램은 프로세스 공용 레지스트리에 쌓고, 캐시 적중/활성 세션은 노출할 때 perf_trace에서 읽는다
+- METRICS_PATH(환경변수 또는 secrets)가 있으면 METRICS_INTERVAL초마다 그 파일을 통째로 바꿔 쓴다
+  (node_exporter textfile collector 호환 — 스크레이퍼 없이 파일만 보고 확인 가능)
+- METRICS_PORT가 있으면 http://0.0.0.0:<port>/metrics 로도 제공
+- Sheets 요청은 워크시트/읽기·쓰기/HTTP 상태별로 센다 — rate()로 분당 쿼터(읽기/쓰기 60회) 대비 사용량 경보
+"""
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import setting
+
+PREFIX = "park_"
+METRICS_INTERVAL = 15  # 초 — 파일 싱크 기록 주기
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in list(zip(names, values)) + list(extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class CounterFamily:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, (), value) for key, value in sorted(self._values.items())]
+
+
+class HistogramFamily:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help_text, tuple(labelnames)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._values = {}  # labels → [버킷별 개수..., 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            state = self._values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        out = []
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        for key, state in items:
+            for bound, count in zip(self.buckets, state):
+                out.append((f"{self.name}_bucket", key, (("le", _number(bound)),), count))
+            out.append((f"{self.name}_sum", key, (), state[-2]))
+            out.append((f"{self.name}_count", key, (), state[-1]))
+        return out
+
+
+class GaugeFamily:
+    """노출할 때 값을 계산하는 게이지/카운터 (collect()가 {labels tuple: 값} 반환)"""
+
+    def __init__(self, name: str, help_text: str, labelnames, collect, kind: str = "gauge"):
+        self.name, self.help, self.labelnames, self.kind = name, help_text, tuple(labelnames), kind
+        self._collect = collect
+
+    def samples(self):
+        return [(self.name, key, (), value) for key, value in sorted(self._collect().items())]
+
+
+def _cache_values(column: str):
+    from perf_trace import get_perf_recorder
+
+    df = get_perf_recorder().cache_summary()
+    return {(name,): value for name, value in zip(df["로더"], df[column])}
+
+
+def _session_values():
+    from perf_trace import get_perf_recorder
+
+    return {(page,): n for page, n in get_perf_recorder().active_sessions().items()}
+
+
+class Metrics:
+    """대시보드 프로세스 지표 모음"""
+
+    def __init__(self):
+        p = PREFIX
+        self.sheets_requests = CounterFamily(
+            f"{p}sheets_requests_total", "Sheets API 요청 수 (워크시트, read/write, HTTP 상태)",
+            ["worksheet", "op", "status"],
+        )
+        self.http_duration = HistogramFamily(
+            f"{p}http_request_duration_seconds", "외부 HTTP 요청 소요 시간 (재시도 대기 포함)", ["endpoint"],
+        )
+        self.http_requests = CounterFamily(
+            f"{p}http_requests_total", "외부 HTTP 요청 수 (엔드포인트, HTTP 상태 — 연결 실패는 0)", ["endpoint", "status"],
+        )
+        self.rows_parsed = CounterFamily(f"{p}rows_parsed_total", "접수내용 프레임으로 파싱한 행 수", ["source"])
+        self.webhook_deliveries = CounterFamily(
+            f"{p}webhook_deliveries_total", "Chat 웹훅 전송 시도 결과 (sent / retry / failed)", ["result"],
+        )
+        self.families = [
+            self.sheets_requests,
+            self.http_requests,
+            self.http_duration,
+            self.rows_parsed,
+            self.webhook_deliveries,
+            GaugeFamily(f"{p}cache_hits_total", "캐시 로더별 적중 수", ["loader"],
+                        lambda: _cache_values("적중"), kind="counter"),
+            GaugeFamily(f"{p}cache_misses_total", "캐시 로더별 미스 수", ["loader"],
+                        lambda: _cache_values("미스"), kind="counter"),
+            GaugeFamily(f"{p}active_sessions", "최근 활동한 세션 수 (마지막으로 연 페이지별)", ["page"], _session_values),
+        ]
+        self._sinks = []
+
+    def render(self) -> str:
+        lines = []
+        for family in self.families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for name, key, extra, value in family.samples():
+                lines.append(f"{name}{_labels(family.labelnames, key, extra)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """임시 파일에 쓰고 rename — 읽는 쪽이 반쯤 쓴 파일을 보지 않는다"""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def start_file_sink(self, path: str, interval: float = METRICS_INTERVAL):
+        def loop():
+            while True:
+                try:
+                    self.write(path)
+                except OSError:
+                    pass  # 디렉터리 없음 등 — 다음 주기에 다시 시도
+                time.sleep(interval)
+
+        thread = threading.Thread(target=loop, name="metrics-file", daemon=True)
+        thread.start()
+        self._sinks.append(thread)
+
+    def start_http_sink(self, port: int, host: str = "0.0.0.0"):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+        thread.start()
+        self._sinks.append(server)
+        return server
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """프로세스 공용 지표 (METRICS_PATH / METRICS_PORT가 있으면 처음 만들 때 싱크 시작)"""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                metrics = Metrics()
+                path = setting("METRICS_PATH")
+                if path:
+                    metrics.start_file_sink(path)
+                port = setting("METRICS_PORT")
+                if port:
+                    try:
+                        metrics.start_http_sink(int(port))
+                    except OSError:
+                        pass  # 포트 사용 중 — 다른 프로세스가 이미 제공
+                _metrics = metrics
+    return _metrics
+
+
+def http_endpoint(host: str, path: str) -> str:
+    """HTTP 지연 라벨 — CSV export / Chat 웹훅 / 그 외 호스트"""
+    if path.endswith("/export"):
+        return "csv_export"
+    if host == "chat.googleapis.com" or path.endswith("/messages"):
+        return "chat_webhook"
+    return host
+
+
+def observe_http(endpoint: str, seconds: float, status: int):
+    metrics = get_metrics()
+    metrics.http_duration.observe(seconds, endpoint=endpoint)
+    metrics.http_requests.inc(endpoint=endpoint, status=status)
@@ -1,12 +1,14 @@
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
-import requests
-import time
 from datetime import datetime, timezone, timedelta
 from menu_ui import render_sidebar, get_current_user, is_monolith_user, AUTHORIZED_USERS
+from issue_store import get_issue_snapshot, invalidate_issue_log, open_issues_by_position, show_refresh_error
+from chat_outbox import get_chat_outbox
+from mapping_tree import MappingTree, build_mapping_tree, mapping_version
+from sheets_client import append_row, get_sheets_pool, get_worksheet, read_values
+from perf_trace import cached, set_page
 
+set_page("IssueForm")
 st.markdown("""
     <style>
     [data-testid="stSidebarNav"] {display: none !important;}
@@ -24,7 +26,7 @@ if not is_monolith_user(email):
 render_sidebar(active="IssueForm")
 
 def send_google_chat_alert(form_data: dict):
-    """Google Chat Webhook 알림 (981Park 장애 접수용)"""
+    """Google Chat Webhook 알림 (981Park 장애 접수용) — 아웃박스에 넣고 바로 반환, 전송은 백그라운드 워커"""
 
     WEBHOOK_URL = (
         "https://chat.googleapis.com/v1/spaces/AAAA-Dl8vDs/messages"
@@ -113,118 +115,95 @@ def send_google_chat_alert(form_data: dict):
         )
     }
 
-    try:
-        resp = requests.post(WEBHOOK_URL, json=card_message, timeout=10)
-        if resp.status_code != 200:
-            resp_fallback = requests.post(WEBHOOK_URL, json=text_message, timeout=10)
-            st.write("📩 fallback 응답:", resp_fallback.text)
-            if resp_fallback.status_code == 200:
-                st.toast("✅ Google Chat 알림 (텍스트) 전송 완료", icon="💬")
-            else:
-                st.error(f"❌ Google Chat 알림 실패: {resp_fallback.text}")
-        else:
-            st.toast("✅ Google Chat 알림 (카드) 전송 완료", icon="💬")
-    except Exception as e:
-        st.error(f"❌ Webhook 전송 중 오류: {e}")
+    get_chat_outbox().enqueue(
+        WEBHOOK_URL,
+        card_message,
+        text_message,
+        urgent=is_urgent,
+        label=f"{form_data.get('포지션', '-')} / {form_data.get('설비명', '-')}",
+    )
 
 st.set_page_config(page_title="🧾 981Park 장애 접수", layout="wide", initial_sidebar_state="expanded")
 
-try:
-    creds_info = st.secrets["google_service_account"]
-except Exception as e:
+if get_sheets_pool() is None:
     st.error("🔐 `st.secrets['google_service_account']`가 없습니다. `.streamlit/secrets.toml`에 서비스계정 JSON을 넣어주세요.")
     st.stop()
 
-creds = Credentials.from_service_account_info(
-    creds_info,
-    scopes=["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"],
-)
-gc = gspread.authorize(creds)
-
-SPREADSHEET_NAME = "981파크 장애관리"
 SHEET_MAPPING = "설비매핑"
 SHEET_LOG = "접수내용"
 
-@st.cache_data(ttl=300)
-def load_mapping_sheet():
-    ws = gc.open(SPREADSHEET_NAME).worksheet(SHEET_MAPPING)
-    data = ws.get_all_values()
-    if not data or len(data) < 2:
-        return pd.DataFrame()
-    return pd.DataFrame(data[1:], columns=data[0])
+@cached("설비매핑 트리", st.cache_resource(max_entries=2))
+def get_mapping_tree(version: str, _values) -> MappingTree:
+    """설비매핑 내용(version)이 바뀔 때만 트리를 다시 만든다"""
+    return build_mapping_tree(_values, version)
+
+@cached("설비매핑 시트", st.cache_resource(ttl=300))
+def load_mapping_sheet() -> MappingTree:
+    values = read_values(get_worksheet(SHEET_MAPPING))
+    return get_mapping_tree(mapping_version(values), values)
 
-@st.cache_data(ttl=30)
 def get_recent_issues_by_position(position_name: str) -> pd.DataFrame:
-    ws = gc.open(SPREADSHEET_NAME).worksheet(SHEET_LOG)
-    data = ws.get_all_values()
-    if not data or len(data) < 2:
-        return pd.DataFrame()
-    df = pd.DataFrame(data[1:], columns=data[0])
-    if "포지션" not in df.columns:
+    """포지션별 미조치 장애 인덱스(스냅샷당 한 번 생성)에서 최근 10건"""
+    open_issues = open_issues_by_position(get_issue_snapshot()).get(position_name)
+    if open_issues is None:
         return pd.DataFrame()
-    df = df[df["포지션"] == position_name].copy()
-    if "접수처리" in df.columns:
-        df = df[df["접수처리"].isin(["접수중", "점검중"])]
-    if "종결" in df.columns:
-        df = df[df["종결"] != "종결"]
-    if "날짜" in df.columns:
-        df["날짜"] = pd.to_datetime(df["날짜"], errors="coerce")
-        df = df.sort_values("날짜", ascending=False).head(10)
-    return df[["날짜", "위치", "설비명", "세부장치", "장애내용", "작성자"]].fillna("")
+    return open_issues.head(10)
 
 st.title("🧾 981Park 장애 접수")
+show_refresh_error()
 
-df_map = load_mapping_sheet()
+mapping = load_mapping_sheet()
 col_form, col_recent = st.columns([1.3, 0.9], gap="large")
 
 with col_form:
     st.subheader("📋 장애 접수 등록")
 
+    if st.session_state.pop("issue_submitted", False):
+        st.success("✅ 장애 접수가 정상적으로 등록되었습니다. 해당 포지션의 현황은 오른쪽 [📌 미조치 장애 현황]에서 확인 가능합니다.")
+
     for key in ["position", "location", "equipment", "detail", "issue", "reporter", "desc", "urgent"]:
         if key not in st.session_state:
             st.session_state[key] = "" if key != "urgent" else False
 
-    positions = sorted(df_map["포지션"].dropna().unique()) if not df_map.empty else []
-    st.session_state.position = st.selectbox("📍 포지션", [""] + positions, index=0)
+    # 🔎 설비명/세부기기 검색 → 선택하면 아래 단계 선택을 한 번에 채운다
+    prefill = None
+    query = st.text_input("🔎 설비 검색", key="equipment_query", placeholder="설비명 또는 세부기기 일부를 입력하세요")
+    if query.strip():
+        matches = mapping.search.search(query)
+        if matches:
+            picked = st.selectbox(
+                "검색 결과",
+                range(len(matches) + 1),
+                format_func=lambda i: matches[i - 1].label if i else "— 선택 —",
+                key="equipment_match",
+            )
+            prefill = matches[picked - 1] if picked else None
+        else:
+            st.caption("검색 결과가 없습니다.")
 
-    if st.session_state.position:
-        locations = sorted(
-            df_map[df_map["포지션"] == st.session_state.position]["위치"].dropna().unique()
-        )
-    else:
-        locations = []
-    st.session_state.location = st.selectbox("🏗️ 위치", [""] + locations, index=0)
+    def prefill_index(options, attr):
+        value = getattr(prefill, attr) if prefill is not None else None
+        return options.index(value) + 1 if value in options else 0
+
+    positions = mapping.positions
+    st.session_state.position = st.selectbox("📍 포지션", [""] + positions, index=prefill_index(positions, "position"))
+
+    locations = mapping.locations(st.session_state.position) if st.session_state.position else []
+    st.session_state.location = st.selectbox("🏗️ 위치", [""] + locations, index=prefill_index(locations, "location"))
 
     if st.session_state.position and st.session_state.location:
-        equipments = sorted(
-            df_map[
-                (df_map["포지션"] == st.session_state.position)
-                & (df_map["위치"] == st.session_state.location)
-            ]["설비명"].dropna().unique()
-        )
+        equipments = mapping.equipments(st.session_state.position, st.session_state.location)
     else:
         equipments = []
-    st.session_state.equipment = st.selectbox("⚙️ 설비명", [""] + equipments, index=0)
+    st.session_state.equipment = st.selectbox("⚙️ 설비명", [""] + equipments, index=prefill_index(equipments, "equipment"))
 
     if st.session_state.equipment:
-        row = df_map[
-            (df_map.get("포지션") == st.session_state.position)
-            & (df_map.get("위치") == st.session_state.location)
-            & (df_map.get("설비명") == st.session_state.equipment)
-        ]
-        if not row.empty:
-            details = [d for d in row.iloc[0, 3:33].tolist() if d and str(d).strip() != ""]
-        else:
-            details = []
+        details = mapping.details(st.session_state.position, st.session_state.location, st.session_state.equipment)
     else:
         details = []
-    st.session_state.detail = st.selectbox("🔩 세부기기", [""] + details, index=0)
+    st.session_state.detail = st.selectbox("🔩 세부기기", [""] + details, index=prefill_index(details, "detail"))
 
-    try:
-        vals = df_map.iloc[:, 33:39].values.flatten().tolist()
-        issue_types = sorted({v for v in vals if v and str(v).strip() != ""})
-    except Exception:
-        issue_types = []
+    issue_types = mapping.issue_types
     st.session_state.issue = st.selectbox("🚨 장애유형", [""] + issue_types, index=0)
 
     st.session_state.reporter = st.text_input("👤 작성자 이름", st.session_state.reporter or "")
@@ -236,8 +215,7 @@ with col_form:
             st.warning("⚠️ 필수 항목(포지션, 위치, 설비명, 작성자, 내용)을 모두 입력해주세요.")
         else:
             try:
-                sh = gc.open(SPREADSHEET_NAME)
-                log_sheet = sh.worksheet(SHEET_LOG)
+                log_sheet = get_worksheet(SHEET_LOG)
                 now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 new_row = [
                     "긴급" if st.session_state.urgent else "일반",
@@ -251,7 +229,8 @@ with col_form:
                     st.session_state.desc,
                     "접수중", "", "", "", "", "",
                 ]
-                log_sheet.append_row(new_row, value_input_option="USER_ENTERED")
+                append_row(log_sheet, new_row)
+                invalidate_issue_log()
 
                 payload = {
                     "작성자": st.session_state.reporter,
@@ -263,32 +242,12 @@ with col_form:
                     "장애내용": st.session_state.desc,
                     "긴급": st.session_state.urgent,
                 }
-                st.toast("🚀 Google Chat 알림 전송 중...", icon="💬")
                 send_google_chat_alert(payload)
-
-                popup = st.empty()
-                with popup.container():
-                    st.markdown(
-                        """
-                        <div style="
-                            position: fixed; top: 50%; left: 50%;
-                            transform: translate(-50%, -50%);
-                            background: white; padding: 40px;
-                            border-radius: 12px;
-                            box-shadow: 0 4px 25px rgba(0,0,0,0.2);
-                            text-align: center; z-index: 9999; width: 400px;">
-                            <h3>✅ 장애 접수 완료</h3>
-                            <p>장애 접수가 정상적으로 등록되었습니다.</p>
-                            <p><b>해당 포지션의 현황은 오른쪽 [📌 미조치 장애 현황]</b><br>에서 확인 가능합니다.</p>
-                        </div>
-                        """,
-                        unsafe_allow_html=True,
-                    )
-                time.sleep(2.0)
-                popup.empty()
-                st.rerun()
+                st.session_state["issue_submitted"] = True
             except Exception as e:
                 st.error(f"❌ 전송 중 오류 발생: {e}")
+            if st.session_state.get("issue_submitted"):
+                st.rerun()
 
 with col_recent:
     st.subheader("📌 미조치 / 점검중 장애 현황")
@@ -318,4 +277,24 @@ with col_recent:
     else:
         st.info("🔎 포지션을 선택하면 해당 포지션의 최근 장애 현황이 표시됩니다.")
 
+    with st.expander("📩 Google Chat 알림 전송 상태"):
+        outbox = get_chat_outbox().recent(10)
+        if outbox.empty:
+            st.caption("최근 전송한 알림이 없습니다.")
+        else:
+            status_label = {"pending": "⏳ 대기", "sending": "📤 전송중", "sent": "✅ 완료", "failed": "❌ 실패"}
+            st.dataframe(
+                pd.DataFrame({
+                    "접수시각": outbox["created_at"].dt.strftime("%m.%d %H:%M"),
+                    "구분": outbox["priority"].map({0: "긴급", 1: "일반"}),
+                    "대상": outbox["label"],
+                    "상태": outbox["status"].map(status_label),
+                    "형식": outbox["sent_as"].fillna("—"),
+                    "시도": outbox["attempts"],
+                    "오류": outbox["last_error"].fillna(""),
+                }),
+                hide_index=True,
+                use_container_width=True,
+            )
+
 st.caption("© 2025 981Park Technical Support Team — Streamlit 장애 접수 및 실시간 현황")
@@ -1,11 +1,13 @@
 import streamlit as st
-import gspread
-import pandas as pd
-from google.oauth2.service_account import Credentials
 from datetime import datetime
 from menu_ui import render_sidebar, get_current_user, AUTHORIZED_USERS
+from issue_store import get_issue_snapshot, invalidate_issue_log, show_refresh_error
+from sheets_client import append_row, append_rows, get_worksheet, write_cells
+from table_pager import paginate
+from perf_trace import set_page, span
 
 # 페이지 설정
+set_page("IssueManage")
 st.set_page_config(page_title="🧰 장애 처리", layout="wide")
 
 # 공통 스타일 (타이틀 상단 여백 제거 + 전체 테마 포함)
@@ -120,31 +122,25 @@ if not email or email.strip().lower() not in [e.lower() for e in AUTHORIZED_USER
 
 render_sidebar(active="IssueManage")
 
-@st.cache_resource
-def get_gspread_client():
-    creds_info = st.secrets["google_service_account"]
-    creds = Credentials.from_service_account_info(
-        creds_info,
-        scopes=[
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-    )
-    return gspread.authorize(creds)
-
-gc = get_gspread_client()
-
-SPREADSHEET_NAME = "981파크 장애관리"
 SHEET_LOG = "접수내용"
+STATE_TRANSITIONS = {
+    "접수중": ["점검중", "운영중", "운영중단"],
+    "점검중": ["운영중", "운영중단", "완료"],
+    "운영중": ["점검중", "완료"],
+    "운영중단": ["점검중", "완료"],
+    "완료": []
+}
+POSITION_OPTIONS = ["선택 안 함", "Audio/Video", "RACE", "LAB", "운영설비", "충전설비", "정비고", "기타"]
+POSITION_SHEET_HEADERS = [
+    "위치", "설비명", "세부장치", "장애유형", "장애내용",
+    "접수처리", "장애등록", "점검자", "완료일자"
+]
 
-@st.cache_data(ttl=30)
 def load_issue_log():
-    ws = gc.open(SPREADSHEET_NAME).worksheet(SHEET_LOG)
-    data = ws.get_all_values()
-    if not data or len(data) < 2:
-        return pd.DataFrame()
+    df = get_issue_snapshot().frame()
+    if df.empty:
+        return df
 
-    df = pd.DataFrame(data[1:], columns=data[0])
     if "날짜" in df.columns:
         df["날짜"] = df["날짜"].replace("", "—")
     if "상태" not in df.columns and "접수처리" in df.columns:
@@ -159,50 +155,57 @@ def load_issue_log():
     })
     return df
 
+def position_sheet_row(payload):
+    """포지션 시트에 추가할 한 행 (실제 시트 순서)"""
+    return [
+        payload.get("위치", ""),
+        payload.get("설비명", ""),
+        payload.get("세부장치", ""),
+        payload.get("장애유형", ""),
+        payload.get("장애내용", ""),
+        "점검중",                      # 접수처리
+        payload.get("포지션", ""),      # 장애등록
+        payload.get("점검자", ""),      # 점검자
+        "",                            # 완료일자 (미기입)
+    ]
+
 def move_issue_to_position(payload):
     """981파크 장애관리 - 접수내용 -> 포지션 시트 이동"""
     try:
-        sh = gc.open(SPREADSHEET_NAME)
         position = payload.get("포지션", "").strip()
         if not position:
             st.warning("⚠️ 포지션 정보가 없어 포지션 시트로 이동하지 못했습니다.")
             return
 
-        # 포지션 시트 없으면 생성
-        try:
-            target_ws = sh.worksheet(position)
-        except Exception:
-            target_ws = sh.add_worksheet(title=position, rows="500", cols="20")
-            headers = [
-                "위치", "설비명", "세부장치", "장애유형", "장애내용",
-                "접수처리", "장애등록", "점검자", "완료일자"
-            ]
-            target_ws.append_row(headers)
-
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # ✅ 실제 시트 순서에 맞게 정렬
-        new_row = [
-            payload.get("위치", ""),
-            payload.get("설비명", ""),
-            payload.get("세부장치", ""),
-            payload.get("장애유형", ""),
-            payload.get("장애내용", ""),
-            "점검중",                      # 접수처리
-            payload.get("포지션", ""),      # 장애등록
-            payload.get("점검자", ""),      # 점검자
-            "",                            # 완료일자 (미기입)
-        ]
-
-        target_ws.append_row(new_row, value_input_option="USER_ENTERED")
+        # 포지션 시트 없으면 생성 (핸들은 공용 풀에 캐시)
+        target_ws = get_worksheet(position, create_headers=POSITION_SHEET_HEADERS)
+        append_row(target_ws, position_sheet_row(payload))
         st.toast(f"📤 '{position}' 시트로 정확히 이동 완료", icon="✅")
 
     except Exception as e:
         st.error(f"❌ 포지션 시트 이동 중 오류 발생: {e}")
 
+# 접수내용 열 번호 (1부터)
+COL_STATUS, COL_INSPECTOR, COL_DONE_AT, COL_NOTE, COL_CLOSED = 10, 12, 13, 14, 17
+
+
+def status_update_cells(row_index, 상태선택, 담당자, 점검내용, now=None):
+    """한 장애의 상태 변경 → {(행, 열): 값} (J/L/N 열, 완료 시 M/Q 열 기록, 아니면 초기화)"""
+    now = now or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    done = 상태선택 == "완료"
+    return {
+        (row_index, COL_STATUS): 상태선택,
+        (row_index, COL_INSPECTOR): 담당자,
+        (row_index, COL_NOTE): 점검내용,
+        (row_index, COL_DONE_AT): now if done else "",
+        (row_index, COL_CLOSED): "종결" if done else "",
+    }
+
+
 def update_issue_status(ws, row_index, 상태선택, 담당자, 점검내용):
     """
     장애 상태를 업데이트하고, 완료 시 Q열(종결 컬럼)에 '종결'을 기록한다.
+    모든 셀 변경은 한 번의 batch_update로 보낸다.
     ws : gspread Worksheet 객체
     row_index : 수정할 행 번호 (2부터 시작)
     상태선택 : 새 상태 (점검중, 운영중, 운영중단, 완료)
@@ -210,35 +213,19 @@ def update_issue_status(ws, row_index, 상태선택, 담당자, 점검내용):
     점검내용 : 점검 상세 내용
     """
     try:
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # ✅ 상태 업데이트 (접수처리)
-        ws.update_cell(row_index, 10, 상태선택)
-
-        # ✅ 점검자 / 점검내용 / 완료일자 갱신
-        ws.update_cell(row_index, 12, 담당자)
-        ws.update_cell(row_index, 14, 점검내용)
-
-        if 상태선택 == "완료":
-            # ✅ 완료일자 입력 (M열, 13번째)
-            ws.update_cell(row_index, 13, now)
-
-            # ✅ Q열(17번째 컬럼)에 '종결' 입력
-            ws.update_cell(row_index, 17, "종결")
-
-        else:
-            # 완료 아닐 경우, 완료일자 및 종결 표시 초기화
-            ws.update_cell(row_index, 13, "")
-            ws.update_cell(row_index, 17, "")
-
+        write_cells(ws, status_update_cells(row_index, 상태선택, 담당자, 점검내용))
         st.toast("✅ 장애 상태 업데이트 완료 (시트 반영됨)", icon="✅")
-
+        return True
     except Exception as e:
         st.error(f"❌ 시트 업데이트 중 오류 발생: {e}")
+        return False
 
 
+# 상세/일괄 패널은 st.fragment — 입력을 바꿔도 목록(데이터 편집기)은 다시 그리지 않는다
+# 저장 후 st.rerun()은 전체를 다시 실행해 목록을 갱신한다
+@st.fragment
 def render_detail_panel(issue, df):
-    ws = gc.open(SPREADSHEET_NAME).worksheet(SHEET_LOG)
+    ws = get_worksheet(SHEET_LOG)
 
     st.markdown("### 🧩 장애 처리")
     st.markdown(f"""
@@ -251,30 +238,23 @@ def render_detail_panel(issue, df):
     current_status = issue.get("상태", "접수중")
     st.info(f"현재 상태: **{current_status}**")
 
-    state_map = {
-        "접수중": ["점검중", "운영중", "운영중단"],
-        "점검중": ["운영중", "운영중단", "완료"],
-        "운영중": ["점검중", "완료"],
-        "운영중단": ["점검중", "완료"],
-        "완료": []
-    }
-
-    options = state_map.get(current_status, [])
+    options = STATE_TRANSITIONS.get(current_status, [])
     if not options:
         st.success("✅ 완료된 장애입니다. 추가 변경 불가.")
         return
 
     상태선택 = st.selectbox("📊 상태 변경", options)
-    포지션_이동 = st.selectbox(
-        "📍 포지션 시트로 이동",
-        ["선택 안 함", "Audio/Video", "RACE", "LAB", "운영설비", "충전설비", "정비고", "기타"]
-    )
+    포지션_이동 = st.selectbox("📍 포지션 시트로 이동", POSITION_OPTIONS)
     담당자 = st.text_input("👷 점검자", issue.get("점검자", ""))
     점검내용 = st.text_area("🧾 점검내용", height=150, placeholder="조치 내용 또는 점검 결과를 입력하세요.")
 
     if st.button("💾 저장", use_container_width=True):
-        row_index = df.index[df["장애내용"] == issue["장애내용"]][0] + 2
-        update_issue_status(ws, row_index, 상태선택, 담당자, 점검내용)
+        row_index = get_issue_snapshot().row_of(issue["_id"])
+        if row_index is None:
+            st.error("❌ 시트에서 해당 장애 행을 찾지 못했습니다. 새로고침 후 다시 시도하세요.")
+            return
+        if not update_issue_status(ws, row_index, 상태선택, 담당자, 점검내용):
+            return
 
         if 포지션_이동 != "선택 안 함":
             payload = issue.to_dict()
@@ -286,25 +266,94 @@ def render_detail_panel(issue, df):
             })
             move_issue_to_position(payload)
 
+        invalidate_issue_log()
         st.rerun()
 
+def bulk_process_issues(issues, 상태선택, 담당자, 점검내용, 포지션_이동):
+    """
+    선택된 여러 장애를 같은 상태/점검자로 일괄 처리
+    - 접수내용: 모든 행의 셀 변경을 한 번의 batch_update로
+    - 포지션 시트: 대상 시트별 append_rows 한 번
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    snapshot = get_issue_snapshot()
+    rows = [snapshot.row_of(issue_id) for issue_id in issues["_id"]]
+    if any(r is None for r in rows):
+        st.error("❌ 시트에서 일부 장애 행을 찾지 못했습니다. 새로고침 후 다시 시도하세요.")
+        return False
+    cells = {}
+    for row_index in rows:
+        cells.update(status_update_cells(row_index, 상태선택, 담당자, 점검내용, now=now))
+    try:
+        write_cells(get_worksheet(SHEET_LOG), cells)
+    except Exception as e:
+        st.error(f"❌ 시트 업데이트 중 오류 발생: {e}")
+        return False
+
+    if 포지션_이동 != "선택 안 함":
+        rows = []
+        for _, issue in issues.iterrows():
+            payload = issue.to_dict()
+            payload.update({"점검자": 담당자, "점검내용": 점검내용, "포지션": 포지션_이동, "상태": 상태선택})
+            rows.append(position_sheet_row(payload))
+        try:
+            target_ws = get_worksheet(포지션_이동, create_headers=POSITION_SHEET_HEADERS)
+            append_rows(target_ws, rows)
+        except Exception as e:
+            st.error(f"❌ 포지션 시트 이동 중 오류 발생: {e}")
+            return False
+
+    st.toast(f"✅ {len(issues)}건 일괄 처리 완료 (시트 반영됨)", icon="✅")
+    return True
+
+@st.fragment
+def render_bulk_panel(issues):
+    st.markdown(f"### 🧩 일괄 처리 ({len(issues)}건)")
+    st.dataframe(
+        issues[[c for c in ["설비명", "장애내용", "상태"] if c in issues.columns]],
+        hide_index=True,
+        use_container_width=True,
+        height=min(35 * (len(issues) + 1) + 3, 250),
+    )
+
+    # 선택된 모든 장애에 공통으로 허용되는 상태만
+    allowed = None
+    for status in issues["상태"].unique():
+        options = STATE_TRANSITIONS.get(status, [])
+        allowed = [o for o in (allowed if allowed is not None else options) if o in options]
+    if not allowed:
+        st.warning("⚠️ 선택한 장애들에 공통으로 적용할 수 있는 상태가 없습니다.")
+        return
+
+    상태선택 = st.selectbox("📊 상태 변경", allowed, key="bulk_status")
+    포지션_이동 = st.selectbox("📍 포지션 시트로 이동", POSITION_OPTIONS, key="bulk_position")
+    담당자 = st.text_input("👷 점검자", key="bulk_inspector")
+    점검내용 = st.text_area("🧾 점검내용", height=150, key="bulk_note", placeholder="조치 내용 또는 점검 결과를 입력하세요.")
+
+    if st.button(f"💾 {len(issues)}건 일괄 저장", use_container_width=True):
+        if bulk_process_issues(issues, 상태선택, 담당자, 점검내용, 포지션_이동):
+            invalidate_issue_log()
+            st.rerun()
+
 def main():
     st.title("💼 981Park 장애 처리")
     st.caption(f"접속 계정: {email}")
 
     df = load_issue_log()
+    show_refresh_error()
     if df.empty:
         st.warning("⚠️ 데이터가 없습니다.")
         return
 
     # 보여줄 장애 목록
-    pending = df[df["상태"].isin(["접수중", "점검중", "운영중", "운영중단"])].copy()
-
-    # ✅ 체크박스 열 추가
-    pending.insert(0, "선택", False)
+    with span("filter"):
+        pending = df[df["상태"].isin(["접수중", "점검중", "운영중", "운영중단"])]
 
-    # ✅ 표시할 컬럼 목록 수정 (선택 컬럼 포함)
-    cols_show = [c for c in ["선택", "포지션", "위치", "설비명", "장애내용", "상태", "점검자"] if c in pending.columns]
+    # ✅ 표시할 컬럼 목록 (선택 컬럼은 페이지에만 추가)
+    cols_show = [c for c in ["포지션", "위치", "설비명", "장애내용", "상태", "점검자"] if c in pending.columns]
+    sort_keys = {c: c for c in ["포지션", "위치", "설비명", "상태", "점검자"] if c in pending.columns}
+    if "_parsed_date" in pending.columns:
+        sort_keys = {"날짜": "_parsed_date", **sort_keys}
 
     # 세션 초기화
     if "selected_issue" not in st.session_state:
@@ -315,14 +364,20 @@ def main():
     with col_list:
         st.subheader("📋 장애 목록")
 
-        # ✅ '선택' 컬럼 포함한 데이터 편집기 표시
-        edited = st.data_editor(
-            pending[cols_show],
-            use_container_width=True,
-            height=500,
-            hide_index=True,
-            key="issue_table",
-        )
+        # ✅ 현재 페이지만 '선택' 컬럼을 붙여 데이터 편집기로 표시
+        page = paginate(pending, "issue_table", columns=cols_show, sort_keys=sort_keys)
+        page_df = page.df.copy()
+        page_df.insert(0, "선택", False)
+        # 편집 상태는 행 위치 기준이라 페이지/정렬이 바뀌면 새 편집기로 (선택 초기화)
+        state = {k: st.session_state.get(f"issue_table_{k}") for k in ("page", "page_size", "sort", "desc")}
+        with span("table"):
+            edited = st.data_editor(
+                page_df,
+                use_container_width=True,
+                height=500,
+                hide_index=True,
+                key="issue_table_{page}_{page_size}_{sort}_{desc}".format(**state),
+            )
 
         # ✅ 체크된 행 탐색
         if "선택" in edited.columns:
@@ -332,11 +387,11 @@ def main():
                 st.warning("⚠️ 처리할 장애를 선택하세요.")
                 st.session_state["selected_issue"] = None
             elif len(selected_rows) > 1:
-                st.info("ℹ️ 여러 항목이 선택되었습니다. 가장 최근 선택된 장애만 표시됩니다.")
-                last_selected = selected_rows.iloc[-1]
-                st.session_state["selected_issue"] = last_selected
+                st.info(f"ℹ️ {len(selected_rows)}건이 선택되었습니다. 오른쪽에서 일괄 처리할 수 있습니다.")
+                st.session_state["selected_issue"] = None
             else:
-                st.session_state["selected_issue"] = selected_rows.iloc[0]
+                # 편집기에는 표시 컬럼만 있으므로 _id 등은 원본 행에서 가져온다
+                st.session_state["selected_issue"] = pending.loc[selected_rows.index[0]]
         else:
             st.error("⚠️ 데이터 편집기에서 '선택' 컬럼을 찾을 수 없습니다.")
             st.session_state["selected_issue"] = None
@@ -348,7 +403,10 @@ def main():
 
     # ✅ 오른쪽 상세 패널 표시
     with col_detail:
-        if st.session_state["selected_issue"] is not None:
+        if "선택" in edited.columns and int(edited["선택"].sum()) > 1:
+            with st.container(border=True):
+                render_bulk_panel(pending.loc[edited.index[edited["선택"] == True]])
+        elif st.session_state["selected_issue"] is not None:
             issue = st.session_state["selected_issue"]
             with st.container(border=True):
                 render_detail_panel(issue, df)
@@ -7,11 +7,14 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import io, json, requests, re
-from datetime import datetime, timedelta
-from typing import Optional
 from menu_ui import render_sidebar
+from issue_store import get_issue_snapshot, show_refresh_error
+from issue_history import completed_issues
+from search_index import search_index_for
+from table_pager import paginate
+from perf_trace import set_page, span
 
+set_page("IssueHistory")
 st.set_page_config(page_title="장애 조치 이력", layout="wide")
 
 st.markdown("""
@@ -87,208 +90,10 @@ header, [data-testid="stToolbar"] {
 </script>
 """, unsafe_allow_html=True)
 
-SHEET_ID_DEFAULT = "1Gm0GPsWm1H9fPshiBo8gpa8djwnPa4ordj9wWTGG_vI"
-SHEET_LOG_GID_DEFAULT = "389240943"
-SHEET_LOG_NAME = "접수내용"
-
-def normalize_col_name(s: str) -> str:
-    if s is None:
-        return ""
-    return str(s).replace("\n", " ").replace("\r", " ").strip()
-
-def make_unique_column_names(cols):
-    seen = {}
-    out = []
-    for c in cols:
-        base = normalize_col_name(c)
-        if base == "":
-            base = "unnamed"
-        if base in seen:
-            seen[base] += 1
-            new = f"{base}__dup{seen[base]}"
-        else:
-            seen[base] = 0
-            new = base
-        out.append(new)
-    return out
-
-def try_regex_ymd(s: str):
-    if not s or not isinstance(s, str):
-        return pd.NaT
-    m = re.search(r'(\d{4})\D+(\d{1,2})\D+(\d{1,2})', s)
-    if m:
-        y, mo, d = m.group(1), m.group(2), m.group(3)
-        try:
-            return pd.to_datetime(f"{int(y)}-{int(mo)}-{int(d)}")
-        except Exception:
-            return pd.NaT
-    return pd.NaT
-
-def parse_date_safe(val):
-    try:
-        if val is None:
-            return pd.NaT
-        if isinstance(val, (pd.Timestamp, datetime)):
-            return pd.to_datetime(val)
-        if isinstance(val, (int, float)) and not np.isnan(val):
-            try:
-                return pd.to_datetime(datetime(1899,12,30) + timedelta(days=int(val)))
-            except Exception:
-                pass
-        s = str(val).strip()
-        if s == "" or s.lower() in ["nan","none","nat"]:
-            return pd.NaT
-        p = pd.to_datetime(s, errors="coerce")
-        if not pd.isna(p):
-            return p
-        p2 = try_regex_ymd(s)
-        if not pd.isna(p2):
-            return p2
-        m2 = re.search(r'(\d{4})\s*[-./]?\s*(\d{1,2})\s*[-./]?\s*(\d{1,2})', s)
-        if m2:
-            y, mo, d = m2.groups()
-            try:
-                return pd.to_datetime(f"{int(y)}-{int(mo)}-{int(d)}")
-            except:
-                return pd.NaT
-        return pd.NaT
-    except Exception:
-        return pd.NaT
-
-def init_gspread_client():
-    if "google_service_account" not in st.secrets:
-        return None
-    try:
-        from google.oauth2.service_account import Credentials
-        import gspread
-    except Exception:
-        return None
-    info = st.secrets["google_service_account"]
-    if isinstance(info, str):
-        try:
-            info = json.loads(info)
-        except:
-            return None
-    try:
-        creds = Credentials.from_service_account_info(info, scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"])
-        client = gspread.authorize(creds)
-        return client
-    except Exception:
-        return None
-
-@st.cache_data(ttl=300)
-def fetch_via_gspread(sheet_name: str = SHEET_LOG_NAME) -> pd.DataFrame:
-    client = init_gspread_client()
-    if client is None:
-        raise RuntimeError("gspread client 미설정 (서비스계정 없음).")
-    sheet_id = st.secrets.get("SPREADSHEET_ID") or SHEET_ID_DEFAULT
-    try:
-        sh = client.open_by_key(sheet_id)
-    except Exception as e:
-        sh_name = st.secrets.get("SPREADSHEET_NAME")
-        if sh_name:
-            try:
-                sh = client.open(sh_name)
-            except Exception as e2:
-                raise RuntimeError(f"open_by_key 실패: {e}; fallback name 실패: {e2}")
-        else:
-            raise RuntimeError(f"open_by_key 실패: {e}")
-    try:
-        ws = sh.worksheet(sheet_name)
-    except Exception as e:
-        raise RuntimeError(f"워크시트 '{sheet_name}' 접근 실패: {e}")
-    data = ws.get_all_values()
-    if not data or len(data) < 2:
-        return pd.DataFrame()
-    header = data[0]
-    body = data[1:]
-    unique_header = make_unique_column_names(header)
-    df = pd.DataFrame(body, columns=unique_header)
-    empty_cols = [c for c in df.columns if df[c].replace("", pd.NA).isna().all()]
-    if empty_cols:
-        df = df.drop(columns=empty_cols)
-    return df
-
-@st.cache_data(ttl=300)
-def fetch_sheet_via_csv(csv_url: Optional[str] = None, gid: Optional[str] = None) -> pd.DataFrame:
-    if not csv_url:
-        sheet_id = st.secrets.get("SPREADSHEET_ID") or SHEET_ID_DEFAULT
-        gid = gid or st.secrets.get("SHEET_LOG_GID") or SHEET_LOG_GID_DEFAULT
-        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
-    resp = requests.get(csv_url, timeout=15)
-    if resp.status_code != 200:
-        raise RuntimeError(f"CSV fetch 실패 (HTTP {resp.status_code})")
-    raw = resp.text
-    head = raw.strip()[:1024].lower()
-    if "<html" in head or "accounts.google" in head:
-        raise RuntimeError("CSV가 HTML을 반환함(권한 필요).")
-    sep = "," if raw.count(",") >= raw.count(";") else ";"
-    df = pd.read_csv(io.StringIO(raw), sep=sep)
-    df.columns = make_unique_column_names(list(df.columns))
-    empty_cols = [c for c in df.columns if df[c].replace("", pd.NA).isna().all()]
-    if empty_cols:
-        df = df.drop(columns=empty_cols)
-    return df
-
-def detect_columns_from_df(cols):
-    status_col = next((c for c in cols if any(x in c for x in ["상태","접수처리","처리상태","status"])), None)
-    closure_col = next((c for c in cols if any(x in c for x in ["종결","종결여부","완결"])), None)
-    date_col = next((c for c in cols if any(x in c for x in ["날짜","접수일","date","등록일","완료일자"])), None)
-    pos_col = next((c for c in cols if any(x in c for x in ["포지션","위치","site","position"])), None)
-    return status_col, closure_col, date_col, pos_col
-
-def is_completed_row_from_df(r, status_col, closure_col):
-    try:
-        if status_col and str(r.get(status_col,"")).strip() == "완료":
-            return True
-        if closure_col and str(r.get(closure_col,"")).strip() == "종결":
-            return True
-    except Exception:
-        return False
-    return False
-
 def load_completed_issues():
-    last_err = ""
-    df = pd.DataFrame()
-    source = None
-    try:
-        df = fetch_via_gspread(SHEET_LOG_NAME)
-        source = "gspread"
-    except Exception as e:
-        last_err += f"gspread: {e} | "
-        try:
-            df = fetch_sheet_via_csv()
-            source = "csv"
-        except Exception as e2:
-            last_err += f"csv: {e2}"
-            raise RuntimeError("스프레드시트 로드 실패: " + last_err)
-
-    if df is None or df.empty:
-        raise RuntimeError("시트 로드 성공했으나 데이터(헤더 제외 행)가 없습니다. 원인: " + last_err)
-
-    cols = list(df.columns)
-    status_col, closure_col, date_col, pos_col = detect_columns_from_df(cols)
-
-    parsed_series = pd.Series(pd.NaT, index=df.index)
-    if date_col and date_col in df.columns:
-        parsed_series = df[date_col].apply(parse_date_safe)
-    else:
-        candidates = []
-        for c in df.columns:
-            if any(k in c for k in ["날", "date", "완료", "접수", "등록"]):
-                candidates.append(c)
-        for cand in candidates:
-            try:
-                this_parsed = df[cand].apply(parse_date_safe)
-                if this_parsed.notna().sum() > 0:
-                    parsed_series = parsed_series.combine_first(this_parsed)
-            except Exception:
-                continue
-
-    df["_parsed_date"] = parsed_series
-    df["_is_completed"] = df.apply(lambda r: is_completed_row_from_df(r, status_col, closure_col), axis=1)
-    completed_df = df[df["_is_completed"]].copy().reset_index(drop=True)
-    return completed_df, (status_col, closure_col, date_col, pos_col, source)
+    snapshot = get_issue_snapshot()
+    completed_df, cols = completed_issues(snapshot)
+    return completed_df.copy(), (*cols, snapshot.source)
 
 st.markdown("<style>"
             ".kpi-card{background:white;padding:12px;border-radius:8px;box-shadow:0 1px 4px rgba(0,0,0,0.04);}"
@@ -306,6 +111,7 @@ try:
 except Exception as e:
     st.error("접수내용 시트 로드 실패: " + str(e))
     st.stop()
+show_refresh_error()
 
 if "날짜" in completed_df.columns:
     try:
@@ -354,25 +160,30 @@ else:
 sel_positions = fc2.multiselect("포지션 (선택없음 = 전체)", options=pos_options, default=st.session_state.get("sel_positions", []))
 st.session_state["sel_positions"] = sel_positions
 
-search_q = fc3.text_input("검색 (설비명 / 장애내용 / 작성자)", value=st.session_state.get("search_q",""), placeholder="키워드 입력해서 좁히기")
+search_q = fc3.text_input("검색 (설비명 / 세부장치 / 장애내용 / 점검내용 / 작성자)", value=st.session_state.get("search_q",""), placeholder="키워드 입력해서 좁히기 (여러 단어 = 모두 포함)")
 st.session_state["search_q"] = search_q
 
-df_filtered = completed_df.copy()
+q = st.session_state.get("search_q","").strip()
 
-if st.session_state.get("sel_month","전체") != "전체":
-    chosen = st.session_state.get("sel_month")
-    df_filtered = df_filtered[df_filtered["_month"] == chosen]
+with span("filter"):
+    df_filtered = completed_df.copy()
 
-if st.session_state.get("sel_positions"):
-    df_filtered = df_filtered[df_filtered[pos_col].astype(str).isin(st.session_state["sel_positions"])]
+    if st.session_state.get("sel_month","전체") != "전체":
+        chosen = st.session_state.get("sel_month")
+        df_filtered = df_filtered[df_filtered["_month"] == chosen]
 
-q = st.session_state.get("search_q","").strip()
-if q:
-    ql = q.lower()
-    df_filtered = df_filtered[df_filtered.apply(lambda r: ql in str(r.get("설비명","")).lower() or ql in str(r.get("장애내용","")).lower() or ql in str(r.get("작성자","")).lower(), axis=1)]
+    if st.session_state.get("sel_positions"):
+        df_filtered = df_filtered[df_filtered[pos_col].astype(str).isin(st.session_state["sel_positions"])]
+
+    if q:
+        # 바이그램 역색인으로 찾은 행만, 검색 점수 순으로
+        ranked = search_index_for(get_issue_snapshot()).search(q)
+        rank = pd.Series(range(len(ranked)), index=pd.Index(ranked, dtype=object))
+        df_filtered = df_filtered.assign(_rank=df_filtered["_id"].map(rank))
+        df_filtered = df_filtered[df_filtered["_rank"].notna()].sort_values("_rank").drop(columns="_rank")
 
 total_after = len(df_filtered)
-urgent_after = int(df_filtered.apply(lambda r: r.astype(str).str.contains(r'\b긴급\b|\burgent\b', case=False, na=False).any(), axis=1).sum())
+urgent_after = int(df_filtered["_is_urgent"].sum())
 
 wanted = ["날짜", "작성자",  "위치", "설비명", "세부장치", "장애내용", "점검자", "완료일자", "점검내용"]
 if "_parsed_date" in df_filtered.columns and "완료일자" not in df_filtered.columns:
@@ -420,9 +231,13 @@ tbody tr:hover td {
 </style>
 """, unsafe_allow_html=True)
 
-# 🔹 표 표시용 데이터 구성
-df_show = df_filtered[display_cols].copy().fillna("")
-df_show.insert(0, "번호", np.arange(1, len(df_show) + 1))
+# 🔹 표 표시용 데이터 구성 — 현재 페이지의 행/표시 열만 잘라서 보낸다
+sort_keys = {c: c for c in display_cols}
+if "_parsed_date" in df_filtered.columns and "날짜" in sort_keys:
+    sort_keys["날짜"] = "_parsed_date"
+page = paginate(df_filtered, "history_table", columns=display_cols, sort_keys=sort_keys)
+df_show = page.df.fillna("")
+df_show.insert(0, "번호", np.arange(page.start + 1, page.start + len(df_show) + 1))
 
 # 🔹 컬럼 폭/유형 지정
 column_config = {
@@ -442,7 +257,7 @@ column_config = {
 st.markdown(
     f"""
     <div style='margin-top:10px;margin-bottom:6px;color:#64748b;font-size:14px;'>
-    총 <b>{len(df_filtered)}</b>건 중 <b>{len(df_show)}</b>건 표시됨 
+    총 <b>{page.total}</b>건 중 <b>{len(df_show)}</b>건 표시됨 ({page.page + 1}/{page.pages} 페이지)
     {f"(월: {st.session_state['sel_month']})" if st.session_state.get('sel_month') else ''}
     </div>
     """,
@@ -450,11 +265,12 @@ st.markdown(
 )
 
 # ✅ st.data_editor로 표 출력
-st.data_editor(
-    df_show,
-    hide_index=True,
-    use_container_width=True,
-    height=700,
-    disabled=True,
-    column_config=column_config
-)
+with span("table"):
+    st.data_editor(
+        df_show,
+        hide_index=True,
+        use_container_width=True,
+        height=700,
+        disabled=True,
+        column_config=column_config
+    )
@@ -0,0 +1,76 @@
+# pages/99_perf_admin.py
+"""
+981Park 성능 패널 (기술지원 전용 — 메뉴에 없는 숨김 페이지, 주소: /perf_admin)
+- 최근 1시간(구간 선택 가능) rerun 단계별 / 페이지×단계별 p50·p95·p99 (ms)
+- 캐시 로더별 호출/적중/미스/적중률
+"""
+import streamlit as st
+from menu_ui import render_sidebar, get_current_user, AUTHORIZED_USERS
+from perf_trace import STAGES, get_perf_recorder, set_page
+
+set_page("PerfAdmin")
+st.set_page_config(page_title="⏱ 성능 패널", layout="wide")
+
+st.markdown("""
+    <style>
+    [data-testid="stSidebarNav"] {display: none !important;}
+    section[data-testid="stSidebar"] div[role="listbox"] {display: none !important;}
+    </style>
+""", unsafe_allow_html=True)
+
+email, name = get_current_user()
+
+if not email or email.strip().lower() not in [e.lower() for e in AUTHORIZED_USERS]:
+    st.error("🚫 이 메뉴는 기술지원 전용입니다.")
+    st.stop()
+
+render_sidebar(active="PerfAdmin")
+
+WINDOWS = {"최근 15분": 900, "최근 1시간": 3600, "최근 6시간": 6 * 3600}
+MS_COLUMNS = ["p50", "p95", "p99", "최대"]
+
+
+def _show(df):
+    """stage/page 컬럼을 한글 이름으로 바꿔 표시"""
+    df = df.rename(columns={"page": "페이지", "stage": "단계"})
+    if "단계" in df.columns:
+        df["단계"] = df["단계"].map(lambda s: f"{STAGES.get(s, s)} ({s})")
+    st.dataframe(
+        df,
+        hide_index=True,
+        use_container_width=True,
+        column_config={c: st.column_config.NumberColumn(c, format="%.1f") for c in MS_COLUMNS},
+    )
+
+
+recorder = get_perf_recorder()
+
+st.title("⏱ 단계별 처리 시간")
+st.caption(
+    "rerun 안의 단계별 소요 시간(ms) — 안쪽 단계(날짜 파싱 ⊂ 프레임 구성)는 바깥 단계 시간에도 포함됩니다. "
+    "페이지 background는 백그라운드 시트 갱신입니다."
+)
+
+window = WINDOWS[st.selectbox("집계 구간", list(WINDOWS), index=1)]
+
+st.subheader("단계별")
+by_stage = recorder.stage_summary(window, by=("stage",))
+if by_stage.empty:
+    st.info("아직 기록이 없습니다.")
+else:
+    _show(by_stage)
+
+    st.subheader("페이지 × 단계")
+    _show(recorder.stage_summary(window, by=("page", "stage")))
+
+st.subheader("캐시 적중률")
+cache = recorder.cache_summary()
+if cache.empty:
+    st.info("아직 캐시 조회 기록이 없습니다.")
+else:
+    st.dataframe(
+        cache,
+        hide_index=True,
+        use_container_width=True,
+        column_config={"적중률(%)": st.column_config.NumberColumn("적중률(%)", format="%.1f")},
+    )
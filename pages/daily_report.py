@@ -1,12 +1,12 @@
 import streamlit as st
-import pandas as pd
-import requests
-import io
-import re
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from menu_ui import render_sidebar, get_current_user, AUTHORIZED_USERS
+from issue_store import get_issue_snapshot, show_refresh_error
+from issue_cube import daily_cube_for
+from perf_trace import set_page, span
 
+set_page("Daily")
 st.set_page_config(page_title="📅 Daily 현황", layout="wide")
 
 st.markdown("""
@@ -89,70 +89,6 @@ header, [data-testid="stToolbar"] {
 render_sidebar(active="Daily")
 
 KST = ZoneInfo("Asia/Seoul")
-SHEET_URL = "https://docs.google.com/spreadsheets/d/1Gm0GPsWm1H9fPshiBo8gpa8djwnPa4ordj9wWTGG_vI/export?format=csv&gid=389240943"
-
-def fetch_csv(url: str) -> pd.DataFrame:
-    """Google Sheets CSV 안전 로드"""
-    resp = requests.get(url, timeout=15)
-    head = resp.text.strip()[:200].lower()
-    if head.startswith("<"):
-        raise RuntimeError("CSV 대신 HTML 응답 수신 — 공유 설정을 확인하세요.")
-    resp.encoding = "utf-8"
-    raw = resp.text
-    first = raw.splitlines()[0] if raw else ""
-    sep = ";" if first.count(";") > first.count(",") else ","
-    df = pd.read_csv(io.StringIO(raw), sep=sep, engine="python")
-    df.columns = df.columns.str.replace("\n", "", regex=False).str.strip()
-    df = df.loc[:, ~df.columns.str.contains(r"^Unnamed", na=False)]
-    return df
-
-def parse_jeju_date(val):
-    """981파크 접수내용 날짜 파서"""
-    if pd.isna(val):
-        return pd.NaT
-    s = str(val).strip().replace("오전", "AM").replace("오후", "PM")
-    s = re.sub(r"\s*\.\s*", "-", s)
-    s = re.sub(r"-+", "-", s).strip("-")
-    patterns = [
-        "%Y-%m-%d %p %I:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d",
-        "%y-%m-%d",
-        "%Y-%m-%d %I:%M:%S %p",
-    ]
-    for fmt in patterns:
-        try:
-            return datetime.strptime(s, fmt)
-        except Exception:
-            continue
-    if re.fullmatch(r"\d+(\.\d+)?", s):
-        try:
-            return pd.to_datetime(float(s), unit="D", origin="1899-12-30")
-        except Exception:
-            pass
-    return pd.to_datetime(s, errors="coerce")
-
-def normalize_status(s):
-    if pd.isna(s):
-        return "미정의"
-    sv = str(s).strip()
-    if sv in ["점검중", "진행중", "처리중"]:
-        return "점검중"
-    if sv in ["접수중", "대기", "미조치"]:
-        return "미조치(접수중)"
-    if sv in ["완료", "운영중", "사용중지"]:
-        return "완료"
-    return sv
-
-def status_counts(frame: pd.DataFrame):
-    total = len(frame)
-    vc = frame["상태"].value_counts()
-    prog = int(vc.get("점검중", 0))
-    pend = int(vc.get("미조치(접수중)", 0))
-    done = int(vc.get("완료", 0))
-    rate = (done / total * 100) if total else 0.0
-    return total, prog, pend, done, rate
-
 def render_kpi(cards, columns=5):
     st.markdown(
         """
@@ -188,24 +124,26 @@ def render_kpi(cards, columns=5):
         )
 
 try:
-    df = fetch_csv(SHEET_URL)
+    snapshot = get_issue_snapshot()
 except Exception as e:
     st.error(f"❌ 접수내용 로드 실패: {e}")
     st.stop()
 
-if "날짜" not in df.columns or "접수처리" not in df.columns:
+if "날짜" not in snapshot.df.columns or "접수처리" not in snapshot.df.columns:
     st.error("❌ 필수 컬럼(날짜, 접수처리)이 없습니다.")
     st.stop()
 
-df["날짜"] = df["날짜"].apply(parse_jeju_date)
-df["상태"] = df["접수처리"].apply(normalize_status)
-df = df.dropna(subset=["날짜"]).copy()
-
 st.title("📅 Daily 장애 접수 현황")
+show_refresh_error()
 
 today_kst = datetime.now(tz=KST).date()
-df_today = df[df["날짜"].dt.date == today_kst]
-t_total, t_prog, t_pend, t_done, t_rate = status_counts(df_today)
+# 금일 KPI는 집계 큐브의 오늘 셀만, 목록은 오늘 행만 잘라서 만든다
+with span("aggregate"):
+    t_total, t_prog, t_pend, t_done, t_rate = daily_cube_for(snapshot).status_counts(days=[today_kst.isoformat()])
+with span("filter"):
+    df_today = snapshot.df[snapshot.df["_parsed_date"].dt.date == today_kst].copy()
+    df_today["날짜"] = df_today["_parsed_date"]
+    df_today["상태"] = df_today["_status"]
 
 render_kpi([
     ("금일 접수", f"{t_total}", "c-blue"),
@@ -222,10 +160,11 @@ pending = df_today[df_today["상태"].isin(["미조치(접수중)", "점검중"]
 cols_show = [c for c in ["날짜", "포지션", "위치", "설비명", "장애내용", "상태", "점검자"] if c in pending.columns]
 
 if not pending.empty:
-    st.dataframe(
-        pending.sort_values("날짜", ascending=False)[cols_show],
-        use_container_width=True, height=320
-    )
+    with span("table"):
+        st.dataframe(
+            pending.sort_values("날짜", ascending=False)[cols_show],
+            use_container_width=True, height=320
+        )
 else:
     st.info("✅ 현재 미조치 또는 점검중 장애가 없습니다.")
 
@@ -0,0 +1,199 @@
+"""
+981Park 단계별 소요 시간 기록 (관리자 성능 패널용)
+- with span("fetch"): … 로 rerun 안의 단계 시간을 재서 프로세스 공용 링 버퍼(최근 SPAN_HISTORY개)에 쌓는다
+  안쪽 단계는 바깥 단계 시간에도 포함된다 (예: date_parse ⊂ frame_build)
+- 페이지 이름은 스크립트 맨 위 set_page()로 지정 — 같은 세션의 이후 기록에 붙는다
+  rerun(st.fragment rerun 포함)마다 ScriptRunner 스레드가 새로 생기므로 스레드가 아니라
+  ScriptRunContext의 세션 id로 찾는다. 세션 밖(백그라운드 갱신 스레드)의 기록은 "background"
+- @cached(이름, st.cache_resource(...)) 로더와 스냅샷 파생 구조는 호출/실행 횟수로 캐시 적중률을 센다
+- set_page()는 세션 id별 마지막 활동 시각도 남긴다 — 최근 ACTIVE_WINDOW초 안에 rerun한 세션 수 (metrics 노출용)
+"""
+import functools
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+SPAN_HISTORY = 50_000
+WINDOW = 3600  # 초 — 관리자 패널 기본 집계 구간
+BACKGROUND_PAGE = "background"
+ACTIVE_WINDOW = 300  # 초 — 이 안에 rerun한 세션을 활성으로 센다
+SESSION_TTL = 6 * 3600  # 초 — 이보다 오래 rerun이 없던 세션의 페이지 기록은 지운다
+STAGES = {
+    "auth": "인증",
+    "fetch": "시트 가져오기",
+    "csv_parse": "CSV 파싱",
+    "frame_build": "프레임 구성",
+    "date_parse": "날짜 파싱",
+    "filter": "필터",
+    "aggregate": "집계",
+    "figure": "차트 생성",
+    "table": "표 렌더링",
+}
+PERCENTILES = [50, 95, 99]
+
+
+@dataclass(frozen=True)
+class Span:
+    page: str
+    stage: str
+    elapsed: float  # 초
+    started_at: float
+
+
+class PerfRecorder:
+    """단계 기록 링 버퍼 + 캐시 호출/미스 카운터"""
+
+    def __init__(self, history: int = SPAN_HISTORY):
+        self.spans = deque(maxlen=history)
+        self.cache_calls = Counter()
+        self.cache_misses = Counter()
+        self.sessions = {}  # 세션 id → (페이지, 마지막 rerun 시각)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def set_page(self, page: str, session_id: str = None):
+        self._local.page = page
+        if session_id:
+            with self._lock:
+                self.sessions[session_id] = (page, time.time())
+
+    def active_sessions(self, window: float = ACTIVE_WINDOW) -> Counter:
+        """최근 window초 안에 rerun한 세션 수 (마지막 페이지별) — SESSION_TTL이 지난 세션은 지운다"""
+        now = time.time()
+        with self._lock:
+            self.sessions = {sid: v for sid, v in self.sessions.items() if v[1] >= now - SESSION_TTL}
+            return Counter(page for page, seen in self.sessions.values() if seen >= now - window)
+
+    def page(self) -> str:
+        """현재 세션이 마지막으로 set_page한 페이지 (fragment rerun도 활동으로 본다)"""
+        ctx = get_script_run_ctx(suppress_warning=True)
+        if ctx is not None:
+            with self._lock:
+                entry = self.sessions.get(ctx.session_id)
+                if entry is not None:
+                    self.sessions[ctx.session_id] = (entry[0], time.time())
+                    return entry[0]
+        return getattr(self._local, "page", BACKGROUND_PAGE)
+
+    @contextmanager
+    def span(self, stage: str):
+        started = time.time()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = Span(page=self.page(), stage=stage, elapsed=time.perf_counter() - t0, started_at=started)
+            with self._lock:
+                self.spans.append(record)
+
+    def count_cache(self, name: str, hit: bool = True, calls: int = 1):
+        with self._lock:
+            self.cache_calls[name] += calls
+            if not hit:
+                self.cache_misses[name] += 1
+
+    def recent(self, window: float = WINDOW) -> pd.DataFrame:
+        """최근 window초 기록 — 컬럼: page, stage, elapsed, started_at"""
+        with self._lock:
+            spans = list(self.spans)
+        cutoff = time.time() - window
+        return pd.DataFrame(
+            [(s.page, s.stage, s.elapsed, s.started_at) for s in spans if s.started_at >= cutoff],
+            columns=["page", "stage", "elapsed", "started_at"],
+        )
+
+    def stage_summary(self, window: float = WINDOW, by=("stage",)) -> pd.DataFrame:
+        """by별 건수와 p50/p95/p99/최대 (ms)"""
+        df = self.recent(window)
+        by = list(by)
+        columns = by + ["건수"] + [f"p{p}" for p in PERCENTILES] + ["최대"]
+        if df.empty:
+            return pd.DataFrame(columns=columns)
+        ms = df.assign(elapsed=df["elapsed"] * 1000).groupby(by)["elapsed"]
+        out = pd.concat(
+            [ms.size().rename("건수")]
+            + [ms.quantile(p / 100).rename(f"p{p}") for p in PERCENTILES]
+            + [ms.max().rename("최대")],
+            axis=1,
+        ).reset_index()
+        if "stage" in by:
+            order = {stage: i for i, stage in enumerate(STAGES)}
+            out = out.sort_values(by, key=lambda s: s.map(order).fillna(len(order)) if s.name == "stage" else s)
+        return out[columns].reset_index(drop=True)
+
+    def cache_summary(self) -> pd.DataFrame:
+        """로더별 호출/적중/미스/적중률(%)"""
+        with self._lock:
+            calls, misses = Counter(self.cache_calls), Counter(self.cache_misses)
+        rows = []
+        for name in sorted(calls):
+            total, miss = calls[name], min(misses[name], calls[name])
+            rows.append((name, total, total - miss, miss, (total - miss) / total * 100 if total else 0.0))
+        return pd.DataFrame(rows, columns=["로더", "호출", "적중", "미스", "적중률(%)"])
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_perf_recorder() -> PerfRecorder:
+    global _recorder
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = PerfRecorder()
+    return _recorder
+
+
+def set_page(page: str):
+    """이 세션(세션 밖이면 이 스레드)에서 이후 기록할 단계의 페이지 이름"""
+    ctx = get_script_run_ctx(suppress_warning=True)
+    get_perf_recorder().set_page(page, ctx.session_id if ctx else None)
+
+
+def span(stage: str):
+    return get_perf_recorder().span(stage)
+
+
+def timed(stage: str):
+    """함수 전체를 한 단계로 기록하는 데코레이터"""
+    def wrap(func):
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return call
+    return wrap
+
+
+def count_cache(name: str, hit: bool):
+    get_perf_recorder().count_cache(name, hit)
+
+
+def cached(name: str, cache):
+    """
+    캐시 데코레이터(st.cache_data / st.cache_resource(...))를 감싸 적중률을 센다
+    예: @cached("설비매핑 시트", st.cache_resource(ttl=300))
+    호출은 바깥에서, 미스는 캐시가 실제로 함수를 실행할 때 센다
+    """
+    def wrap(func):
+        @functools.wraps(func)
+        def build(*args, **kwargs):
+            get_perf_recorder().count_cache(name, hit=False, calls=0)
+            return func(*args, **kwargs)
+
+        loader = cache(build)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            get_perf_recorder().count_cache(name, hit=True)
+            return loader(*args, **kwargs)
+
+        call.clear = getattr(loader, "clear", None)
+        return call
+    return wrap
@@ -0,0 +1,320 @@
+"""
+981Park 장애 이력 전문 검색 인덱스
+- 장애내용/점검내용/설비명/세부장치/작성자에 대한 글자 바이그램 역색인 (한 글자 검색은 글자 색인)
+- 행 ID(_id)와 내용 해시로 증분 갱신: 새 행/내용이 바뀐 행만 다시 색인
+- 변경은 작은 delta 세그먼트에 쌓고, 백그라운드에서 불변 base 세그먼트로 병합 후 디스크(pickle)에 저장
+  (저장/병합 중에도 검색은 막히지 않는다)
+- 여러 단어 검색은 모든 단어를 포함하는 행만, 가중치 점수 → 최근 추가·수정된 행 순으로 정렬
+"""
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from config import setting
+
+SEARCH_FIELDS = {"설비명": 3.0, "세부장치": 2.0, "장애내용": 2.0, "점검내용": 1.0, "작성자": 1.0}
+INDEX_FORMAT = 2
+SAVE_INTERVAL = 60  # 초 — 병합/디스크 저장 최소 간격
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".history_index.pkl")
+
+
+def _norm(text) -> str:
+    return "".join(str(text).lower().split())
+
+
+def _grams(texts):
+    """필드 텍스트들의 글자 + 바이그램 (중복 제거)"""
+    out = set()
+    for t in texts:
+        out.update(t)
+        out.update(t[i:i + 2] for i in range(len(t) - 1))
+    return out
+
+
+class _Segment:
+    """docs: 문서 번호 → (_id, 내용 해시, 필드별 텍스트 tuple), postings: 글자/바이그램 → 문서 번호 set"""
+
+    def __init__(self, docs=None, postings=None):
+        self.docs = docs if docs is not None else {}
+        self.postings = postings if postings is not None else {}
+        self._columns = None
+
+    def columns(self):
+        """(정렬된 문서 번호, _id 배열, 필드별 Arrow 문자열 배열) — 점수 계산용, 변경 전까지 캐시"""
+        cols = self._columns
+        if cols is None:
+            docs = np.array(sorted(self.docs), dtype=np.int64)
+            entries = [self.docs[d] for d in docs]
+            width = len(entries[0][2]) if entries else 0
+            cols = (
+                docs,
+                np.array([e[0] for e in entries], dtype=object),
+                [pa.array([e[2][f] for e in entries], type=pa.string()) for f in range(width)],
+            )
+            self._columns = cols
+        return cols
+
+    def add(self, doc, entry):
+        self._columns = None
+        self.docs[doc] = entry
+        for gram in _grams(entry[2]):
+            self.postings.setdefault(gram, set()).add(doc)
+
+    def discard(self, doc):
+        self._columns = None
+        entry = self.docs.pop(doc)
+        for gram in _grams(entry[2]):
+            docs = self.postings.get(gram)
+            if docs is not None:
+                docs.discard(doc)
+                if not docs:
+                    del self.postings[gram]
+
+    def match(self, term):
+        keys = [term] if len(term) == 1 else [term[i:i + 2] for i in range(len(term) - 1)]
+        postings = sorted((self.postings.get(k) or set() for k in keys), key=len)
+        if not postings[0]:
+            return set()
+        return set.intersection(*postings)
+
+
+class HistorySearchIndex:
+    def __init__(self, path: str = None, fields=None):
+        self.path = path
+        self.fields = dict(fields or SEARCH_FIELDS)
+        self._lock = threading.RLock()
+        self._base = _Segment()  # 불변 — 병합 시 통째로 교체
+        self._delta = _Segment()
+        self._deleted = set()  # base에서 지워진(수정/삭제된) 문서 번호
+        self._doc_of = {}  # _id → 문서 번호
+        self._sig_of = {}  # _id → 내용 해시 (변경 감지용)
+        self._next_doc = 0
+        self._dirty = False
+        self._saved_at = 0.0
+        self._saver = None
+        if path:
+            self._load()
+
+    # ── 저장 / 불러오기 ─────────────────────
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        if state.get("format") != INDEX_FORMAT or state.get("fields") != list(self.fields):
+            return  # 형식/필드가 바뀌면 새로 만든다
+        self._base = _Segment(state["docs"], state["postings"])
+        self._doc_of = {entry[0]: doc for doc, entry in self._base.docs.items()}
+        self._sig_of = {entry[0]: entry[1] for entry in self._base.docs.values()}
+        self._next_doc = state["next_doc"]
+
+    def _merge(self):
+        """delta/삭제 표시를 새 base로 합친다 — 무거운 작업은 락 밖에서"""
+        with self._lock:
+            base = self._base
+            if not base.docs and not self._deleted:
+                # 첫 색인: delta를 그대로 base로 넘긴다
+                merged_base, self._base, self._delta = self._delta, self._delta, _Segment()
+            else:
+                merged_base = None
+                delta_docs = dict(self._delta.docs)
+                deleted = set(self._deleted)
+        if merged_base is not None:
+            merged_base.columns()
+            return merged_base
+        if not delta_docs and not deleted:
+            return base
+
+        docs = {d: e for d, e in base.docs.items() if d not in deleted}
+        docs.update(delta_docs)
+        touched = {}
+        for doc in deleted:
+            for gram in _grams(base.docs[doc][2]):
+                touched.setdefault(gram, set())
+        for doc, entry in delta_docs.items():
+            for gram in _grams(entry[2]):
+                touched.setdefault(gram, set()).add(doc)
+        postings = dict(base.postings)
+        for gram, added in touched.items():
+            merged = (postings.get(gram, set()) - deleted) | added
+            if merged:
+                postings[gram] = merged
+            else:
+                postings.pop(gram, None)
+        merged_base = _Segment(docs, postings)
+        merged_base.columns()
+
+        with self._lock:
+            self._base = merged_base
+            self._deleted -= deleted
+            for doc in delta_docs:
+                if doc in self._delta.docs:
+                    self._delta.discard(doc)
+                else:
+                    self._deleted.add(doc)  # 병합 중에 다시 수정/삭제됨
+        return merged_base
+
+    def save(self):
+        """delta 병합 후 base를 임시 파일에 쓰고 교체 (쓰는 도중 종료돼도 이전 파일 유지)"""
+        if not self.path:
+            return
+        self._dirty = False
+        base = self._merge()
+        with self._lock:
+            next_doc = self._next_doc
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump({
+                    "format": INDEX_FORMAT,
+                    "fields": list(self.fields),
+                    "docs": base.docs,
+                    "postings": base.postings,
+                    "next_doc": next_doc,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._saved_at = time.time()
+
+    def _save_later(self):
+        """변경이 있으면 백그라운드에서 병합·저장 (SAVE_INTERVAL당 최대 1회)"""
+        if self._saver is not None and self._saver.is_alive():
+            return
+
+        def run():
+            time.sleep(max(0.0, self._saved_at + SAVE_INTERVAL - time.time()))
+            if self._dirty:
+                if self.path:
+                    self.save()
+                else:
+                    self._dirty = False
+                    self._merge()
+                    self._saved_at = time.time()
+
+        self._saver = threading.Thread(target=run, name="history-index-save", daemon=True)
+        self._saver.start()
+
+    # ── 색인 ──────────────────────────────
+    def _entry(self, doc):
+        entry = self._delta.docs.get(doc)
+        return entry if entry is not None else self._base.docs[doc]
+
+    def _remove(self, issue_id):
+        doc = self._doc_of.pop(issue_id)
+        self._sig_of.pop(issue_id, None)
+        if doc in self._delta.docs:
+            self._delta.discard(doc)
+        else:
+            self._deleted.add(doc)
+
+    def sync(self, df: pd.DataFrame):
+        """스냅샷 프레임과 맞춘다 — 새 행/바뀐 행만 색인, 사라진 행은 제거"""
+        if df.empty or "_id" not in df.columns:
+            return self
+        raw = pd.DataFrame({
+            c: (df[c].fillna("").astype(str) if c in df.columns else "")
+            for c in self.fields
+        }, index=df.index)
+        sigs = pd.util.hash_pandas_object(raw, index=False).to_numpy()
+        ids = df["_id"].to_numpy(dtype=object)
+        with self._lock:
+            known = pd.Index(list(self._sig_of), dtype=object)
+            known_sigs = np.fromiter(self._sig_of.values(), dtype=np.uint64, count=len(self._sig_of))
+            pos = known.get_indexer(ids)
+            changed = pos < 0
+            changed[~changed] = known_sigs[pos[~changed]] != sigs[~changed]
+            removed = known[~known.isin(ids)]
+            if not changed.any() and removed.empty:
+                return self
+
+            texts = raw[changed].apply(lambda col: col.str.lower().str.replace(r"\s+", "", regex=True))
+            for issue_id, sig, row in zip(ids[changed], sigs[changed], texts.itertuples(index=False, name=None)):
+                if issue_id in self._doc_of:
+                    self._remove(issue_id)
+                doc = self._next_doc
+                self._next_doc += 1
+                self._doc_of[issue_id] = doc
+                self._sig_of[issue_id] = sig
+                self._delta.add(doc, (issue_id, sig, row))
+            for issue_id in removed:
+                self._remove(issue_id)
+        self._dirty = True
+        self._save_later()
+        return self
+
+    # ── 검색 ──────────────────────────────
+    def _score(self, segment, docs, terms):
+        """세그먼트 안의 후보 문서 → (_id 배열, 문서 번호, 점수, 단어별 등장 여부)"""
+        all_docs, ids, columns = segment.columns()
+        pos = np.searchsorted(all_docs, docs)
+        take = pa.array(pos)
+        per_term = np.zeros((len(terms), len(docs)))
+        for column, weight in zip(columns, self.fields.values()):
+            sub = column.take(take)
+            for t, term in enumerate(terms):
+                per_term[t] += weight * pc.count_substring(sub, term).to_numpy(zero_copy_only=False)
+        return ids[pos], docs, per_term.sum(axis=0), (per_term > 0).all(axis=0)
+
+    def search(self, query: str, limit: int = None):
+        """공백으로 나눈 모든 단어를 포함하는 행의 _id 목록 (점수 → 최근 추가·수정 순)"""
+        terms = [t for t in dict.fromkeys(_norm(w) for w in str(query).split()) if t]
+        if not terms:
+            return []
+        with self._lock:
+            base, delta, deleted = self._base, self._delta, self._deleted
+            found = {"base": None, "delta": None}
+            for term in sorted(terms, key=len, reverse=True):
+                hits = {"base": base.match(term) - deleted, "delta": delta.match(term)}
+                for k, v in hits.items():
+                    found[k] = v if found[k] is None else found[k] & v
+                if not found["base"] and not found["delta"]:
+                    return []
+            parts = [
+                self._score(segment, np.sort(np.fromiter(found[k], dtype=np.int64, count=len(found[k]))), terms)
+                for k, segment in (("base", base), ("delta", delta))
+                if found[k]
+            ]
+
+        # 바이그램은 모두 있지만 연속 문자열이 없는 행은 제외, 점수 → 최근 문서 순
+        ids = np.concatenate([p[0] for p in parts])
+        docs = np.concatenate([p[1] for p in parts])
+        scores = np.concatenate([p[2] for p in parts])
+        keep = np.concatenate([p[3] for p in parts])
+        order = np.lexsort((-docs, -scores))
+        order = order[keep[order]]
+        if limit:
+            order = order[:limit]
+        return ids[order].tolist()
+
+
+def index_path():
+    return setting("HISTORY_INDEX_PATH", DEFAULT_INDEX_PATH)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_history_index() -> HistorySearchIndex:
+    """프로세스 공용 인덱스 (디스크에 저장된 인덱스가 있으면 이어서 사용)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = HistorySearchIndex(index_path())
+    return _index
+
+
+def search_index_for(snapshot) -> HistorySearchIndex:
+    """스냅샷 버전마다 한 번만 증분 동기화된 인덱스"""
+    return snapshot.derive("history_search", get_history_index().sync)
@@ -0,0 +1,284 @@
+"""
+981Park Google Sheets 공용 클라이언트
+- 서비스계정 인증은 프로세스당 한 번, 스프레드시트는 open_by_key로 연다 (Drive 제목 검색 없음)
+- Worksheet 핸들(포지션 시트 포함)을 제목별로 캐시해 페이지/백그라운드 스레드가 함께 쓴다
+- 액세스 토큰은 google-auth 세션이 만료 전에 자동 갱신, 갱신 자체가 실패(RefreshError)하면 풀을 재생성하고
+  새 핸들로 한 번 다시 시도한다 — 읽기/쓰기는 read_values/append_row/write_cells(또는 run_on_worksheet)로
+- 캐시된 핸들의 시트가 삭제/이름변경되면 그 핸들만 버리고 제목으로 다시 연다 (없으면 WorksheetNotFound)
+- 셀 쓰기는 write_cells()로 모아 한 번의 batch_update 요청으로 보낸다 (쓰기 쿼터 보호)
+- SHEETS_ENDPOINT가 설정되면 인증 없이 그 주소(로컬 대역 서버)로 Sheets API를 보낸다
+- 모든 Sheets API 요청은 워크시트별 읽기/쓰기 횟수·상태와 지연을 metrics에 남긴다 (쿼터 사용량 경보용)
+"""
+import random
+import threading
+import time
+from urllib.parse import unquote, urlsplit
+
+import gspread
+import requests
+from google.auth.exceptions import RefreshError
+from google.oauth2.service_account import Credentials
+from gspread.http_client import HTTPClient
+from gspread.urls import SPREADSHEETS_API_V4_BASE_URL
+from gspread.utils import rowcol_to_a1
+
+from config import secret, sheets_endpoint
+from issue_store import SHEET_ID
+from metrics import get_metrics, observe_http
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+WRITE_RETRIES = 3
+WRITE_RETRY_STATUS = {429, 500, 502, 503, 504}
+WRITE_BACKOFF_BASE = 2.0  # 초 — 쓰기 쿼터는 분 단위라 읽기보다 길게 기다린다
+GOOGLE_SHEETS_ORIGIN = SPREADSHEETS_API_V4_BASE_URL.split("/v4/")[0]
+SPREADSHEET_SCOPE = "(spreadsheet)"  # 메타데이터/시트 추가처럼 특정 워크시트가 아닌 요청
+
+
+def _missing_sheet(error: gspread.exceptions.APIError) -> bool:
+    """시트가 삭제/이름변경된 핸들로 요청하면 Sheets API는 400 'Unable to parse range'로 답한다"""
+    return getattr(error.response, "status_code", None) == 400 and "Unable to parse range" in str(error)
+
+
+def _range_title(a1: str) -> str:
+    """'접수내용'!A1:Q5 → 접수내용 (시트 이름만 있으면 그대로)"""
+    title = a1.rpartition("!")[0] or a1
+    return title.strip("'").replace("''", "'")
+
+
+def request_worksheet(endpoint: str, params=None, json=None) -> str:
+    """Sheets API 요청 URL/파라미터/본문에서 대상 워크시트 이름"""
+    path = urlsplit(endpoint).path
+    if "/values/" in path:
+        # values/{quote(범위)}:append — 범위 안의 ':'는 인코딩되어 있으므로 첫 ':' 앞까지가 범위
+        return _range_title(unquote(path.split("/values/", 1)[1].split(":", 1)[0]))
+    ranges = (params or {}).get("ranges")
+    if ranges:
+        return _range_title(ranges if isinstance(ranges, str) else ranges[0])
+    data = (json or {}).get("data") if isinstance(json, dict) else None
+    if data and isinstance(data, list) and isinstance(data[0], dict) and data[0].get("range"):
+        return _range_title(data[0]["range"])
+    return SPREADSHEET_SCOPE
+
+
+class MeteredHTTPClient(HTTPClient):
+    """gspread HTTP 클라이언트 — 요청마다 워크시트/읽기·쓰기/상태와 지연을 metrics에 기록"""
+
+    def request(self, method, endpoint, params=None, data=None, json=None, files=None, headers=None):
+        started = time.time()
+        status = 0
+        try:
+            resp = super().request(method, endpoint, params=params, data=data, json=json, files=files, headers=headers)
+            status = resp.status_code
+            return resp
+        except gspread.exceptions.APIError as e:
+            status = getattr(e.response, "status_code", 0)
+            raise
+        finally:
+            get_metrics().sheets_requests.inc(
+                worksheet=request_worksheet(endpoint, params, json),
+                op="read" if method.upper() == "GET" else "write",
+                status=status,
+            )
+            observe_http("gspread", time.time() - started, status)
+
+
+class EndpointSession(requests.Session):
+    """Sheets API 요청의 https://sheets.googleapis.com 부분을 endpoint로 바꿔 보내는 세션 (인증 헤더 없음)"""
+
+    def __init__(self, endpoint: str):
+        super().__init__()
+        self.endpoint = endpoint.rstrip("/")
+
+    def request(self, method, url, *args, **kwargs):
+        if url.startswith(GOOGLE_SHEETS_ORIGIN):
+            url = self.endpoint + url[len(GOOGLE_SHEETS_ORIGIN):]
+        return super().request(method, url, *args, **kwargs)
+
+
+class SheetsPool:
+    """인증된 gspread 클라이언트 + Spreadsheet + Worksheet 핸들 캐시"""
+
+    def __init__(self, creds_info, spreadsheet_id: str, endpoint: str = None):
+        self.creds_info = dict(creds_info or {})
+        self.spreadsheet_id = spreadsheet_id
+        self.endpoint = endpoint
+        self._lock = threading.RLock()
+        self._client = None
+        self._spreadsheet = None
+        self._worksheets = {}
+
+    def reset(self):
+        """토큰 갱신 실패 등으로 핸들을 전부 버리고 다음 호출에서 다시 인증"""
+        with self._lock:
+            self._client = None
+            self._spreadsheet = None
+            self._worksheets.clear()
+
+    def client(self) -> gspread.Client:
+        with self._lock:
+            if self._client is None and self.endpoint:
+                self._client = gspread.Client(
+                    None, session=EndpointSession(self.endpoint), http_client=MeteredHTTPClient
+                )
+            elif self._client is None:
+                creds = Credentials.from_service_account_info(self.creds_info, scopes=SCOPES)
+                self._client = gspread.authorize(creds, http_client=MeteredHTTPClient)
+            return self._client
+
+    def spreadsheet(self) -> gspread.Spreadsheet:
+        with self._lock:
+            if self._spreadsheet is None:
+                try:
+                    self._spreadsheet = self.client().open_by_key(self.spreadsheet_id)
+                except RefreshError:
+                    self.reset()
+                    self._spreadsheet = self.client().open_by_key(self.spreadsheet_id)
+            return self._spreadsheet
+
+    def worksheet(self, title: str, create_headers=None) -> gspread.Worksheet:
+        """
+        제목으로 Worksheet 핸들 조회 (캐시)
+        create_headers: 시트가 없을 때 이 헤더로 새로 만든다 (None이면 WorksheetNotFound 그대로)
+        """
+        with self._lock:
+            ws = self._worksheets.get(title)
+            if ws is not None:
+                return ws
+            try:
+                ws = self._open_worksheet(title, create_headers)
+            except RefreshError:
+                self.reset()
+                ws = self._open_worksheet(title, create_headers)
+            self._worksheets[title] = ws
+            return ws
+
+    def _open_worksheet(self, title: str, create_headers=None) -> gspread.Worksheet:
+        sh = self.spreadsheet()
+        try:
+            return sh.worksheet(title)
+        except gspread.WorksheetNotFound:
+            if create_headers is None:
+                raise
+            ws = sh.add_worksheet(title=title, rows="500", cols="20")
+            ws.append_row(list(create_headers))
+            return ws
+
+    def run(self, ws: gspread.Worksheet, call):
+        """
+        call(ws) 실행
+        - RefreshError면 풀을 재생성하고 같은 제목의 새 핸들로 한 번 더
+          (기존 핸들은 이전 클라이언트의 인증 세션을 들고 있으므로 재시도는 새 핸들로 한다)
+        - 캐시된 핸들의 시트가 없어졌으면 핸들을 버리고 제목으로 다시 연다 — 같은 제목의 시트가
+          새로 생겼으면 그 핸들로 한 번 더, 없으면 WorksheetNotFound
+        """
+        try:
+            return call(ws)
+        except RefreshError:
+            self.reset()
+            return call(self.worksheet(ws.title))
+        except gspread.exceptions.APIError as e:
+            if not _missing_sheet(e) or self._worksheets.get(ws.title) is not ws:
+                raise
+            self.forget(ws.title)
+            fresh = self.worksheet(ws.title)
+            if fresh.id == ws.id:
+                raise
+            return call(fresh)
+
+    def forget(self, title: str):
+        """시트가 삭제/이름변경된 경우 해당 핸들만 버린다"""
+        with self._lock:
+            self._worksheets.pop(title, None)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_sheets_pool():
+    """서비스계정(또는 SHEETS_ENDPOINT)이 설정되어 있으면 프로세스 공용 SheetsPool, 없으면 None"""
+    global _pool
+    if _pool is None:
+        info = secret("google_service_account")
+        endpoint = sheets_endpoint()
+        if not info and not endpoint:
+            return None
+        with _pool_lock:
+            if _pool is None:
+                _pool = SheetsPool(info, secret("SPREADSHEET_ID") or SHEET_ID, endpoint)
+    return _pool
+
+
+def get_worksheet(title: str, create_headers=None) -> gspread.Worksheet:
+    """공용 풀의 Worksheet — 서비스계정이 없으면 RuntimeError"""
+    pool = get_sheets_pool()
+    if pool is None:
+        raise RuntimeError("st.secrets['google_service_account']가 설정되지 않았습니다.")
+    return pool.worksheet(title, create_headers)
+
+
+def run_on_worksheet(ws: gspread.Worksheet, call):
+    """call(ws) — 공용 풀이 있으면 토큰 갱신 실패 시 풀을 재생성하고 한 번 다시 시도 (SheetsPool.run)"""
+    pool = get_sheets_pool()
+    return pool.run(ws, call) if pool is not None else call(ws)
+
+
+def read_values(ws: gspread.Worksheet) -> list:
+    return run_on_worksheet(ws, lambda w: w.get_all_values())
+
+
+def append_row(ws: gspread.Worksheet, row):
+    """한 행 추가 (USER_ENTERED)"""
+    return run_on_worksheet(ws, lambda w: w.append_row(list(row), value_input_option="USER_ENTERED"))
+
+
+def append_rows(ws: gspread.Worksheet, rows):
+    """여러 행을 한 번의 요청으로 추가 (USER_ENTERED)"""
+    return run_on_worksheet(ws, lambda w: w.append_rows([list(r) for r in rows], value_input_option="USER_ENTERED"))
+
+
+def _cell_ranges(cells):
+    """{(행, 열): 값} → 같은 행에서 이어지는 열끼리 묶은 batch_update 데이터"""
+    data = []
+    for row, col in sorted(cells):
+        value = cells[(row, col)]
+        prev = data[-1] if data else None
+        if prev is not None and prev["_row"] == row and prev["_end"] == col - 1:
+            prev["values"][0].append(value)
+            prev["_end"] = col
+        else:
+            data.append({"_row": row, "_start": col, "_end": col, "values": [[value]]})
+    return [
+        {
+            "range": rowcol_to_a1(d["_row"], d["_start"]) + (
+                ":" + rowcol_to_a1(d["_row"], d["_end"]) if d["_end"] != d["_start"] else ""
+            ),
+            "values": d["values"],
+        }
+        for d in data
+    ]
+
+
+def write_cells(ws: gspread.Worksheet, cells: dict, retries: int = WRITE_RETRIES):
+    """
+    여러 셀 변경을 한 번의 batch_update(쓰기 1회)로 반영
+    cells: {(행, 열): 값} — 행/열은 1부터, 값은 USER_ENTERED로 해석
+    429/5xx는 지터가 섞인 백오프로 retries번까지 다시 시도하고, 그래도 실패하면 APIError
+    """
+    if not cells:
+        return None
+    attempt = 0
+    while True:
+        try:
+            # batch_update가 범위에 시트 이름을 덧붙여 data를 바꾸므로 시도마다 새로 만든다
+            return run_on_worksheet(ws, lambda w: w.batch_update(_cell_ranges(cells), raw=False))
+        except gspread.exceptions.APIError as e:
+            status = getattr(e.response, "status_code", None)
+            if status not in WRITE_RETRY_STATUS or attempt >= retries:
+                raise
+            delay = WRITE_BACKOFF_BASE * (2 ** attempt)
+            time.sleep(delay + random.uniform(0, delay))
+            attempt += 1
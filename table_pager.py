@@ -0,0 +1,75 @@
+"""
+981Park 표 페이지 나누기
+- 페이지 크기/페이지 번호/정렬 키를 session_state에 두고, 보이는 페이지만 잘라서 보낸다
+- 정렬은 정렬 키 열 하나로 순서(argsort)만 계산하고, 열 선택(projection)은 잘라낸 페이지에만 적용
+- 전체 건수는 페이지와 별도로 돌려준다
+"""
+from dataclasses import dataclass
+
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 200]
+DEFAULT_ORDER = "기본 순서"
+
+
+@dataclass(frozen=True)
+class Page:
+    df: pd.DataFrame  # 보이는 페이지 (요청한 열만)
+    total: int  # 필터 후 전체 건수
+    start: int  # 0부터, 페이지 첫 행의 전체 순번
+    page: int  # 0부터
+    pages: int
+
+
+def _state(key, name, default):
+    full = f"{key}_{name}"
+    if full not in st.session_state:
+        st.session_state[full] = default
+    return full
+
+
+def paginate(df: pd.DataFrame, key: str, columns=None, sort_keys=None, page_sizes=PAGE_SIZES) -> Page:
+    """
+    페이지 컨트롤을 그리고 현재 페이지만 반환
+    key: 위젯/상태 이름 접두사, columns: 페이지에 남길 열,
+    sort_keys: {표시 이름: 정렬에 쓸 실제 열} (예: {"날짜": "_parsed_date"})
+    """
+    sort_keys = dict(sort_keys or {})
+    total = len(df)
+
+    size_key = _state(key, "page_size", page_sizes[0])
+    sort_key = _state(key, "sort", DEFAULT_ORDER)
+    desc_key = _state(key, "desc", True)
+    page_key = _state(key, "page", 1)
+    if st.session_state[sort_key] not in [DEFAULT_ORDER, *sort_keys]:
+        st.session_state[sort_key] = DEFAULT_ORDER
+
+    c_size, c_sort, c_dir, c_page, c_info = st.columns([1, 1.4, 0.8, 1, 1.6])
+    size = c_size.selectbox("페이지 크기", page_sizes, key=size_key)
+    sort_by = c_sort.selectbox("정렬", [DEFAULT_ORDER, *sort_keys], key=sort_key)
+    desc = c_dir.toggle("내림차순", key=desc_key, disabled=sort_by == DEFAULT_ORDER)
+
+    pages = max(1, -(-total // size))
+    if st.session_state[page_key] > pages:
+        st.session_state[page_key] = pages  # 필터로 건수가 줄면 마지막 페이지로
+    page = c_page.number_input(f"페이지 (/ {pages})", min_value=1, max_value=pages, step=1, key=page_key) - 1
+    start = page * size
+    c_info.markdown(
+        f"<div style='padding-top:30px;color:#64748b;font-size:13px;'>"
+        f"{min(start + 1, total)}–{min(start + size, total)} / 총 {total}건</div>",
+        unsafe_allow_html=True,
+    )
+
+    if sort_by == DEFAULT_ORDER:
+        rows = df.iloc[start:start + size]
+    else:
+        # 정렬 키 열 하나만 정렬해 행 위치 순서를 얻는다 (같은 값은 원래 순서, 빈 값은 맨 뒤)
+        values = df[sort_keys[sort_by]].reset_index(drop=True)
+        if values.dtype == object:
+            values = values.fillna("").astype(str).replace("", None)
+        order = values.sort_values(ascending=not desc, kind="stable", na_position="last").index.to_numpy()
+        rows = df.iloc[order[start:start + size]]
+    if columns is not None:
+        rows = rows[[c for c in columns if c in rows.columns]]
+    return Page(df=rows, total=total, start=start, page=page, pages=pages)
@@ -0,0 +1,25 @@
+"""
+공용 픽스처 — 로컬 Sheets 대역 서버(benchmarks/fake_sheets.py)
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import sheets_client  # noqa: E402
+from fake_sheets import FakeSheetsServer, default_spreadsheet  # noqa: E402
+from issue_store import SHEET_ID  # noqa: E402
+
+
+@pytest.fixture
+def fake_sheets(monkeypatch):
+    """(서버, 스프레드시트) — SHEETS_ENDPOINT를 서버로 돌리고 공용 풀은 테스트마다 새로"""
+    server = FakeSheetsServer(("127.0.0.1", 0), spreadsheets=[default_spreadsheet(rows=40, seed=1)])
+    monkeypatch.setenv("SHEETS_ENDPOINT", server.start())
+    monkeypatch.setattr(sheets_client, "_pool", None)
+    yield server, server.spreadsheets[SHEET_ID]
+    server.stop()
@@ -0,0 +1,94 @@
+"""
+chat_outbox 전송 — 긴급 우선, 카드 거부 시 텍스트 대체, 429/5xx·연결 오류 재시도 후 실패 처리
+실행: python -m pytest tests
+"""
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat_outbox import MAX_ATTEMPTS, ChatOutbox  # noqa: E402
+
+CARD = {"cardsV2": [{"cardId": "issue"}]}
+TEXT = {"text": "장애 접수"}
+
+
+class FakeWebhook:
+    """웹훅 대역 — replies: 본문 종류('card'/'text')별 응답 상태 목록 (예외 클래스면 raise)"""
+
+    def __init__(self, card=(), text=()):
+        self.replies = {"card": list(card), "text": list(text)}
+        self.posts = []
+
+    def post(self, url, json):
+        kind = "card" if "cardsV2" in json else "text"
+        self.posts.append((url, kind))
+        reply = self.replies[kind].pop(0) if self.replies[kind] else 200
+        if isinstance(reply, type):
+            raise reply("https://chat.googleapis.com/v1/spaces/x/messages?key=secret")
+        return SimpleNamespace(status_code=reply, text="")
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return ChatOutbox(str(tmp_path / "outbox.db"))
+
+
+def row(outbox, item_id):
+    return outbox.recent(100).set_index("id").loc[item_id]
+
+
+def make_due(outbox):
+    with outbox._conn() as conn:
+        conn.execute("UPDATE outbox SET next_attempt_at = 0")
+
+
+def test_urgent_items_go_first(outbox):
+    outbox.http = FakeWebhook()
+    outbox.enqueue("normal-1", CARD, TEXT)
+    outbox.enqueue("urgent", CARD, TEXT, urgent=True)
+    outbox.enqueue("normal-2", CARD, TEXT)
+    while outbox.deliver_one():
+        pass
+    assert [url for url, _ in outbox.http.posts] == ["urgent", "normal-1", "normal-2"]
+
+
+def test_rejected_card_falls_back_to_text(outbox):
+    outbox.http = FakeWebhook(card=[400])
+    item = outbox.enqueue("url", CARD, TEXT)
+    assert outbox.deliver_one()
+    assert outbox.http.posts == [("url", "card"), ("url", "text")]
+    assert row(outbox, item)[["status", "sent_as", "attempts"]].tolist() == ["sent", "text", 1]
+
+
+def test_retryable_failures_are_rescheduled_without_text_fallback(outbox):
+    outbox.http = FakeWebhook(card=[503, requests.ConnectionError])
+    item = outbox.enqueue("url", CARD, TEXT)
+
+    assert outbox.deliver_one()
+    assert row(outbox, item)[["status", "attempts"]].tolist() == ["pending", 1]
+    assert not outbox.deliver_one()  # 백오프 중에는 대상이 아니다
+
+    make_due(outbox)
+    assert outbox.deliver_one()
+    state = row(outbox, item)
+    assert state[["status", "attempts", "last_error"]].tolist() == ["pending", 2, "ConnectionError"]  # URL 미포함
+
+    make_due(outbox)
+    assert outbox.deliver_one()
+    assert row(outbox, item)[["status", "sent_as", "attempts"]].tolist() == ["sent", "card", 3]
+    assert [kind for _, kind in outbox.http.posts] == ["card"] * 3
+
+
+def test_gives_up_after_max_attempts(outbox):
+    outbox.http = FakeWebhook(card=[429] * MAX_ATTEMPTS)
+    item = outbox.enqueue("url", CARD, TEXT)
+    for _ in range(MAX_ATTEMPTS):
+        make_due(outbox)
+        assert outbox.deliver_one()
+    assert row(outbox, item)[["status", "attempts"]].tolist() == ["failed", MAX_ATTEMPTS]
+    assert not outbox.deliver_one()
@@ -0,0 +1,48 @@
+"""
+date_parser 벡터화 파서 — 원본 파서를 값마다 적용한 결과와 같아야 한다
+실행: python -m pytest tests
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from date_parser import (  # noqa: E402
+    parse_date_safe,
+    parse_dates_safe,
+    parse_jeju_date,
+    parse_jeju_dates,
+    to_naive_kst,
+)
+
+# 원본 파서로 넘어가는 값 중 tz가 있는 값이 하나라도 섞이면 나머지가 NaT가 됐었다
+MIXED_TZ = ["2024-03-05T10:00:00+09:00", "2024/03/05", "2024/03/07", "311\t", "2024.03.08 10:00"]
+RAW_FORMATS = [
+    "2024. 3. 5 오후 12:04:05", "2024. 3. 5 오전 13:04:05", "2024.3.5 오후 3:4:5", "2025. 11. 25 오전 12:06:37",
+    "2024-03-05 07:04:05", "2024-3-5  7:04:05", "2024-02-30 10:00:00", "24.03.05", "45000", "",
+]
+
+
+def scalar(values, parser):
+    return pd.Series([to_naive_kst(parser(v)) for v in values], dtype="datetime64[ns]")
+
+
+@pytest.mark.parametrize("parser, vectorized", [(parse_jeju_date, parse_jeju_dates), (parse_date_safe, parse_dates_safe)])
+@pytest.mark.parametrize("values", [MIXED_TZ, RAW_FORMATS], ids=["mixed_tz", "raw_formats"])
+def test_matches_scalar_parser(parser, vectorized, values):
+    got = vectorized(pd.Series(values, dtype=object), memo=False)
+    pd.testing.assert_series_equal(got, scalar(values, parser))
+
+
+def test_mixed_tz_values():
+    got = parse_jeju_dates(pd.Series(MIXED_TZ, dtype=object), memo=False)
+    assert list(got) == [
+        pd.Timestamp("2024-03-05 10:00"),
+        pd.Timestamp("2024-03-05"),
+        pd.Timestamp("2024-03-07"),
+        pd.Timestamp("1900-11-06"),
+        pd.Timestamp("2024-03-08 10:00"),
+    ]
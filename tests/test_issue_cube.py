@@ -0,0 +1,59 @@
+"""
+issue_cube 증분 집계 — 추가/변경/삭제를 반영한 결과가 처음부터 다시 만든 큐브와 같아야 한다
+실행: python -m pytest tests
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from issue_cube import COUNT, DAILY_DIMENSIONS, DIMENSIONS, IssueCube  # noqa: E402
+from issue_store import build_issue_frame  # noqa: E402
+
+HEADER = ["날짜", "작성자", "포지션", "위치", "설비명", "접수처리"]
+ROWS = [
+    ["2024-03-05 10:00:00", "kim", "카트", "1코스", "카트1", "접수중"],
+    ["2024-03-05 11:00:00", "lee", "카트", "1코스", "카트2", "완료"],
+    ["2024-03-20 09:00:00", "park", "서바이벌", "A동", "총기1", "점검중"],
+    ["2024-04-01 08:00:00", "kim", "카트", "2코스", "카트3", "완료"],
+    ["날짜 미상", "lee", "카트", "1코스", "카트4", "접수중"],  # 날짜를 해석하지 못한 행은 집계하지 않는다
+]
+
+
+def frame(rows):
+    return build_issue_frame([HEADER] + [list(r) for r in rows])
+
+
+def table(view):
+    cells = view.cells
+    return cells.sort_values(list(cells.columns[:-1])).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("dimensions", [DIMENSIONS, DAILY_DIMENSIONS], ids=["monthly", "daily"])
+def test_sync_deltas_match_full_rebuild(dimensions):
+    cube = IssueCube(dimensions)
+    first = cube.sync(frame(ROWS))
+    assert first.cells[COUNT].sum() == 4
+    assert cube.sync(frame(ROWS)) is first  # 바뀐 행이 없으면 같은 뷰
+
+    rows = [list(r) for r in ROWS]
+    rows[0][5] = "완료"  # 변경: 상태
+    rows[2][0] = "2024-04-02 09:00:00"  # 변경: 월/일
+    del rows[3]  # 삭제
+    rows.append(["2024-04-03 12:00:00", "choi", "카트", "1코스", "카트5", "접수중"])  # 추가
+    df = frame(rows)
+
+    pd.testing.assert_frame_equal(table(cube.sync(df)), table(IssueCube(dimensions).sync(df)))
+
+
+def test_removed_cells_drop_out_of_view():
+    cube = IssueCube()
+    cube.sync(frame(ROWS))
+    view = cube.sync(frame(ROWS[:2]))
+
+    assert view.values("_month") == ["2024-03"]
+    assert view.status_counts() == (2, 0, 1, 1, 50.0)
+    assert view.status_counts(positions=["서바이벌"]) == (0, 0, 0, 0, 0.0)
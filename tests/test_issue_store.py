@@ -0,0 +1,177 @@
+"""
+issue_store 저장소 — 증분 동기화/행 인덱스, 실패 백오프, 내용이 같을 때 버전 유지, 미러 기록
+실행: python -m pytest tests (동기화 테스트는 conftest의 로컬 Sheets 대역 서버 사용)
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import issue_store  # noqa: E402
+from issue_store import (  # noqa: E402
+    SHEET_LOG_NAME,
+    IssueLogStore,
+    build_issue_frame,
+    build_row_index,
+    open_log_worksheet,
+    sync_issue_values,
+)
+
+
+def log_rows(book):
+    return book.by_title(SHEET_LOG_NAME).rows
+
+
+def new_row(book, writer="신규작성자"):
+    row = list(log_rows(book)[-1])
+    row[1], row[2] = "2025. 1. 2 오후 3:04:05", writer
+    return row
+
+
+def test_sync_picks_up_appended_rows_and_status_edits(fake_sheets):
+    _, book = fake_sheets
+    ws = open_log_worksheet()
+    values = ws.get_all_values()
+    rows = log_rows(book)
+    rows.append(new_row(book))
+    rows[3][9] = "완료"  # J열(접수처리)은 증분 동기화가 매번 다시 읽는다
+    rows[-2][11] = "점검자변경"  # 끝 행의 변경 가능 열(L) — 끝 행 확인은 A~I만 본다
+
+    merged = sync_issue_values(ws, values)
+    assert merged == ws.get_all_values()
+
+
+@pytest.mark.parametrize("change", ["tail_fixed_edit", "middle_delete", "middle_insert"])
+def test_sync_returns_none_when_tail_moves(fake_sheets, change):
+    _, book = fake_sheets
+    ws = open_log_worksheet()
+    values = ws.get_all_values()
+    rows = log_rows(book)
+    if change == "tail_fixed_edit":
+        rows[-1][2] = "다른작성자"  # 끝 행의 고정 열(C)
+    elif change == "middle_delete":
+        del rows[5]
+    else:
+        rows.insert(5, new_row(book))
+
+    assert sync_issue_values(ws, values) is None
+
+
+def test_build_row_index_adds_only_appended_rows():
+    values = [["날짜", "작성자", "설비명"]] + [[f"2024-03-{d:02d}", "kim", "카트"] for d in range(1, 6)]
+    base = build_row_index(build_issue_frame(values))
+    values += [["2024-03-06", "lee", "카트"], ["2024-03-01", "kim", "카트"]]  # 같은 키는 -2 접미사
+    df = build_issue_frame(values)
+
+    assert build_row_index(df, base) == build_row_index(df)
+    assert len(build_row_index(df)) == 7
+
+
+def test_store_uses_delta_then_full_reload_on_tail_mismatch(fake_sheets):
+    _, book = fake_sheets
+    store = IssueLogStore()
+    first = store.get(force=True)
+    assert first.source == "gspread"
+
+    log_rows(book).append(new_row(book))
+    second = store.get(force=True)
+    assert second.source == "gspread-delta" and second.version == first.version + 1
+    assert len(second.df) == len(first.df) + 1
+    assert second.row_index == build_row_index(second.df)
+
+    log_rows(book)[-1][2] = "다른작성자"
+    third = store.get(force=True)
+    assert third.source == "gspread"  # 끝 행 불일치 → 전체 다시 읽기
+    assert third.df["작성자"].iloc[-1] == "다른작성자"
+    assert third.row_index == build_row_index(third.df)
+
+
+def failing_store():
+    store = IssueLogStore()
+    store.calls = 0
+
+    def load():
+        store.calls += 1
+        raise RuntimeError("quota exceeded")
+
+    store._load_values = load
+    return store
+
+
+def test_first_load_failure_backs_off():
+    store = failing_store()
+    with pytest.raises(RuntimeError):
+        store.get()
+    with pytest.raises(RuntimeError):
+        store.get()  # 백오프 중 — 다시 읽지 않고 직전 오류
+    assert store.calls == 1
+
+    store._next_attempt_at = 0.0
+    with pytest.raises(RuntimeError):
+        store.get()
+    assert store.calls == 2
+    # 연속 실패마다 두 배
+    assert store._next_attempt_at - time.time() == pytest.approx(issue_store.RETRY_BACKOFF * 2, abs=1)
+    assert "quota exceeded" in store.error_message()
+
+
+def test_stale_snapshot_is_served_without_waking_worker_during_backoff():
+    store = failing_store()
+    store._install(pd.DataFrame({"날짜": ["2024-03-05"]}), "csv", time.time() - store.refresh_interval - 1)
+    with pytest.raises(RuntimeError):
+        store._refresh(time.time(), only_if_stale=True)  # 워커가 한 번 실패
+    assert store.calls == 1
+
+    snap = store.get()
+    assert snap.source == "csv"
+    assert not store._wake.is_set()
+    assert store._refresh(time.time(), only_if_stale=True) is snap  # 워커가 깨어나도 재시도하지 않는다
+    assert store.calls == 1
+
+
+def test_success_resets_backoff():
+    store = failing_store()
+    with pytest.raises(RuntimeError):
+        store.get()
+    store._load_values = lambda: ([["날짜"], ["2024-03-05"]], "csv")
+    store._next_attempt_at = 0.0
+    assert store.get().source == "csv"
+    assert store.last_error is None and store._failures == 0 and store.error_message() is None
+
+
+def test_unchanged_values_keep_version_and_derived():
+    store = IssueLogStore()
+    values = [["날짜", "작성자", "설비명"], ["2024-03-05", "kim", "카트"]]
+    store._load_values = lambda: ([list(r) for r in values], "gspread")
+    first = store.get(force=True)
+    built = first.derive("count", len)
+
+    second = store.get(force=True)
+    assert second.version == first.version
+    assert second.fetched_at >= first.fetched_at and second.df is first.df
+    assert second.derive("count", lambda df: -1) == built  # 파생 구조를 다시 만들지 않는다
+
+    values.append(["2024-03-06", "lee", "카트"])
+    third = store.get(force=True)
+    assert third.version == first.version + 1
+    assert third.derive("count", len) == 2
+
+
+def test_mirror_writes_only_changed_content(tmp_path):
+    from issue_mirror import IssueMirror
+
+    df = issue_store.build_issue_frame([["날짜", "작성자", "설비명"], ["2024-03-05", "kim", "카트"]])
+    mirror = IssueMirror(str(tmp_path / "mirror.db"))
+    assert mirror.write_frame(df, 1)
+    assert not mirror.write_frame(df.copy(), 2)  # 같은 내용 — 버전이 달라도 다시 쓰지 않는다
+    assert not IssueMirror(str(tmp_path / "mirror.db")).write_frame(df, 1)  # 재시작 후에도
+
+    changed = df.copy()
+    changed.loc[0, "작성자"] = "lee"
+    assert mirror.write_frame(changed, 3)
+    assert mirror.version == 3
+    assert list(mirror.load_frame()["작성자"]) == ["lee"]
@@ -0,0 +1,54 @@
+"""
+perf_trace 페이지 귀속 — rerun/fragment rerun은 세션마다 새 ScriptRunner 스레드에서 돈다
+실행: python -m pytest tests
+"""
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import perf_trace  # noqa: E402
+from perf_trace import BACKGROUND_PAGE, PerfRecorder, set_page, span  # noqa: E402
+
+
+def run_in_session(session_id, fn):
+    """ScriptRunner처럼 세션 컨텍스트가 붙은 새 스레드에서 fn 실행"""
+    thread = threading.Thread(target=fn)
+    add_script_run_ctx(thread, SimpleNamespace(session_id=session_id))
+    thread.start()
+    thread.join()
+
+
+def full_rerun():
+    set_page("Dashboard")
+    with span("filter"):
+        pass
+
+
+def fragment_rerun():
+    with span("figure"):
+        pass
+
+
+def test_fragment_rerun_keeps_session_page(monkeypatch):
+    recorder = PerfRecorder()
+    monkeypatch.setattr(perf_trace, "_recorder", recorder)
+
+    run_in_session("s1", full_rerun)
+    run_in_session("s1", fragment_rerun)  # 같은 세션, 다른 스레드
+    run_in_session("s2", fragment_rerun)  # set_page 전인 세션
+    with span("fetch"):  # 세션 밖 (백그라운드 갱신)
+        pass
+
+    df = recorder.recent()
+    assert list(zip(df["page"], df["stage"])) == [
+        ("Dashboard", "filter"),
+        ("Dashboard", "figure"),
+        (BACKGROUND_PAGE, "figure"),
+        (BACKGROUND_PAGE, "fetch"),
+    ]
+    assert recorder.active_sessions() == {"Dashboard": 1}
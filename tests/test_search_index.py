@@ -0,0 +1,72 @@
+"""
+search_index base+delta — 병합된 base 위에 수정/삭제가 delta로 쌓여도 검색 결과가 처음부터 만든 색인과 같아야 한다
+실행: python -m pytest tests
+"""
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import HistorySearchIndex  # noqa: E402
+
+ROWS = [
+    ("a", "카트1", "브레이크 소음", "패드 교체"),
+    ("b", "카트2", "배터리 방전", "충전기 점검"),
+    ("c", "총기1", "조준 불량", "센서 교체"),
+    ("d", "카트3", "브레이크 밀림", ""),
+]
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=["_id", "설비명", "장애내용", "점검내용"])
+
+
+def fresh():
+    index = HistorySearchIndex()
+    index._save_later = lambda: None  # 병합은 테스트가 직접 (백그라운드 병합과 겹치지 않게)
+    return index
+
+
+def synced(rows):
+    index = fresh().sync(frame(rows))
+    index._merge()  # 첫 색인을 base로 — 이후 변경은 delta에 쌓인다
+    return index
+
+
+def test_edit_moves_row_between_terms():
+    index = synced(ROWS)
+    assert index._base.docs and not index._delta.docs
+    assert set(index.search("브레이크")) == {"a", "d"}
+
+    rows = list(ROWS)
+    rows[0] = ("a", "카트1", "핸들 떨림", "패드 교체")
+    index.sync(frame(rows))
+
+    assert set(index.search("브레이크")) == {"d"}  # base의 옛 내용은 삭제 표시로 가려진다
+    assert index.search("핸들 떨림") == ["a"]  # delta에서 찾는다
+    assert set(index.search("교체")) == {"a", "c"}
+    for q in ["브레이크", "핸들", "교체", "카트", "패"]:
+        assert sorted(index.search(q)) == sorted(fresh().sync(frame(rows)).search(q))
+
+
+def test_deleted_row_disappears_before_and_after_merge():
+    index = synced(ROWS)
+    rows = [r for r in ROWS if r[0] != "b"]
+    index.sync(frame(rows))
+    assert index.search("배터리") == []
+
+    index.sync(frame(rows + [("e", "카트4", "배터리 교체", "")]))
+    assert index.search("배터리") == ["e"]
+    index._merge()
+    assert index.search("배터리") == ["e"]
+    assert not index._delta.docs and not index._deleted
+
+
+def test_recent_rows_rank_first_on_equal_score():
+    index = synced(ROWS)
+    rows = list(ROWS)
+    rows[1] = ("b", "카트2", "브레이크 소음", "충전기 점검")  # 수정 → 가장 최근 문서
+    index.sync(frame(rows))
+    assert index.search("브레이크 소음") == ["b", "a"]
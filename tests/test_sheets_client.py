@@ -0,0 +1,77 @@
+"""
+sheets_client 공용 풀 / 셀 쓰기 — 로컬 대역 서버로 실제 gspread 요청을 보낸다
+실행: python -m pytest tests
+"""
+import gspread
+import pytest
+
+import sheets_client
+from issue_store import SHEET_LOG_NAME
+from sheets_client import _cell_ranges, get_sheets_pool, get_worksheet, write_cells
+
+
+def drop_sheet(book, title):
+    with book.lock:
+        book.sheets = [s for s in book.sheets if s.title != title]
+
+
+def test_deleted_sheet_forgets_cached_handle(fake_sheets):
+    _, book = fake_sheets
+    pool = get_sheets_pool()
+    ws = pool.worksheet(SHEET_LOG_NAME)
+    drop_sheet(book, SHEET_LOG_NAME)
+
+    with pytest.raises(gspread.WorksheetNotFound):
+        pool.run(ws, lambda w: w.get_all_values())
+    assert SHEET_LOG_NAME not in pool._worksheets
+
+
+def test_recreated_sheet_gets_new_handle_after_forget(fake_sheets):
+    _, book = fake_sheets
+    pool = get_sheets_pool()
+    ws = pool.worksheet(SHEET_LOG_NAME)
+    drop_sheet(book, SHEET_LOG_NAME)
+    with pytest.raises(gspread.WorksheetNotFound):
+        pool.run(ws, lambda w: w.get_all_values())
+
+    book.add(SHEET_LOG_NAME, [["날짜"], ["2024-03-05"]], 777)
+    fresh = pool.worksheet(SHEET_LOG_NAME)  # 버린 핸들 대신 새 시트를 연다
+    assert fresh.id == 777
+    assert pool.run(fresh, lambda w: w.get_all_values()) == [["날짜"], ["2024-03-05"]]
+
+
+def test_cell_ranges_coalesce_adjacent_columns():
+    cells = {(5, 10): "d", (2, 13): "c", (2, 11): "b", (2, 10): "a", (3, 11): "e"}
+    assert _cell_ranges(cells) == [
+        {"range": "J2:K2", "values": [["a", "b"]]},
+        {"range": "M2", "values": [["c"]]},  # 열이 떨어져 있으면 따로
+        {"range": "K3", "values": [["e"]]},
+        {"range": "J5", "values": [["d"]]},
+    ]
+    assert _cell_ranges({}) == []
+
+
+def test_write_cells_is_one_batch_update(fake_sheets):
+    server, book = fake_sheets
+    ws = get_worksheet(SHEET_LOG_NAME)
+    write_cells(ws, {(2, 10): "점검중", (2, 12): "kim", (2, 13): "2024-03-05", (3, 10): "완료"})
+
+    assert server.stats["values.batchUpdate"] == 1
+    rows = book.by_title(SHEET_LOG_NAME).rows
+    assert rows[1][9] == "점검중" and rows[1][11:13] == ["kim", "2024-03-05"] and rows[2][9] == "완료"
+
+
+def test_write_cells_retries_with_fresh_ranges(fake_sheets, monkeypatch):
+    server, book = fake_sheets
+    ws = get_worksheet(SHEET_LOG_NAME)
+    server.error_rate = 1.0  # 첫 시도는 503
+
+    def sleep(_):
+        server.error_rate = 0.0
+
+    monkeypatch.setattr(sheets_client.time, "sleep", sleep)
+    write_cells(ws, {(4, 10): "완료", (4, 11): "-"})
+
+    assert server.stats["values.batchUpdate 503"] == 1
+    assert server.stats["values.batchUpdate"] == 2
+    assert book.by_title(SHEET_LOG_NAME).rows[3][9:11] == ["완료", "-"]